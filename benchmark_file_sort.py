@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件列表排序基准测试
+生成大量模拟文件项，对比旧版字典条目（按显示字符串排序）与FileEntry（按数值字段排序）
+的排序耗时和内存占用
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.file_entry import FileEntry, format_file_size, format_date
+from src.core.sort_keys import size_sort_key, date_sort_key
+
+ENTRY_COUNT = 100_000
+
+
+def legacy_size_key(item):
+    """旧版实现：从显示字符串反解析大小"""
+    size = item["size"]
+    if size == "-":
+        return -1
+    if "KB" in size:
+        return float(size.replace("KB", "").strip())
+    elif "MB" in size:
+        return float(size.replace("MB", "").strip()) * 1024
+    elif "GB" in size:
+        return float(size.replace("GB", "").strip()) * 1024 * 1024
+    return 0
+
+
+def make_raw_entries(count):
+    """生成模拟的API条目数据"""
+    rng = random.Random(2025)
+    raw = []
+    for i in range(count):
+        is_dir = rng.random() < 0.1
+        size_bytes = 0 if is_dir else int(rng.lognormvariate(14, 3))
+        epoch = 1_500_000_000 + rng.randrange(300_000_000)
+        raw.append((
+            f"文件_{i}.mp3",
+            size_bytes,
+            time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch)),
+            "inode/directory" if is_dir else "audio",
+            "",
+            f"sign{i:08d}",
+        ))
+    return raw
+
+
+def make_legacy_entries(raw):
+    """旧版模型：API层和界面层各生成一个字典，界面字典保存格式化后的字符串"""
+    api_items = [
+        {'name': name, 'size': size, 'modified_time': modified, 'mime_type': mime,
+         'path': path, 'sign': sign, 'id': name}
+        for name, size, modified, mime, path, sign in raw
+    ]
+    return [
+        {"name": item['name'], "size": format_file_size(item['size']),
+         "date": format_date(item['modified_time']), "type": "audio",
+         "mime_type": item['mime_type'], "path": item['path'],
+         "sign": item['sign'], "id": item['id']}
+        for item in api_items
+    ]
+
+
+def make_entries(raw):
+    """新版模型：每个条目一个FileEntry"""
+    entries = [FileEntry(*row) for row in raw]
+    for entry in entries:
+        entry.file_type = "audio"
+    return entries
+
+
+def measure_memory(label, factory, raw):
+    """测量构建条目列表后保留的内存"""
+    tracemalloc.start()
+    entries = factory(raw)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} {current / 1024 / 1024:8.1f} MB  ({current / len(entries):.0f} B/条)")
+    return entries
+
+
+def bench(label, entries, key):
+    """对条目副本排序并返回耗时"""
+    data = list(entries)
+    start = time.perf_counter()
+    data.sort(key=key)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:8.1f} ms")
+    return data
+
+
+def count_misordered(data, sizes):
+    """统计按真实字节数看顺序错误的相邻文件"""
+    files = [sizes[item["name"]] for item in data if item["mime_type"] != "inode/directory"]
+    return sum(1 for a, b in zip(files, files[1:]) if a > b)
+
+
+def main():
+    print("=" * 60)
+    print(f"文件列表排序基准测试（{ENTRY_COUNT} 个条目）")
+    print("=" * 60)
+
+    raw = make_raw_entries(ENTRY_COUNT)
+    sizes = {row[0]: row[1] for row in raw}
+
+    print("条目内存占用:")
+    legacy_entries = measure_memory("旧版（两层字典）", make_legacy_entries, raw)
+    entries = measure_memory("新版（FileEntry）", make_entries, raw)
+    print()
+
+    print("按大小排序:")
+    legacy = bench("旧版（解析显示字符串）", legacy_entries, legacy_size_key)
+    bench("新版（size）", entries, size_sort_key)
+    print(f"  旧版顺序错误的相邻文件: {count_misordered(legacy, sizes)}")
+    print()
+
+    print("按日期排序:")
+    bench("旧版（显示字符串）", legacy_entries, lambda x: x["date"])
+    bench("新版（timestamp）", entries, date_sort_key)
+    print()
+
+    print("反转已排序列表（切换排序方向）:")
+    data = list(entries)
+    start = time.perf_counter()
+    data.reverse()
+    print(f"  {'list.reverse()':<28} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ import os
 from src.ui.server_select_dialog import ServerSelectDialog
 from src.ui.file_manager_window import FileManagerWindow
 from src.core.logger import setup_logger
+from src.media.vlc_runtime import start_vlc_warmup, shutdown_vlc_runtime
+from src.media.playback_positions import close_playback_position_store
 
 
 class OpenListManagerApp(wx.App):
@@ -25,6 +27,9 @@ class OpenListManagerApp(wx.App):
         self.logger = setup_logger()
         self.logger.info("OpenList管理器启动")
 
+        # 后台预加载VLC，不阻塞服务器选择窗口的显示
+        start_vlc_warmup()
+
         # 显示服务器选择对话框
         self.show_server_select_dialog()
 
@@ -72,6 +77,14 @@ class OpenListManagerApp(wx.App):
 
     def OnExit(self):
         """应用退出"""
+        # 释放共享的VLC运行时（未使用过播放器时不会加载libvlc），写入剩余的播放位置
+        try:
+            shutdown_vlc_runtime()
+            close_playback_position_store()
+        except Exception as e:
+            if hasattr(self, 'logger'):
+                self.logger.error(f"释放播放资源失败: {e}")
+
         if hasattr(self, 'logger'):
             self.logger.info("OpenList管理器退出")
         return 0
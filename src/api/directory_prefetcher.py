@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录预取器
+在后台以有限并发预先获取用户可能进入的目录，结果保存在内存缓存中
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.core.logger import get_logger
+from src.core.ttl_cache import TTLCache
+
+
+class DirectoryPrefetcher:
+    """后台目录列表预取器"""
+
+    def __init__(self, client, max_workers=2, maxsize=64, ttl=120, on_loaded=None):
+        """
+        初始化预取器
+
+        Args:
+            client: OpenList客户端
+            max_workers: 最大并发请求数
+            maxsize: 内存缓存最多保存的目录数
+            ttl: 预取结果有效期（秒）
+            on_loaded: 预取完成回调 on_loaded(path, entries)，在后台线程中调用，
+                       可用于补充条目字段或写入磁盘缓存
+        """
+        self.logger = get_logger()
+        self.client = client
+        self.on_loaded = on_loaded
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DirPrefetch")
+        self._pending = {}  # {路径: Future}
+        # 取消Future时完成回调会在当前线程中同步执行，需要可重入锁
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def get(self, path):
+        """获取已预取的目录列表，未命中返回None"""
+        return self._cache.get(path)
+
+    def discard(self, path):
+        """丢弃指定目录的预取结果（如用户强制刷新时）"""
+        self._cache.pop(path)
+
+    def prefetch(self, paths):
+        """
+        预取一组目录，取消尚未开始的旧请求
+
+        Args:
+            paths: 按优先级排列的目录路径
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            wanted = [path for path in dict.fromkeys(paths) if path not in self._cache]
+
+            # 焦点已移走的目录不再需要，取消仍在排队的请求
+            for path, future in list(self._pending.items()):
+                if path not in wanted and future.cancel():
+                    self._pending.pop(path, None)
+
+            for path in wanted:
+                if path in self._pending:
+                    continue
+                future = self._executor.submit(self._fetch, path)
+                self._pending[path] = future
+                future.add_done_callback(lambda f, p=path: self._on_done(p, f))
+
+    def _fetch(self, path):
+        """后台线程：获取完整目录列表"""
+        response = self.client.get_file_list(path)
+        entries = response.get('files', [])
+        if self.on_loaded:
+            self.on_loaded(path, entries)
+        return entries
+
+    def _on_done(self, path, future):
+        """预取完成，写入缓存"""
+        with self._lock:
+            if self._pending.get(path) is future:
+                self._pending.pop(path, None)
+
+        if future.cancelled():
+            return
+
+        try:
+            entries = future.result()
+        except Exception as e:
+            self.logger.debug(f"预取目录失败: {path}: {e}")
+            return
+
+        self._cache.set(path, entries)
+        self.logger.debug(f"已预取目录: {path}, {len(entries)} 个项目")
+
+    def clear(self):
+        """清空预取缓存"""
+        self._cache.clear()
+
+    def close(self):
+        """停止预取并释放线程池"""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._cache.clear()
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+下载管理器
+基于签名下载链接（/d/...?sign=）的批量下载：
+多文件并行、大文件按HTTP Range分段并行传输、断点续传、全局限速和进度查询
+"""
+
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.core.logger import get_logger
+
+
+class DownloadError(Exception):
+    """下载错误"""
+    pass
+
+
+# Windows文件名中不允许出现的字符（含控制字符）
+_INVALID_NAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# Windows保留的设备名
+_RESERVED_NAMES = {'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{i}' for i in range(1, 10)} | {f'LPT{i}' for i in range(1, 10)}
+
+
+def safe_local_name(name):
+    """
+    将服务器上的文件名转换为可在本地（Windows）保存的文件名
+
+    非法字符替换为下划线，去掉结尾的空格和点，保留设备名前加下划线
+    """
+    cleaned = _INVALID_NAME_CHARS.sub('_', name or '').rstrip(' .')
+    if not cleaned:
+        return '_'
+    if cleaned.split('.', 1)[0].upper() in _RESERVED_NAMES:
+        cleaned = '_' + cleaned
+    return cleaned
+
+
+class TokenBucket:
+    """令牌桶限速器，所有下载线程共享"""
+
+    def __init__(self, rate=0):
+        """
+        初始化限速器
+
+        Args:
+            rate: 每秒允许的字节数，0表示不限速
+        """
+        self._lock = threading.Lock()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """修改限速值（字节/秒）"""
+        with self._lock:
+            self.rate = max(0, int(rate or 0))
+            # 桶容量为1秒的流量，允许短时突发
+            self._tokens = float(self.rate)
+            self._updated = time.monotonic()
+
+    def consume(self, amount):
+        """取出指定数量的令牌，不足时阻塞等待"""
+        while True:
+            with self._lock:
+                if self.rate <= 0:
+                    return
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount or self._tokens >= self.rate:
+                    # 单次请求量超过桶容量时允许透支，避免永久等待
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(min(wait, 0.5))
+
+
+class DownloadTask:
+    """单个下载任务"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, task_id, url, dest_path, name=None, size=None):
+        self.id = task_id
+        self.url = url
+        self.dest_path = dest_path
+        self.name = name or os.path.basename(dest_path)
+        self.size = size
+        self.status = self.QUEUED
+        self.error = None
+        self.downloaded = 0
+        self.segments = []  # [{'start': int, 'end': int, 'done': int}]
+
+        self._session_bytes = 0  # 本次运行下载的字节数（用于计算速度）
+        self._started_at = None
+        self._finished_at = None
+        self._last_saved = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._done_event = threading.Event()
+
+    @property
+    def part_path(self):
+        """未完成文件路径"""
+        return self.dest_path + '.part'
+
+    @property
+    def state_path(self):
+        """断点续传状态文件路径"""
+        return self.dest_path + '.part.json'
+
+    @property
+    def is_finished(self):
+        return self.status in (self.COMPLETED, self.FAILED, self.CANCELLED)
+
+    def add_bytes(self, amount):
+        """记录已下载字节数"""
+        with self._lock:
+            self.downloaded += amount
+            self._session_bytes += amount
+
+    def progress(self):
+        """获取任务进度快照"""
+        with self._lock:
+            downloaded = self.downloaded
+            session_bytes = self._session_bytes
+
+        elapsed = 0.0
+        if self._started_at is not None:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+
+        percent = None
+        if self.size:
+            percent = min(100.0, downloaded * 100.0 / self.size)
+        elif self.status == self.COMPLETED:
+            percent = 100.0
+
+        return {
+            'id': self.id,
+            'name': self.name,
+            'dest_path': self.dest_path,
+            'status': self.status,
+            'downloaded': downloaded,
+            'size': self.size,
+            'percent': percent,
+            'speed': session_bytes / elapsed if elapsed > 0 else 0.0,
+            'error': self.error,
+        }
+
+
+class DownloadManager:
+    """下载管理器"""
+
+    CHUNK_SIZE = 64 * 1024                   # 每次读取的字节数
+    SEGMENT_THRESHOLD = 16 * 1024 * 1024     # 超过此大小的文件分段并行下载
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024       # 单个分段的最小大小
+    SEGMENT_RETRIES = 3                      # 分段失败重试次数
+    STATE_SAVE_INTERVAL = 1.0                # 续传状态保存间隔（秒）
+
+    def __init__(self, session, max_workers=3, segments_per_file=4,
+                 bandwidth_limit=0, timeout=(10, 60), bandwidth=None):
+        """
+        初始化下载管理器
+
+        Args:
+            session: requests会话（复用客户端的连接池）
+            max_workers: 同时下载的文件数
+            segments_per_file: 大文件的并行分段数
+            bandwidth_limit: 全局限速（字节/秒），0表示不限速
+            timeout: 请求超时 (连接超时, 读取超时)
+            bandwidth: 与其他下载管理器共享的TokenBucket，指定时忽略bandwidth_limit
+        """
+        self.logger = get_logger()
+        self.session = session
+        self.segments_per_file = max(1, segments_per_file)
+        self.timeout = timeout
+        self._bandwidth = bandwidth or TokenBucket(bandwidth_limit)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Download")
+        self._tasks = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, url, dest_path, name=None, size=None):
+        """
+        添加下载任务
+
+        Args:
+            url: 下载地址
+            dest_path: 本地保存路径
+            name: 显示名称
+            size: 已知的文件大小（字节），可选
+
+        Returns:
+            任务ID
+        """
+        with self._lock:
+            task = DownloadTask(next(self._ids), url, dest_path, name=name, size=size)
+            self._tasks[task.id] = task
+        self._executor.submit(self._run, task)
+        self.logger.info(f"已添加下载任务: {task.name} -> {dest_path}")
+        return task.id
+
+    def get_progress(self, task_id):
+        """获取单个任务进度，任务不存在时返回None"""
+        task = self._tasks.get(task_id)
+        return task.progress() if task else None
+
+    def get_overall_progress(self, task_ids=None):
+        """
+        获取一组任务的汇总进度
+
+        Args:
+            task_ids: 任务ID列表，默认为全部任务
+        """
+        with self._lock:
+            tasks = [self._tasks[i] for i in task_ids if i in self._tasks] if task_ids else list(self._tasks.values())
+
+        progresses = [task.progress() for task in tasks]
+        total_size = sum(p['size'] or 0 for p in progresses)
+        downloaded = sum(p['downloaded'] for p in progresses)
+        finished = [p for p in progresses if p['status'] in (DownloadTask.COMPLETED, DownloadTask.FAILED, DownloadTask.CANCELLED)]
+        running = [p for p in progresses if p['status'] == DownloadTask.RUNNING]
+
+        return {
+            'total': len(progresses),
+            'finished': len(finished),
+            'completed': sum(1 for p in finished if p['status'] == DownloadTask.COMPLETED),
+            'failed': sum(1 for p in finished if p['status'] == DownloadTask.FAILED),
+            'running': [p['name'] for p in running],
+            'downloaded': downloaded,
+            'size': total_size,
+            'percent': min(100.0, downloaded * 100.0 / total_size) if total_size else None,
+            'speed': sum(p['speed'] for p in running),
+        }
+
+    def wait(self, task_id, timeout=None):
+        """等待任务结束并返回最终进度"""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        task._done_event.wait(timeout)
+        return task.progress()
+
+    def cancel(self, task_id):
+        """取消任务，已下载的部分保留用于续传"""
+        task = self._tasks.get(task_id)
+        if task and not task.is_finished:
+            task._stop_event.set()
+            if task.status == DownloadTask.QUEUED:
+                self._finish(task, DownloadTask.CANCELLED)
+
+    def cancel_all(self):
+        """取消所有未完成的任务"""
+        for task_id in list(self._tasks):
+            self.cancel(task_id)
+
+    def set_bandwidth_limit(self, bytes_per_second):
+        """设置全局限速（字节/秒），0表示不限速；共享限速器时对所有使用者生效"""
+        self._bandwidth.set_rate(bytes_per_second)
+
+    def shutdown(self):
+        """取消全部任务并关闭线程池"""
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, task, status, error=None):
+        """标记任务结束"""
+        task.status = status
+        task.error = error
+        task._finished_at = time.monotonic()
+        task._done_event.set()
+
+    def _run(self, task):
+        """后台线程：执行单个下载任务"""
+        if task._stop_event.is_set():
+            self._finish(task, DownloadTask.CANCELLED)
+            return
+
+        task.status = DownloadTask.RUNNING
+        task._started_at = time.monotonic()
+
+        try:
+            target_dir = os.path.dirname(task.dest_path)
+            if target_dir:
+                os.makedirs(target_dir, exist_ok=True)
+
+            size, accepts_ranges = self._probe(task.url)
+            if size is not None:
+                task.size = size
+
+            if size == 0:
+                # 空文件直接创建，不再发起下载请求
+                open(task.part_path, 'wb').close()
+            elif accepts_ranges and task.size:
+                self._download_ranged(task)
+            else:
+                self._download_stream(task)
+
+            if task._stop_event.is_set():
+                self._save_state(task, force=True)
+                self._finish(task, DownloadTask.CANCELLED)
+                self.logger.info(f"下载已取消: {task.name}")
+                return
+
+            os.replace(task.part_path, task.dest_path)
+            if os.path.exists(task.state_path):
+                os.remove(task.state_path)
+            self._finish(task, DownloadTask.COMPLETED)
+            self.logger.info(f"下载完成: {task.name}, 大小: {task.downloaded} 字节")
+
+        except Exception as e:
+            self._save_state(task, force=True)
+            self._finish(task, DownloadTask.FAILED, str(e))
+            self.logger.error(f"下载失败: {task.name}: {e}")
+
+    def _probe(self, url):
+        """
+        探测文件大小及是否支持Range请求
+
+        Returns:
+            (文件大小或None, 是否支持分段)
+        """
+        headers = {'Range': 'bytes=0-0'}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416 and response.headers.get('Content-Range', '').endswith('/0'):
+                # 空文件无法满足 bytes=0-0，服务器返回 416 和 Content-Range: bytes */0
+                return 0, False
+            response.raise_for_status()
+            if response.status_code == 206:
+                content_range = response.headers.get('Content-Range', '')
+                total = content_range.rsplit('/', 1)[-1]
+                if total.isdigit():
+                    return int(total), True
+                return None, False
+
+            length = response.headers.get('Content-Length')
+            return (int(length) if length and length.isdigit() else None), False
+
+    def _plan_segments(self, size):
+        """按文件大小划分下载分段"""
+        count = 1
+        if size >= self.SEGMENT_THRESHOLD:
+            count = max(1, min(self.segments_per_file, size // self.MIN_SEGMENT_SIZE))
+
+        step = size // count
+        segments = []
+        for i in range(count):
+            start = i * step
+            end = size - 1 if i == count - 1 else start + step - 1
+            segments.append({'start': start, 'end': end, 'done': 0})
+        return segments
+
+    def _load_state(self, task):
+        """读取断点续传状态，状态无效时返回None"""
+        try:
+            if not (os.path.exists(task.state_path) and os.path.exists(task.part_path)):
+                return None
+            if os.path.getsize(task.part_path) != task.size:
+                return None
+
+            with open(task.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('size') != task.size:
+                return None
+            return state.get('segments') or None
+        except Exception as e:
+            self.logger.debug(f"读取续传状态失败，重新下载: {task.name}: {e}")
+            return None
+
+    def _save_state(self, task, force=False):
+        """保存断点续传状态（默认按间隔节流）"""
+        if not task.segments or not task.size:
+            return
+
+        now = time.monotonic()
+        with task._lock:
+            if not force and now - task._last_saved < self.STATE_SAVE_INTERVAL:
+                return
+            task._last_saved = now
+            state = {
+                'size': task.size,
+                'segments': [dict(segment) for segment in task.segments],
+            }
+
+        try:
+            temp_path = task.state_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, task.state_path)
+        except Exception as e:
+            self.logger.debug(f"保存续传状态失败: {task.name}: {e}")
+
+    def _download_ranged(self, task):
+        """分段并行下载（支持断点续传）"""
+        segments = self._load_state(task)
+        if segments:
+            self.logger.info(f"继续未完成的下载: {task.name}")
+        else:
+            segments = self._plan_segments(task.size)
+            with open(task.part_path, 'wb') as f:
+                f.truncate(task.size)
+
+        task.segments = segments
+        task.downloaded = sum(segment['done'] for segment in segments)
+        self._save_state(task, force=True)
+
+        pending = [s for s in segments if s['start'] + s['done'] <= s['end']]
+        if len(pending) == 1:
+            self._download_segment(task, pending[0])
+            return
+
+        errors = []
+        # 分段失败单独用一个事件通知其余分段停止，不占用取消标志，避免清除用户同时发出的取消
+        failed = threading.Event()
+
+        def worker(segment):
+            try:
+                self._download_segment(task, segment, failed)
+            except Exception as e:
+                errors.append(e)
+                # 一个分段失败时停止其余分段，保留进度用于续传
+                failed.set()
+
+        threads = [
+            threading.Thread(target=worker, args=(segment,), daemon=True,
+                             name=f"Download-{task.id}-{index}")
+            for index, segment in enumerate(pending)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors and not task._stop_event.is_set():
+            # 用户已取消时按取消处理，不报告分段错误
+            raise errors[0]
+
+    def _download_segment(self, task, segment, failed):
+        """
+        下载单个分段，失败时从已完成位置重试
+
+        segment['done'] 只计入已刷新到磁盘的字节，续传状态中记录的进度不会超过文件中实际写入的数据
+        """
+        def stopped():
+            return task._stop_event.is_set() or failed.is_set()
+
+        attempt = 0
+        while True:
+            start = segment['start'] + segment['done']
+            if start > segment['end'] or stopped():
+                return
+
+            try:
+                headers = {'Range': f"bytes={start}-{segment['end']}"}
+                with self.session.get(task.url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise DownloadError(f"服务器未返回分段内容 (HTTP {response.status_code})")
+
+                    with open(task.part_path, 'r+b') as f:
+                        f.seek(start)
+                        written = 0
+                        last_commit = time.monotonic()
+                        try:
+                            for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                                if stopped():
+                                    return
+                                if not chunk:
+                                    continue
+                                remaining = segment['end'] + 1 - (start + written)
+                                chunk = chunk[:remaining]
+                                self._bandwidth.consume(len(chunk))
+                                f.write(chunk)
+                                written += len(chunk)
+                                task.add_bytes(len(chunk))
+                                if len(chunk) == remaining:
+                                    break
+                                if time.monotonic() - last_commit >= self.STATE_SAVE_INTERVAL:
+                                    written = self._commit_segment(task, segment, f, written)
+                                    last_commit = time.monotonic()
+                        finally:
+                            self._commit_segment(task, segment, f, written)
+
+                if segment['start'] + segment['done'] <= segment['end']:
+                    raise DownloadError("连接提前结束")
+                return
+
+            except Exception as e:
+                attempt += 1
+                if attempt > self.SEGMENT_RETRIES or stopped():
+                    raise
+                self.logger.warning(f"分段下载失败，第{attempt}次重试: {task.name}: {e}")
+                time.sleep(min(2 ** attempt, 10))
+
+    def _commit_segment(self, task, segment, f, written):
+        """把已写入的字节刷新到磁盘后计入分段进度并保存续传状态
+
+        Returns:
+            int: 0（已写入但未计入进度的字节数清零）
+        """
+        if written:
+            f.flush()
+            os.fsync(f.fileno())
+            with task._lock:
+                segment['done'] += written
+            self._save_state(task)
+        return 0
+
+    def _download_stream(self, task):
+        """服务器不支持Range时整体下载"""
+        task.downloaded = 0
+        task.segments = []
+        with self.session.get(task.url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            with open(task.part_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    if task._stop_event.is_set():
+                        return
+                    if not chunk:
+                        continue
+                    self._bandwidth.consume(len(chunk))
+                    f.write(chunk)
+                    task.add_bytes(len(chunk))
+
+        if task.size and task.downloaded != task.size:
+            raise DownloadError(f"文件大小不匹配: 期望 {task.size} 字节，实际 {task.downloaded} 字节")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件夹递归统计
+以有限并发遍历文件夹下的全部子文件夹，边遍历边给出文件数、总大小和音视频时长，
+可随时取消；同一服务器上同时进行的多个遍历共享一个并发上限
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.core.logger import get_logger
+
+
+# 每个服务器的并发请求上限 {服务器标识: Semaphore}
+_server_semaphores = {}
+_server_semaphores_lock = threading.Lock()
+
+
+def get_server_semaphore(server_key, limit):
+    """获取服务器共享的并发限制（首次创建时的limit生效）"""
+    with _server_semaphores_lock:
+        semaphore = _server_semaphores.get(server_key)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(max(1, limit))
+            _server_semaphores[server_key] = semaphore
+        return semaphore
+
+
+class FolderWalker:
+    """并行递归统计一个文件夹"""
+
+    # 进度回调的最长间隔（秒）
+    PROGRESS_INTERVAL = 0.5
+
+    # 统计时长的文件类型（OpenList列表给出的类型）
+    MEDIA_TYPES = ('audio', 'video')
+
+    def __init__(self, client, path, on_progress=None, on_finished=None, on_listed=None,
+                 metadata_cache=None, max_workers=4):
+        """
+        初始化遍历器
+
+        Args:
+            client: OpenList客户端
+            path: 要统计的文件夹路径
+            on_progress: 进度回调 on_progress(totals)，在后台线程中调用
+            on_finished: 结束回调 on_finished(totals)，在后台线程中调用，取消后不调用
+            on_listed: 每个文件夹列表获取后的回调 on_listed(path, entries)，可用于写入目录缓存
+            metadata_cache: 媒体元数据缓存（提供get_many），用于累计已探测文件的时长
+            max_workers: 该服务器的最大并发请求数
+        """
+        self.logger = get_logger()
+        self.client = client
+        self.path = path
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.on_listed = on_listed
+        self.metadata_cache = metadata_cache
+        self.max_workers = max_workers
+        self._semaphore = get_server_semaphore(client.server_key, max_workers)
+        self._cancelled = threading.Event()
+        self._visited = set()
+        self.totals = {
+            'files': 0,          # 文件数
+            'folders': 0,        # 子文件夹数
+            'bytes': 0,          # 文件总大小
+            'media_files': 0,    # 音视频文件数
+            'media_known': 0,    # 其中已知时长的文件数
+            'duration': 0,       # 已知时长合计（毫秒）
+            'errors': 0,         # 读取失败的文件夹数
+            'pending': 0,        # 尚未读取完的文件夹数
+        }
+
+    def start(self):
+        """在后台线程中开始遍历"""
+        worker = threading.Thread(target=self._run, name="FolderWalker", daemon=True)
+        worker.start()
+
+    def cancel(self):
+        """取消遍历，已发出的请求完成后结果会被丢弃"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _run(self):
+        """后台线程：调度各文件夹的列表请求并汇总结果"""
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="FolderWalk")
+        running = {}   # Future -> 路径
+
+        def visit(path):
+            if path in self._visited:
+                return
+            self._visited.add(path)
+            running[executor.submit(self._list_folder, path)] = path
+
+        try:
+            visit(self.path)
+            while running and not self.cancelled:
+                self.totals['pending'] = len(running)
+                done, _ = wait(running, timeout=self.PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = running.pop(future)
+                    try:
+                        entries = future.result()
+                    except Exception as e:
+                        self.logger.debug(f"统计文件夹时读取失败: {path}: {e}")
+                        self.totals['errors'] += 1
+                        continue
+
+                    base = path.rstrip('/')
+                    for entry in entries:
+                        if entry.is_dir:
+                            self.totals['folders'] += 1
+                            visit(f"{base}/{entry.name}")
+                    self._add_files(base, entries)
+
+                self.totals['pending'] = len(running)
+                self._notify(self.on_progress)
+        except Exception as e:
+            self.logger.error(f"统计文件夹失败: {self.path}: {e}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.cancelled:
+            self.logger.info(f"已取消统计文件夹: {self.path}")
+            return
+        self.logger.info(
+            f"文件夹统计完成: {self.path}, {self.totals['files']} 个文件, {self.totals['bytes']} 字节"
+        )
+        self._notify(self.on_finished)
+
+    def _list_folder(self, path):
+        """后台线程：在服务器并发上限内获取文件夹的完整列表"""
+        with self._semaphore:
+            if self.cancelled:
+                return []
+            entries = self.client.get_file_list(path).get('files', [])
+        if self.on_listed:
+            try:
+                self.on_listed(path, entries)
+            except Exception as e:
+                self.logger.error(f"文件夹列表回调失败: {path}: {e}")
+        return entries
+
+    def _add_files(self, base, entries):
+        """累计一个文件夹中文件的数量、大小和已知时长"""
+        media_keys = []
+        for entry in entries:
+            if entry.is_dir:
+                continue
+            self.totals['files'] += 1
+            self.totals['bytes'] += entry.size
+            if entry.mime_type in self.MEDIA_TYPES:
+                self.totals['media_files'] += 1
+                media_keys.append((f"{base}/{entry.name}", entry.size, entry.modified_time))
+
+        if media_keys and self.metadata_cache is not None:
+            for info in self.metadata_cache.get_many(self.client.server_key, media_keys).values():
+                if info.get('duration'):
+                    self.totals['media_known'] += 1
+                    self.totals['duration'] += info['duration']
+
+    def _notify(self, callback):
+        """把当前统计结果的副本交给回调"""
+        if callback and not self.cancelled:
+            try:
+                callback(dict(self.totals))
+            except Exception as e:
+                self.logger.error(f"文件夹统计回调失败: {e}")
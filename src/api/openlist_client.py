@@ -5,14 +5,21 @@ OpenList API客户端
 处理与OpenList服务器的HTTP通信，支持自动重试和错误处理
 """
 
-import logging
+import os
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from urllib.parse import urljoin
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from src.core.logger import get_logger
+from src.core.ttl_cache import TTLCache
+from src.core.request_trace import (
+    lazy_json, trace_request, trace_response, trace_event, is_trace_enabled
+)
+from src.core.file_entry import FileEntry
+from src.api.download_manager import DownloadManager, DownloadTask
 
 
 class OpenListAPIError(Exception):
@@ -20,10 +27,51 @@ class OpenListAPIError(Exception):
     pass
 
 
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """为未指定超时的请求补充默认超时的适配器"""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
 class OpenListClient:
     """OpenList API客户端"""
 
-    def __init__(self, base_url, username, password, ignore_ssl_errors=False):
+    # 连接参数默认值，可在servers.json中按服务器覆盖
+    DEFAULT_CONNECT_TIMEOUT = 10     # 建立连接超时（秒）
+    DEFAULT_READ_TIMEOUT = 30        # 读取响应超时（秒）
+    DEFAULT_POOL_MAXSIZE = 16        # 每个主机保持的最大连接数
+    POOL_CONNECTIONS = 4             # 缓存连接池的主机数（API服务器及下载重定向的存储主机）
+
+    # 媒体URL探测参数
+    MEDIA_URL_PROBE_TIMEOUT = 3      # 单个策略HEAD探测超时（秒）
+    MEDIA_URL_RESOLVE_TIMEOUT = 10   # 并行解析总等待时间（秒）
+    MEDIA_URL_CACHE_TTL = 600        # 成功策略缓存有效期（秒）
+
+    # 流式目录列表每页条目数
+    LIST_PAGE_SIZE = 500
+
+    # AList条目type字段到内部类型的映射
+    _FILE_TYPE_MAPPING = {
+        0: 'file',        # 文件
+        1: 'folder',      # 文件夹
+        2: 'video',       # 视频
+        3: 'audio',       # 音频
+        4: 'text',        # 文本文件
+        5: 'image'        # 图片
+    }
+
+    # 成功的URL策略缓存，按 (服务器, 用户基础路径) 记录，跨客户端实例共享
+    _media_strategy_cache = TTLCache(maxsize=256, ttl=MEDIA_URL_CACHE_TTL)
+
+    def __init__(self, base_url, username, password, ignore_ssl_errors=False,
+                 connect_timeout=None, read_timeout=None, pool_maxsize=None):
         """
         初始化API客户端
 
@@ -32,22 +80,38 @@ class OpenListClient:
             username: 用户名
             password: 密码
             ignore_ssl_errors: 是否忽略SSL证书错误
+            connect_timeout: 建立连接超时（秒），默认DEFAULT_CONNECT_TIMEOUT
+            read_timeout: 读取响应超时（秒），默认DEFAULT_READ_TIMEOUT
+            pool_maxsize: 每个主机的连接池大小，应不小于并发请求数
+                          （目录加载、预取、下载分段等），默认DEFAULT_POOL_MAXSIZE
         """
         self.base_url = base_url.rstrip('/')
         self.username = username
         self.password = password
         self.ignore_ssl_errors = ignore_ssl_errors
+        self.timeout = (
+            connect_timeout or self.DEFAULT_CONNECT_TIMEOUT,
+            read_timeout or self.DEFAULT_READ_TIMEOUT
+        )
+        self.pool_maxsize = pool_maxsize or self.DEFAULT_POOL_MAXSIZE
 
         self.logger = get_logger()
         self.session = None
         self.auth_token = None
         self.user_info = None  # 存储用户信息
+        self._probe_executor = None  # 媒体URL并行探测线程池（按需创建）
+        self._probe_session = None   # 媒体URL探测专用会话（不带认证头、不重试，按需创建）
 
         # 初始化会话
         self._init_session()
 
         self.logger.info(f"OpenList客户端初始化完成: {base_url}")
 
+    @property
+    def server_key(self):
+        """服务器标识（用户名@服务器地址），用于区分各服务器的本地缓存"""
+        return f"{self.username}@{self.base_url}"
+
     def _init_session(self):
         """初始化HTTP会话"""
         self.session = requests.Session()
@@ -70,12 +134,16 @@ class OpenListClient:
                 backoff_factor=1
             )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # requests不支持会话级超时，由适配器为每个请求补充默认的(连接, 读取)超时
+        adapter = _TimeoutHTTPAdapter(
+            max_retries=retry_strategy,
+            timeout=self.timeout,
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.pool_maxsize
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-
-        # 设置超时
-        self.session.timeout = 30
+        self.logger.debug(f"连接池大小: {self.pool_maxsize}, 超时: {self.timeout}")
 
         # 配置SSL验证 - 默认启用SSL验证
         if self.ignore_ssl_errors:
@@ -132,18 +200,9 @@ class OpenListClient:
         url = urljoin(self.base_url, endpoint)
 
         try:
-            self.logger.debug(f"发送{method}请求到: {url}")
-            self.logger.debug(f"请求头: {dict(self.session.headers)}")
-
-            # 控制台打印请求信息（过滤敏感信息）
-            print(f"\n[API请求] 方法: {method}")
-            print(f"[API请求] URL: {url}")
-            if data:
-                filtered_data = self._filter_sensitive_data(data)
-                print(f"[API请求] 数据: {json.dumps(filtered_data, ensure_ascii=False, indent=2)}")
-            if params:
-                filtered_params = self._filter_sensitive_data(params)
-                print(f"[API请求] 参数: {json.dumps(filtered_params, ensure_ascii=False, indent=2)}")
+            # 请求详情仅在开启跟踪（OPENLIST_TRACE）时格式化输出
+            trace_request(method, url, data=data, params=params, headers=self.session.headers)
+            started = time.perf_counter()
 
             if method.upper() == 'GET':
                 response = self.session.get(url, params=params)
@@ -157,9 +216,7 @@ class OpenListClient:
                 raise OpenListAPIError(f"不支持的HTTP方法: {method}")
 
             # 记录响应信息
-            self.logger.debug(f"响应状态码: {response.status_code}")
-            print(f"[API请求] 响应状态码: {response.status_code}")
-            print(f"[API请求] 响应头: {dict(response.headers)}")
+            trace_response(method, url, response.status_code, time.perf_counter() - started, response.headers)
 
             # 检查响应状态
             if response.status_code == 401:
@@ -187,23 +244,18 @@ class OpenListClient:
             # 解析响应数据
             try:
                 response_data = response.json()
-                summary = {
-                    "code": response_data.get("code"),
-                    "keys": list(response_data.keys()),
-                }
-                data_section = response_data.get("data")
-                if isinstance(data_section, dict):
-                    summary["data_keys"] = list(data_section.keys())
-                    if "content" in data_section and isinstance(data_section["content"], list):
-                        summary["data_count"] = len(data_section["content"])
-                self.logger.debug(f"API响应数据概要: {summary}")
-
-                if self.logger.isEnabledFor(logging.DEBUG):
-                    filtered_response = self._filter_sensitive_data(response_data)
-                    self.logger.debug(
-                        "API响应详细数据: %s",
-                        json.dumps(filtered_response, ensure_ascii=False, indent=2)
-                    )
+                if is_trace_enabled():
+                    summary = {
+                        "code": response_data.get("code"),
+                        "keys": list(response_data.keys()),
+                    }
+                    data_section = response_data.get("data")
+                    if isinstance(data_section, dict):
+                        summary["data_keys"] = list(data_section.keys())
+                        if "content" in data_section and isinstance(data_section["content"], list):
+                            summary["data_count"] = len(data_section["content"])
+                    trace_event("响应概要 %s: %s", endpoint, summary)
+                    trace_event("响应数据 %s: %s", endpoint, lazy_json(response_data))
                 return response_data
             except ValueError:
                 # 检查是否是HTML响应（可能是错误页面或重定向）
@@ -214,14 +266,7 @@ class OpenListClient:
 
                     raise OpenListAPIError(error_msg)
                 else:
-                    self.logger.warning(f"API响应不是有效JSON: {response.text[:200]}...")
-
-                    # 控制台打印非JSON响应信息
-                    print(f"\n[API响应] 状态码: {response.status_code}")
-                    print(f"[API响应] 端点: {endpoint}")
-                    print(f"[API响应] 类型: {content_type}")
-                    print(f"[API响应] 内容前200字符: {response.text[:200]}")
-
+                    self.logger.warning(f"API响应不是有效JSON ({endpoint}, {content_type}): {response.text[:200]}...")
                     return response.text
 
         except requests.exceptions.ConnectionError as e:
@@ -281,7 +326,7 @@ class OpenListClient:
                 # 尝试不同的认证方式
                 self.session.headers['Authorization'] = self.auth_token
                 self.logger.info("登录成功")
-                self.logger.debug(f"设置认证头: Authorization = {self.auth_token}")
+                self.logger.debug("已设置认证头: Authorization")
 
                 # 登录成功后获取用户信息
                 try:
@@ -522,39 +567,11 @@ class OpenListClient:
                     raise OpenListAPIError(f"API响应格式错误，期望dict，得到{type(response)}")
 
                 if response.get('code') == 200:
-                    content = response.get('data', {}).get('content', [])
+                    content = response.get('data', {}).get('content') or []
                     total = response.get('data', {}).get('total', 0)
 
                     # 转换AList格式到我们的格式
-                    files = []
-                    for item in content:
-                        # 根据AList格式判断文件类型
-                        if item.get('is_dir', False):
-                            mime_type = 'inode/directory'
-                        else:
-                            # AList的type字段是整数，根据类型映射
-                            file_type = item.get('type', 0)
-                            # 根据API返回的type字段映射文件类型
-                            type_mapping = {
-                                0: 'file',        # 文件
-                                1: 'folder',      # 文件夹
-                                2: 'video',       # 视频
-                                3: 'audio',       # 音频
-                                4: 'text',        # 文本文件
-                                5: 'image'        # 图片
-                            }
-                            mime_type = type_mapping.get(file_type, 'file')
-
-                        file_info = {
-                            'name': item.get('name', ''),
-                            'size': item.get('size', 0),
-                            'modified_time': item.get('modified', ''),
-                            'mime_type': mime_type,
-                            'path': item.get('path', ''),
-                            'sign': item.get('sign', ''),  # 保存签名信息
-                            'id': item.get('name', '')
-                        }
-                        files.append(file_info)
+                    files = [self._convert_file_item(item) for item in content]
 
                     self.logger.debug(f"获取到{len(files)}个文件，总计{total}个")
                     # 当per_page=0时，total_pages设为1（表示所有文件在一页中）
@@ -579,6 +596,117 @@ class OpenListClient:
             self.logger.error(f"获取文件列表失败: {e}")
             raise
 
+    def iter_file_list(self, path="/", per_page=None):
+        """
+        分页流式获取文件列表
+
+        后台线程预取下一页，调用方处理当前页时网络请求已在进行，
+        大目录无需等待全部条目解析完成即可开始显示。
+
+        Args:
+            path: 文件路径
+            per_page: 每页文件数，默认使用LIST_PAGE_SIZE
+
+        Yields:
+            与get_file_list相同结构的单页数据
+        """
+        per_page = per_page or self.LIST_PAGE_SIZE
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FileListPage")
+        try:
+            pending = executor.submit(self.get_file_list, path, 1, per_page)
+            while pending is not None:
+                result = pending.result()
+                page = result['page']
+                pending = None
+                if result['files'] and page < result['total_pages']:
+                    pending = executor.submit(self.get_file_list, path, page + 1, per_page)
+                yield result
+        finally:
+            # 调用方提前结束迭代时丢弃尚未开始的预取
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search(self, keywords, parent="/", page=1, per_page=None):
+        """
+        使用服务器索引搜索文件（/api/fs/search，需要服务器开启搜索索引）
+
+        Args:
+            keywords: 搜索关键词
+            parent: 搜索范围（服务器路径）
+            page: 页码
+            per_page: 每页条目数，默认使用LIST_PAGE_SIZE
+
+        Returns:
+            dict: {'files': FileEntry列表（path为完整路径）, 'total': 总数, 'page': 页码}
+
+        Raises:
+            OpenListAPIError: 服务器未开启搜索或请求失败
+        """
+        per_page = per_page or self.LIST_PAGE_SIZE
+        data = {
+            'parent': parent,
+            'keywords': keywords,
+            'scope': 0,
+            'page': page,
+            'per_page': per_page,
+            'password': ''
+        }
+        response = self._make_request('POST', '/api/fs/search', data=data)
+
+        if not isinstance(response, dict):
+            raise OpenListAPIError(f"API响应格式错误，期望dict，得到{type(response)}")
+        if response.get('code') != 200:
+            raise OpenListAPIError(response.get('message', '搜索失败'))
+
+        content = (response.get('data') or {}).get('content') or []
+        files = []
+        for item in content:
+            entry = self._convert_file_item(item)
+            entry.path = f"{(item.get('parent') or '/').rstrip('/')}/{entry.name}"
+            files.append(entry)
+        return {
+            'files': files,
+            'total': (response.get('data') or {}).get('total', len(files)),
+            'page': page
+        }
+
+    def iter_search(self, keywords, parent="/", per_page=None):
+        """
+        分页获取服务器搜索结果
+
+        Yields:
+            每页的FileEntry列表
+        """
+        page = 1
+        received = 0
+        while True:
+            result = self.search(keywords, parent, page, per_page)
+            files = result['files']
+            if not files:
+                return
+            received += len(files)
+            yield files
+            if received >= result['total']:
+                return
+            page += 1
+
+    def _convert_file_item(self, item):
+        """将AList格式的条目转换为FileEntry"""
+        # 根据AList格式判断文件类型
+        if item.get('is_dir', False):
+            mime_type = 'inode/directory'
+        else:
+            # AList的type字段是整数，根据API返回的type字段映射文件类型
+            mime_type = self._FILE_TYPE_MAPPING.get(item.get('type', 0), 'file')
+
+        return FileEntry(
+            name=item.get('name', ''),
+            size=item.get('size', 0),
+            modified_time=item.get('modified', ''),
+            mime_type=mime_type,
+            path=item.get('path', ''),
+            sign=item.get('sign', '')  # 保存签名信息
+        )
+
     def get_file_info(self, file_id):
         """
         获取文件详细信息
@@ -604,45 +732,64 @@ class OpenListClient:
             self.logger.error(f"获取文件信息失败: {e}")
             raise
 
-    def download_file(self, file_id, local_path):
+    def download_file(self, file_path, local_path):
         """
-        下载文件
+        下载文件（支持分段并行和断点续传）
+
+        使用签名下载链接（/d/...?sign=），下载会话不带Authorization头：
+        /d/ 链接通常重定向到第三方存储，不能把OpenList的登录令牌发给它们。
 
         Args:
-            file_id: 文件ID
+            file_path: 服务器上的文件路径
             local_path: 本地保存路径
 
         Returns:
             下载结果
         """
+        session = None
+        manager = None
         try:
-            # 获取文件信息
-            file_info = self.get_file_info(file_id)
-            download_url = file_info.get('download_url')
-
-            if not download_url:
-                raise OpenListAPIError("无法获取文件下载链接")
-
-            # 构建完整的下载URL
-            if not download_url.startswith('http'):
-                download_url = urljoin(self.base_url, download_url)
+            download_url = self._build_signed_download_url(file_path)
 
-            # 发送下载请求
-            response = self.session.get(download_url, stream=True)
-            response.raise_for_status()
+            session = self._create_probe_session()
+            manager = DownloadManager(session, max_workers=1)
+            task_id = manager.add(download_url, local_path)
+            progress = manager.wait(task_id)
 
-            # 保存文件
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if progress['status'] != DownloadTask.COMPLETED:
+                raise OpenListAPIError(progress['error'] or "下载未完成")
 
             file_size = os.path.getsize(local_path)
-            self.logger.info(f"文件下载成功: {file_id}, 大小: {file_size} 字节")
+            self.logger.info(f"文件下载成功: {file_path}, 大小: {file_size} 字节")
             return True, f"下载成功，文件大小: {self._format_size(file_size)}"
 
         except Exception as e:
             self.logger.error(f"下载文件失败: {e}")
             raise OpenListAPIError(f"下载文件失败: {e}")
+        finally:
+            if manager is not None:
+                manager.shutdown()
+            if session is not None:
+                session.close()
+
+    def _build_signed_download_url(self, file_path):
+        """
+        构建文件的签名下载链接：基础地址/d/(用户基础路径+文件路径)?sign=签名
+
+        Args:
+            file_path: 服务器上的文件路径（相对用户基础路径）
+        """
+        import urllib.parse
+
+        response = self._make_request('POST', '/api/fs/get', data={'path': file_path})
+        if response.get('code') != 200:
+            raise OpenListAPIError(response.get('message', '获取文件信息失败'))
+        sign = response.get('data', {}).get('sign', '')
+
+        base_path = self._get_user_base_path_for_url() or '/'
+        full_path = base_path.rstrip('/') + '/' + file_path.lstrip('/')
+        url = f"{self.base_url}/d/{urllib.parse.quote(full_path.lstrip('/'), safe='')}"
+        return f"{url}?sign={sign}" if sign else url
 
     def delete_file(self, file_id):
         """
@@ -744,20 +891,24 @@ class OpenListClient:
                 lambda: f"{base_url}{normalized_path}",
             ]
 
-            # 尝试每个策略
-            for i, strategy in enumerate(strategies, 1):
+            # 同一服务器、同一基础路径下成功过的策略直接复用，跳过探测
+            cache_key = (base_url, self._get_user_base_path_for_url() or '/')
+            cached_index = self._media_strategy_cache.get(cache_key)
+            if cached_index is not None:
                 try:
-                    url = strategy()
-                    self.logger.debug(f"策略{i}: {url}")
-
-                    # 简单验证URL可访问性（可选）
-                    if self._test_url_accessible(url):
-                        self.logger.info(f"使用策略{i}成功: {url}")
-                        return url
-
+                    url = strategies[cached_index - 1]()
+                    self.logger.debug(f"复用缓存的策略{cached_index}: {url}")
+                    return url
                 except Exception as e:
-                    self.logger.debug(f"策略{i}失败: {e}")
-                    continue
+                    self.logger.debug(f"缓存的策略{cached_index}失效，重新探测: {e}")
+                    self._media_strategy_cache.pop(cache_key)
+
+            # 并行探测所有策略，按策略优先级返回第一个可访问的URL
+            index, url = self._resolve_strategies_parallel(strategies)
+            if url:
+                self._media_strategy_cache.set(cache_key, index)
+                self.logger.info(f"使用策略{index}成功: {url}")
+                return url
 
             # 如果所有策略都失败，使用第一个策略的结果
             self.logger.warning("所有策略验证失败，使用第一个策略")
@@ -789,12 +940,99 @@ class OpenListClient:
             self.logger.debug(f"API URL获取失败: {e}")
         raise Exception("API获取失败")
 
+    def _get_probe_executor(self):
+        """获取媒体URL探测线程池及探测会话（按需创建）"""
+        if self._probe_executor is None:
+            self._probe_executor = ThreadPoolExecutor(
+                max_workers=6,
+                thread_name_prefix="MediaUrlProbe"
+            )
+        if self._probe_session is None:
+            self._probe_session = self._create_probe_session()
+        return self._probe_executor
+
+    def _create_probe_session(self):
+        """
+        创建媒体URL探测会话
+
+        探测地址可能是第三方存储的直链，不能带上OpenList的Authorization头；
+        也不使用主会话的重试策略，保证单次探测不超过MEDIA_URL_PROBE_TIMEOUT
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            max_retries=0,
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=6
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.verify = not self.ignore_ssl_errors
+        session.headers.update({'User-Agent': 'OpenListManager/1.0'})
+        return session
+
+    def _probe_strategy(self, index, strategy):
+        """构建单个策略的URL并验证可访问性，失败返回None"""
+        try:
+            url = strategy()
+            self.logger.debug(f"策略{index}: {url}")
+            if self._test_url_accessible(url):
+                return url
+        except Exception as e:
+            self.logger.debug(f"策略{index}失败: {e}")
+        return None
+
+    def _resolve_strategies_parallel(self, strategies):
+        """
+        并行探测URL策略
+
+        所有策略同时探测，但结果仍按策略顺序取舍：只有当排在前面的策略
+        全部失败后，才采用后面的成功结果，与逐个尝试的选择保持一致。
+
+        Args:
+            strategies: 按优先级排列的URL构建函数列表
+
+        Returns:
+            tuple: (策略序号, URL)，全部失败时返回 (None, None)
+        """
+        executor = self._get_probe_executor()
+        futures = {
+            executor.submit(self._probe_strategy, index, strategy): index
+            for index, strategy in enumerate(strategies, 1)
+        }
+        results = {}
+
+        try:
+            for future in as_completed(futures, timeout=self.MEDIA_URL_RESOLVE_TIMEOUT):
+                results[futures[future]] = future.result()
+
+                # 检查是否已经可以按优先级做出决定
+                for index in range(1, len(strategies) + 1):
+                    if index not in results:
+                        break
+                    if results[index]:
+                        return index, results[index]
+        except FuturesTimeoutError:
+            self.logger.warning("媒体URL探测超时")
+        finally:
+            for future in futures:
+                future.cancel()
+
+        # 超时情况下，采用已完成结果中优先级最高的成功策略
+        for index in sorted(results):
+            if results[index]:
+                return index, results[index]
+        return None, None
+
     def _test_url_accessible(self, url):
-        """测试URL是否可访问（简单HEAD请求）"""
+        """测试URL是否可访问（通过探测会话发送HEAD请求，不带认证头）"""
         try:
-            import requests
-            response = requests.head(url, timeout=3, verify=False)
-            return response.status_code == 200
+            session = self._probe_session or self._create_probe_session()
+            response = session.head(url, timeout=self.MEDIA_URL_PROBE_TIMEOUT)
+            if response.status_code != 200:
+                return False
+            # 前端页面对任意路径都会返回200的HTML，不能作为媒体地址
+            content_type = response.headers.get('content-type', '').lower()
+            return 'text/html' not in content_type
         except (requests.exceptions.RequestException, requests.exceptions.Timeout):
             # 网络相关异常
             return False
@@ -924,57 +1162,6 @@ class OpenListClient:
             self.logger.error(f"路径规范化过程中发生错误: {e}")
             return None
 
-    def _filter_sensitive_data(self, data):
-        """
-        过滤敏感数据，防止在日志中泄露密码等信息
-
-        Args:
-            data: 要过滤的数据（字典或列表）
-
-        Returns:
-            过滤后的安全数据
-        """
-        if not data:
-            return data
-
-        try:
-            # 定义敏感字段列表
-            sensitive_fields = {
-                'password', 'pwd', 'passwd', 'secret', 'token', 'key', 'auth',
-                'authorization', 'bearer', 'api_key', 'access_token', 'refresh_token',
-                'private_key', 'public_key', 'session', 'cookie', 'credentials'
-            }
-
-            def filter_item(item):
-                if isinstance(item, dict):
-                    filtered = {}
-                    for key, value in item.items():
-                        # 检查键名是否包含敏感信息
-                        key_lower = str(key).lower()
-                        if any(field in key_lower for field in sensitive_fields):
-                            # 过滤敏感字段
-                            if isinstance(value, str) and len(value) > 0:
-                                filtered[key] = "***" + ("*" * (min(len(value) - 3, 8))) + "***"
-                            else:
-                                filtered[key] = "***HIDDEN***"
-                        elif isinstance(value, (dict, list)):
-                            # 递归过滤嵌套结构
-                            filtered[key] = filter_item(value)
-                        else:
-                            filtered[key] = value
-                    return filtered
-                elif isinstance(item, list):
-                    return [filter_item(sub_item) for sub_item in item]
-                else:
-                    return item
-
-            return filter_item(data)
-
-        except Exception as e:
-            self.logger.warning(f"过滤敏感数据时发生错误: {e}")
-            # 如果过滤失败，返回空数据以避免泄露
-            return {"error": "数据过滤失败"}
-
     def _get_user_base_path_for_url(self):
         """
         获取用户基础路径用于URL构建
@@ -1011,6 +1198,12 @@ class OpenListClient:
     def close(self):
         """关闭客户端连接"""
         self.logout()
+        if self._probe_executor is not None:
+            self._probe_executor.shutdown(wait=False, cancel_futures=True)
+            self._probe_executor = None
+        if self._probe_session is not None:
+            self._probe_session.close()
+            self._probe_session = None
         if self.session:
             self.session.close()
         self.logger.info("OpenList客户端已关闭")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件搜索服务
+服务器开启搜索索引时使用 /api/fs/search；未开启时先查询本地文件名索引立即给出结果，
+再以有限并发遍历目录更新索引（修改时间未变的文件夹直接使用索引中的子项，不发请求），
+找到的结果分批交给界面
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.core.logger import get_logger
+from src.core.search_index import LocalSearchIndex
+from src.api.openlist_client import OpenListAPIError
+
+
+class SearchService:
+    """文件搜索服务，同一时间只进行一次搜索，新的搜索会取消旧的"""
+
+    # 单次搜索最多返回的结果数
+    MAX_RESULTS = 5000
+
+    # 结果分批回调的最小间隔（秒），避免逐条刷新界面
+    FLUSH_INTERVAL = 0.2
+
+    def __init__(self, client, on_results=None, on_finished=None, index=None, max_workers=4):
+        """
+        初始化搜索服务
+
+        Args:
+            client: OpenList客户端
+            on_results: 找到结果回调 on_results(search_id, entries)，在后台线程中调用
+            on_finished: 搜索结束回调 on_finished(search_id, summary)，在后台线程中调用；
+                         summary包含 source（server或local）、count、truncated、error
+            index: 本地文件名索引，默认使用缓存目录下的search_index.db
+            max_workers: 遍历目录时的最大并发请求数
+        """
+        self.logger = get_logger()
+        self.client = client
+        self.on_results = on_results
+        self.on_finished = on_finished
+        self.index = index or LocalSearchIndex()
+        self.max_workers = max_workers
+        self._search_id = 0
+        self._lock = threading.Lock()
+        # 服务器是否支持搜索：None为尚未尝试
+        self._server_search = None
+        self._closed = False
+
+    def search(self, keywords, parent="/"):
+        """
+        开始搜索（立即返回，结果通过回调给出）
+
+        Args:
+            keywords: 关键词，多个关键词以空格分隔，名称需包含全部关键词
+            parent: 搜索范围（服务器路径）
+
+        Returns:
+            int: 本次搜索的标识，回调中用于区分过期结果
+        """
+        with self._lock:
+            self._search_id += 1
+            search_id = self._search_id
+            if self._closed:
+                return search_id
+
+        worker = threading.Thread(
+            target=self._run,
+            args=(search_id, keywords.strip(), parent or "/"),
+            name="Search",
+            daemon=True,
+        )
+        worker.start()
+        return search_id
+
+    def cancel(self):
+        """取消正在进行的搜索"""
+        with self._lock:
+            self._search_id += 1
+
+    def _is_current(self, search_id):
+        """搜索是否仍是最新的一次"""
+        return search_id == self._search_id and not self._closed
+
+    def _run(self, search_id, keywords, parent):
+        """后台线程：执行一次搜索"""
+        collector = _ResultCollector(self, search_id)
+        source = 'local'
+        error = None
+
+        try:
+            if keywords and self._server_search is not False:
+                try:
+                    self._search_server(search_id, keywords, parent, collector)
+                    self._server_search = True
+                    source = 'server'
+                except OpenListAPIError as e:
+                    if self._server_search:
+                        raise
+                    # 服务器未开启搜索索引，本次运行改用本地索引
+                    self.logger.info(f"服务器搜索不可用，使用本地索引: {e}")
+                    self._server_search = False
+
+            if keywords and source == 'local':
+                self._search_local(search_id, keywords, parent, collector)
+
+        except Exception as e:
+            self.logger.error(f"搜索失败: {keywords}: {e}")
+            error = str(e)
+
+        collector.flush()
+        if self._is_current(search_id) and self.on_finished:
+            try:
+                self.on_finished(search_id, {
+                    'source': source,
+                    'count': collector.count,
+                    'truncated': collector.full,
+                    'error': error,
+                })
+            except Exception as e:
+                self.logger.error(f"搜索完成回调失败: {e}")
+
+    def _search_server(self, search_id, keywords, parent, collector):
+        """使用服务器的搜索索引"""
+        for files in self.client.iter_search(keywords, parent):
+            if not self._is_current(search_id):
+                return
+            collector.add(files)
+            if collector.full:
+                return
+
+    def _search_local(self, search_id, keywords, parent, collector):
+        """先查询本地索引，再遍历目录补充新增或变化的条目"""
+        server = self.client.server_key
+        terms = keywords.casefold().split()
+
+        collector.add(self.index.search(server, parent, terms, self.MAX_RESULTS))
+        collector.flush()
+        if collector.full:
+            return
+
+        def matches(entry):
+            name = entry.name.casefold()
+            return all(term in name for term in terms)
+
+        self._crawl(search_id, server, parent, matches, collector)
+
+    def _crawl(self, search_id, server, parent, matches, collector):
+        """
+        以有限并发遍历parent下的全部文件夹并更新本地索引
+
+        上级目录列表给出的修改时间与索引中一致的文件夹，子项直接从索引读取
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="SearchCrawl")
+        folders = deque([(parent, None)])
+        running = {}   # Future -> (路径, 修改时间)
+        listed = 0
+
+        def visit(path, entries):
+            base = path.rstrip('/')
+            found = []
+            for entry in entries:
+                entry.path = f"{base}/{entry.name}"
+                if entry.is_dir:
+                    folders.append((entry.path, entry.modified_time))
+                if matches(entry):
+                    found.append(entry)
+            collector.add(found)
+
+        try:
+            while folders or running:
+                if not self._is_current(search_id) or collector.full:
+                    return
+
+                while folders:
+                    path, stamp = folders.popleft()
+                    if stamp and self.index.folder_stamp(server, path) == stamp:
+                        visit(path, self.index.children(server, path))
+                    else:
+                        running[executor.submit(self._list_folder, path)] = (path, stamp)
+
+                if not running:
+                    continue
+                done, _ = wait(running, timeout=self.FLUSH_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, stamp = running.pop(future)
+                    try:
+                        entries = future.result()
+                    except Exception as e:
+                        self.logger.debug(f"搜索时获取目录失败: {path}: {e}")
+                        continue
+                    listed += 1
+                    self.index.replace_folder(server, path, stamp, entries)
+                    visit(path, entries)
+                collector.flush_if_due()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.logger.debug(f"搜索遍历结束: {parent}, 请求了 {listed} 个目录")
+
+    def _list_folder(self, path):
+        """后台线程：获取文件夹的完整列表"""
+        return self.client.get_file_list(path).get('files', [])
+
+    def close(self):
+        """取消搜索并关闭索引"""
+        with self._lock:
+            self._closed = True
+            self._search_id += 1
+        self.index.close()
+
+
+class _ResultCollector:
+    """收集一次搜索的结果：按路径去重，限制总数，并按间隔分批回调"""
+
+    def __init__(self, service, search_id):
+        self.service = service
+        self.search_id = search_id
+        self.count = 0
+        self.full = False
+        self._seen = set()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def add(self, entries):
+        """加入一批结果，到达回调间隔时交给界面"""
+        for entry in entries:
+            if self.full:
+                break
+            if entry.path in self._seen:
+                continue
+            self._seen.add(entry.path)
+            self._buffer.append(entry)
+            self.count += 1
+            self.full = self.count >= self.service.MAX_RESULTS
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        """距上次回调超过间隔时回调"""
+        if time.monotonic() - self._last_flush >= self.service.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """把缓冲的结果交给回调"""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        entries, self._buffer = self._buffer, []
+        if self.service._is_current(self.search_id) and self.service.on_results:
+            try:
+                self.service.on_results(self.search_id, entries)
+            except Exception as e:
+                self.service.logger.error(f"搜索结果回调失败: {e}")
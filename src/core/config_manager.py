@@ -14,6 +14,11 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 from src.core.logger import get_logger
 
+# 配置目录（相对于程序工作目录）
+CONFIG_DIR = "config"
+# 本地缓存目录（目录列表等可随时删除重建的数据）
+CACHE_DIR = os.path.join(CONFIG_DIR, "cache")
+
 
 class ConfigManager:
     """简化的配置管理器"""
@@ -21,7 +26,7 @@ class ConfigManager:
     def __init__(self):
         """初始化配置管理器"""
         self.logger = get_logger()
-        self.config_dir = "config"
+        self.config_dir = CONFIG_DIR
         self.servers_file = os.path.join(self.config_dir, "servers.json")
         self.last_selected_file = os.path.join(self.config_dir, "last_selected.json")
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录列表磁盘缓存
+按 (服务器, 路径) 保存API返回的文件列表，
+用于再次进入目录时立即显示，随后在后台校验刷新
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from src.core.config_manager import CACHE_DIR
+from src.core.logger import get_logger
+
+
+class DirectoryCache:
+    """基于SQLite的目录列表缓存，线程安全"""
+
+    # 每写入多少次检查一次容量
+    PRUNE_INTERVAL = 50
+
+    def __init__(self, db_path=None, max_entries=5000):
+        """
+        初始化目录缓存
+
+        Args:
+            db_path: 数据库文件路径，默认位于缓存目录
+            max_entries: 最多保留的目录数，超出后按最近访问时间淘汰
+        """
+        self.logger = get_logger()
+        self.db_path = db_path or os.path.join(CACHE_DIR, "directories.db")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._conn = None
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS directories (
+                    server TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    entries BLOB NOT NULL,
+                    updated_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (server, path)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_directories_accessed ON directories (accessed_at)"
+            )
+            self._conn.commit()
+        except Exception as e:
+            self.logger.error(f"初始化目录缓存失败: {e}")
+            self._conn = None
+
+    def get(self, server, path):
+        """
+        读取缓存的目录列表
+
+        Returns:
+            list: 紧凑行数据列表，未命中时返回None
+        """
+        if self._conn is None:
+            return None
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT entries FROM directories WHERE server = ? AND path = ?",
+                    (server, path)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute(
+                    "UPDATE directories SET accessed_at = ? WHERE server = ? AND path = ?",
+                    (time.time(), server, path)
+                )
+                self._conn.commit()
+
+            return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+        except Exception as e:
+            self.logger.error(f"读取目录缓存失败: {path}: {e}")
+            return None
+
+    def put(self, server, path, entries):
+        """写入目录列表"""
+        if self._conn is None:
+            return
+
+        try:
+            payload = json.dumps(entries, ensure_ascii=False, separators=(',', ':'))
+            blob = zlib.compress(payload.encode('utf-8'))
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO directories
+                        (server, path, entries, updated_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (server, path, blob, now, now)
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self.PRUNE_INTERVAL:
+                    self._writes_since_prune = 0
+                    self._prune_locked()
+                self._conn.commit()
+        except Exception as e:
+            self.logger.error(f"写入目录缓存失败: {path}: {e}")
+
+    def invalidate(self, server, path):
+        """删除指定目录的缓存"""
+        if self._conn is None:
+            return
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM directories WHERE server = ? AND path = ?",
+                    (server, path)
+                )
+                self._conn.commit()
+        except Exception as e:
+            self.logger.error(f"删除目录缓存失败: {path}: {e}")
+
+    def _prune_locked(self):
+        """按最近访问时间淘汰超出容量的目录（调用方需持有锁）"""
+        count = self._conn.execute("SELECT COUNT(*) FROM directories").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                """
+                DELETE FROM directories WHERE rowid IN (
+                    SELECT rowid FROM directories ORDER BY accessed_at LIMIT ?
+                )
+                """,
+                (excess,)
+            )
+            self.logger.debug(f"目录缓存已淘汰 {excess} 个条目")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception as e:
+                    self.logger.error(f"关闭目录缓存失败: {e}")
+                self._conn = None
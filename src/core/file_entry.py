@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件条目数据模型
+API层解析目录列表时创建，UI直接使用；显示文本按需格式化，不随条目保存
+"""
+
+from datetime import datetime
+
+from src.core.sort_keys import parse_timestamp
+
+
+def format_file_size(size_bytes):
+    """格式化文件大小"""
+    if size_bytes == 0:
+        return "-"
+
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    elif size_bytes < 1024 * 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    else:
+        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+
+
+def format_date(date_str):
+    """格式化日期"""
+    if not date_str:
+        return "-"
+
+    try:
+        # 尝试解析ISO格式的日期
+        if 'T' in date_str:
+            # ISO格式: 2025-10-15T10:30:00Z
+            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            return dt.strftime("%Y-%m-%d %H:%M")
+        else:
+            return date_str
+    except:
+        return date_str
+
+
+def format_duration(duration_ms):
+    """格式化媒体时长（毫秒）"""
+    if not duration_ms or duration_ms <= 0:
+        return ""
+
+    seconds = int(duration_ms // 1000)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class FileEntry:
+    """目录列表中的单个文件或文件夹"""
+
+    __slots__ = (
+        'name',           # 文件名
+        'size',           # 文件大小（字节）
+        'modified_time',  # 服务器返回的修改时间字符串
+        'timestamp',      # 修改时间戳（秒），用于排序
+        'mime_type',      # 文件类型（inode/directory、file、audio等）
+        'path',           # 服务器返回的路径
+        'sign',           # 下载签名
+        'file_type',      # 界面显示用的文件类型，由UI加载时设置
+        'sort_key',       # 名称排序键（拼音），由UI加载时设置
+        'initials',       # 名称的拼音首字母，用于按首字母查找，由UI加载时设置
+        'media_info',     # 音视频元数据（时长、码率等），后台探测后设置，None表示尚未探测
+    )
+
+    def __init__(self, name='', size=0, modified_time='', mime_type='', path='', sign=''):
+        self.name = name
+        self.size = size or 0
+        self.modified_time = modified_time or ''
+        self.timestamp = parse_timestamp(self.modified_time)
+        self.mime_type = mime_type
+        self.path = path
+        self.sign = sign
+        self.file_type = 'default'
+        self.sort_key = None
+        self.initials = None
+        self.media_info = None
+
+    @property
+    def id(self):
+        """文件标识（与名称相同）"""
+        return self.name
+
+    @property
+    def is_dir(self):
+        """是否为文件夹"""
+        return self.mime_type == 'inode/directory'
+
+    @property
+    def size_text(self):
+        """大小显示文本"""
+        return format_file_size(self.size)
+
+    @property
+    def date_text(self):
+        """修改时间显示文本"""
+        return format_date(self.modified_time)
+
+    @property
+    def duration_text(self):
+        """媒体时长显示文本"""
+        return format_duration(self.media_info.get('duration')) if self.media_info else ""
+
+    def to_row(self):
+        """转换为紧凑的列表形式，用于磁盘缓存"""
+        return [self.name, self.size, self.modified_time, self.mime_type, self.path, self.sign]
+
+    @classmethod
+    def from_row(cls, row):
+        """从to_row()的结果恢复"""
+        return cls(*row)
+
+    def __repr__(self):
+        return f"FileEntry({self.name!r}, {self.mime_type!r}, {self.size})"
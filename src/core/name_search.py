@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件名查找索引
+把目录中每个名称的原文、完整拼音和拼音首字母放进一个排序好的键数组，
+输入前缀时用二分查找定位匹配范围（如“zjl”“zhoujie”“周杰”都能找到“周杰伦”），
+每多输入一个字符只在上一次的范围内继续二分，不需要逐项比较整个目录
+"""
+
+import sys
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+from src.core.sort_keys import name_sort_key, name_initials
+
+
+# 比任何实际字符都大，用作前缀范围的上界
+_PREFIX_END = '\U0010ffff'
+
+
+class NameSearchIndex:
+    """按名称、拼音、拼音首字母前缀查找文件的索引（只记录文件名，与列表排序无关）"""
+
+    def __init__(self, files=()):
+        """
+        建立索引（可在后台线程中调用）
+
+        Args:
+            files: FileEntry列表，sort_key和initials未设置时当场计算
+        """
+        pairs = set()
+        for entry in files:
+            name = entry.name
+            pairs.add((name.casefold(), name))
+            pairs.add((name_sort_key(entry).casefold(), name))
+            pairs.add((name_initials(entry).casefold(), name))
+
+        pairs = sorted(pairs)
+        self._keys = [key for key, _ in pairs]
+        self._names = [name for _, name in pairs]
+        self.size = len(files)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def find(self, prefix, lo=0, hi=None) -> Tuple[int, int]:
+        """
+        查找以prefix开头的键
+
+        Args:
+            prefix: 查找文本（不区分大小写）
+            lo, hi: 只在此范围内查找；传入较短前缀的结果即可逐字符缩小范围
+
+        Returns:
+            tuple: 匹配范围 (lo, hi)，lo == hi 表示没有匹配
+        """
+        if hi is None:
+            hi = len(self._keys)
+        prefix = prefix.casefold()
+        start = bisect_left(self._keys, prefix, lo, hi)
+        end = bisect_left(self._keys, prefix + _PREFIX_END, start, hi)
+        return start, end
+
+
+class MatchPositions:
+    """
+    查找索引中每个键对应文件的列表显示位置
+
+    用线段树记录任意匹配范围内最靠前的位置，选中第一个匹配项只需O(log n)，
+    不必把范围内的每个文件名都换算成位置再取最小值。列表重新加载或排序后重新建立。
+    """
+
+    def __init__(self, index, index_of, version):
+        """
+        Args:
+            index: NameSearchIndex
+            index_of: 文件名 -> 列表位置（不存在时返回-1）
+            version: 建立时媒体索引的版本，用于判断列表是否已变化
+        """
+        self.index = index
+        self.version = version
+        # 比任何列表位置都大，表示文件已不在列表中
+        missing = self._missing = sys.maxsize
+        leaves = [position if position >= 0 else missing for position in map(index_of, index._names)]
+        self._size = len(leaves)
+        tree = [missing] * self._size + leaves
+        for node in range(self._size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if left < right else right
+        self._tree = tree
+        # 循环查找时的匹配范围 -> 范围内全部位置（升序）
+        self._sorted = {}
+
+    def first(self, lo, hi) -> int:
+        """匹配范围内最靠前的列表位置，没有时返回-1"""
+        tree = self._tree
+        best = self._missing
+        lo += self._size
+        hi += self._size
+        while lo < hi:
+            if lo & 1:
+                best = min(best, tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = min(best, tree[hi])
+            lo >>= 1
+            hi >>= 1
+        return best if best < self._missing else -1
+
+    def following(self, lo, hi, position) -> int:
+        """匹配范围内位于position之后的第一个位置，已是最后一个时回到第一个，没有时返回-1"""
+        items = self._sorted.get((lo, hi))
+        if items is None:
+            leaves = self._tree[self._size + lo:self._size + hi]
+            items = self._sorted[(lo, hi)] = sorted({item for item in leaves if item < self._missing})
+        if not items:
+            return -1
+        following = bisect_right(items, position)
+        return items[following] if following < len(items) else items[0]
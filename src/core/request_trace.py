@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP请求跟踪
+默认关闭，设置环境变量 OPENLIST_TRACE=on 后记录请求/响应详情到日志（OpenListManager.trace），
+由 setup_logger 配置的文件日志统一输出。关闭时每次调用只做一次布尔判断，不做任何格式化。
+"""
+
+import json
+import logging
+import os
+import re
+
+TRACE_LOGGER_NAME = "OpenListManager.trace"
+
+# 敏感字段（键名包含以下任一片段即视为敏感）
+SENSITIVE_FIELDS = {
+    'password', 'pwd', 'passwd', 'secret', 'token', 'key', 'auth',
+    'authorization', 'bearer', 'api_key', 'access_token', 'refresh_token',
+    'private_key', 'public_key', 'session', 'cookie', 'credentials'
+}
+
+# URL中的下载签名参数
+_SIGN_PATTERN = re.compile(r'([?&]sign=)[^&#]*')
+
+_trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+
+def _parse_enabled(env_value):
+    """解析环境变量开关"""
+    if not env_value:
+        return False
+    return env_value.strip().upper() in {"ON", "1", "TRUE", "YES", "DEBUG"}
+
+
+_enabled = _parse_enabled(os.getenv("OPENLIST_TRACE"))
+
+
+def set_trace_enabled(enabled):
+    """运行时开启或关闭请求跟踪"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_trace_enabled():
+    """请求跟踪是否开启（且日志系统会实际输出）"""
+    return _enabled and _trace_logger.isEnabledFor(logging.INFO)
+
+
+def redact(data):
+    """
+    过滤敏感数据，防止在日志中泄露密码等信息
+
+    Args:
+        data: 要过滤的数据（字典或列表）
+
+    Returns:
+        过滤后的安全数据
+    """
+    if isinstance(data, dict):
+        filtered = {}
+        for key, value in data.items():
+            # 检查键名是否包含敏感信息
+            key_lower = str(key).lower()
+            if any(field in key_lower for field in SENSITIVE_FIELDS):
+                if isinstance(value, str) and len(value) > 0:
+                    filtered[key] = "***" + ("*" * (min(len(value) - 3, 8))) + "***"
+                else:
+                    filtered[key] = "***HIDDEN***"
+            elif isinstance(value, (dict, list)):
+                # 递归过滤嵌套结构
+                filtered[key] = redact(value)
+            else:
+                filtered[key] = value
+        return filtered
+    elif isinstance(data, list):
+        return [redact(item) for item in data]
+    return data
+
+
+def redact_url(url):
+    """隐藏URL中的下载签名"""
+    return _SIGN_PATTERN.sub(r'\1***', url) if url else url
+
+
+class _Lazy:
+    """延迟格式化的日志参数，仅在日志记录真正输出时才过滤并序列化"""
+
+    __slots__ = ('value', 'formatter')
+
+    def __init__(self, value, formatter):
+        self.value = value
+        self.formatter = formatter
+
+    def __str__(self):
+        try:
+            return self.formatter(self.value)
+        except Exception as e:
+            return f"<格式化失败: {e}>"
+
+
+def _format_json(value):
+    return json.dumps(redact(value), ensure_ascii=False, default=str)
+
+
+def _format_headers(headers):
+    return _format_json(dict(headers))
+
+
+def lazy_json(value):
+    """包装为延迟序列化（含敏感字段过滤）的JSON日志参数"""
+    return _Lazy(value, _format_json)
+
+
+def trace_request(method, url, data=None, params=None, headers=None):
+    """记录发出的请求"""
+    if not is_trace_enabled():
+        return
+    _trace_logger.info(
+        "请求 %s %s params=%s data=%s headers=%s",
+        method, redact_url(url),
+        _Lazy(params, _format_json), _Lazy(data, _format_json),
+        _Lazy(headers or {}, _format_headers)
+    )
+
+
+def trace_response(method, url, status_code, elapsed, headers=None):
+    """记录收到的响应"""
+    if not is_trace_enabled():
+        return
+    _trace_logger.info(
+        "响应 %s %s -> %s (%.0f ms) headers=%s",
+        method, redact_url(url), status_code, elapsed * 1000,
+        _Lazy(headers or {}, _format_headers)
+    )
+
+
+def trace_event(message, *args):
+    """记录其他跟踪信息（参数可使用lazy_json延迟格式化）"""
+    if not is_trace_enabled():
+        return
+    _trace_logger.info(message, *args)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地文件名索引
+服务器未开启搜索索引时，遍历目录得到的文件名保存在SQLite中，
+每个文件夹记录遍历时的修改时间，下次遍历只重新获取修改时间变化的文件夹
+"""
+
+import os
+import sqlite3
+import threading
+
+from src.core.config_manager import CACHE_DIR
+from src.core.file_entry import FileEntry
+from src.core.logger import get_logger
+
+
+class LocalSearchIndex:
+    """基于SQLite的文件名索引，线程安全"""
+
+    def __init__(self, db_path=None):
+        """
+        初始化文件名索引
+
+        Args:
+            db_path: 数据库文件路径，默认位于缓存目录
+        """
+        self.logger = get_logger()
+        self.db_path = db_path or os.path.join(CACHE_DIR, "search_index.db")
+        self._lock = threading.Lock()
+        self._conn = None
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    server TEXT NOT NULL,
+                    parent TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    name_key TEXT NOT NULL,
+                    mime_type TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    modified TEXT NOT NULL,
+                    PRIMARY KEY (server, parent, name)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS folders (
+                    server TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    stamp TEXT NOT NULL,
+                    PRIMARY KEY (server, path)
+                )
+                """
+            )
+            self._conn.commit()
+        except Exception as e:
+            self.logger.error(f"初始化本地搜索索引失败: {e}")
+            self._conn = None
+
+    def search(self, server, parent, terms, limit):
+        """
+        在索引中查找名称包含全部关键词的条目
+
+        Args:
+            server: 服务器标识
+            parent: 搜索范围（服务器路径）
+            terms: 小写（casefold）关键词列表
+            limit: 最多返回的条目数
+
+        Returns:
+            list: FileEntry列表，path为完整路径
+        """
+        if self._conn is None or not terms:
+            return []
+
+        sql = "SELECT parent, name, mime_type, size, modified FROM entries WHERE server = ?"
+        params = [server]
+        scope = parent.rstrip('/')
+        if scope:
+            sql += " AND (parent = ? OR substr(parent, 1, ?) = ?)"
+            params += [scope, len(scope) + 1, scope + '/']
+        for term in terms:
+            sql += " AND instr(name_key, ?) > 0"
+            params.append(term)
+        sql += " LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except Exception as e:
+            self.logger.error(f"查询本地搜索索引失败: {e}")
+            return []
+        return [self._row_to_entry(row) for row in rows]
+
+    def folder_stamp(self, server, path):
+        """文件夹上次遍历时的修改时间，未遍历过返回None"""
+        if self._conn is None:
+            return None
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT stamp FROM folders WHERE server = ? AND path = ?",
+                    (server, path)
+                ).fetchone()
+        except Exception as e:
+            self.logger.error(f"读取本地搜索索引失败: {path}: {e}")
+            return None
+        return row[0] if row else None
+
+    def children(self, server, path):
+        """文件夹在索引中的直接子项"""
+        if self._conn is None:
+            return []
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT parent, name, mime_type, size, modified FROM entries WHERE server = ? AND parent = ?",
+                    (server, path)
+                ).fetchall()
+        except Exception as e:
+            self.logger.error(f"读取本地搜索索引失败: {path}: {e}")
+            return []
+        return [self._row_to_entry(row) for row in rows]
+
+    def replace_folder(self, server, path, stamp, entries):
+        """
+        用新获取的列表替换文件夹的子项，已不存在的子文件夹连同其下的全部条目一起删除
+
+        Args:
+            server: 服务器标识
+            path: 文件夹路径
+            stamp: 文件夹的修改时间（来自上级目录的列表）
+            entries: 文件夹的直接子项
+        """
+        if self._conn is None:
+            return
+
+        base = path.rstrip('/')
+        names = {entry.name for entry in entries}
+        try:
+            with self._lock:
+                removed = [
+                    f"{base}/{name}" for (name,) in self._conn.execute(
+                        "SELECT name FROM entries WHERE server = ? AND parent = ? AND mime_type = 'inode/directory'",
+                        (server, path)
+                    )
+                    if name not in names
+                ]
+                with self._conn:
+                    for folder in removed:
+                        self._conn.execute(
+                            "DELETE FROM entries WHERE server = ? AND (parent = ? OR substr(parent, 1, ?) = ?)",
+                            (server, folder, len(folder) + 1, folder + '/')
+                        )
+                        self._conn.execute(
+                            "DELETE FROM folders WHERE server = ? AND (path = ? OR substr(path, 1, ?) = ?)",
+                            (server, folder, len(folder) + 1, folder + '/')
+                        )
+                    self._conn.execute("DELETE FROM entries WHERE server = ? AND parent = ?", (server, path))
+                    self._conn.executemany(
+                        """
+                        INSERT OR REPLACE INTO entries
+                            (server, parent, name, name_key, mime_type, size, modified)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        [(server, path, entry.name, entry.name.casefold(), entry.mime_type,
+                          entry.size, entry.modified_time) for entry in entries]
+                    )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO folders (server, path, stamp) VALUES (?, ?, ?)",
+                        (server, path, stamp or '')
+                    )
+        except Exception as e:
+            self.logger.error(f"更新本地搜索索引失败: {path}: {e}")
+
+    @staticmethod
+    def _row_to_entry(row):
+        """数据库行转换为FileEntry"""
+        parent, name, mime_type, size, modified = row
+        return FileEntry(
+            name=name,
+            size=size,
+            modified_time=modified,
+            mime_type=mime_type,
+            path=f"{parent.rstrip('/')}/{name}"
+        )
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception as e:
+                    self.logger.error(f"关闭本地搜索索引失败: {e}")
+                self._conn = None
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件列表排序键
+名称按拼音排序，拼音键（及用于查找的拼音首字母）按名称缓存并持久化，避免重复调用pypinyin；
+大小和日期使用加载时解析好的数值字段排序
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from collections import OrderedDict
+
+import pypinyin
+
+from src.core.config_manager import CACHE_DIR
+from src.core.logger import get_logger
+
+
+class PinyinKeyCache:
+    """名称到拼音排序键的LRU缓存，可保存到磁盘供下次启动使用"""
+
+    def __init__(self, cache_file=None, maxsize=50000, style=None):
+        """
+        初始化拼音键缓存
+
+        Args:
+            cache_file: 缓存文件路径，默认位于缓存目录
+            maxsize: 最多缓存的名称数
+            style: pypinyin拼音风格，None为不带声调的完整拼音
+        """
+        self.logger = get_logger()
+        self.cache_file = cache_file or os.path.join(CACHE_DIR, "pinyin_keys.json")
+        self.maxsize = maxsize
+        self.style = style
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def get_key(self, name):
+        """获取名称的拼音排序键"""
+        if name.isascii():
+            # 纯ASCII名称的拼音就是其本身，无需缓存
+            return name
+
+        with self._lock:
+            key = self._keys.get(name)
+            if key is not None:
+                self._keys.move_to_end(name)
+                return key
+
+        if self.style is None:
+            key = ''.join(pypinyin.lazy_pinyin(name))
+        else:
+            key = ''.join(pypinyin.lazy_pinyin(name, style=self.style))
+
+        with self._lock:
+            self._keys[name] = key
+            self._dirty = True
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return key
+
+    def _load(self):
+        """从磁盘加载缓存"""
+        if not os.path.exists(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 文件中按最近使用顺序保存，超出容量时保留较新的部分
+            items = list(data.items())[-self.maxsize:]
+            self._keys = OrderedDict(items)
+            self.logger.debug(f"已加载 {len(self._keys)} 个拼音排序键")
+        except Exception as e:
+            self.logger.error(f"加载拼音排序键缓存失败: {e}")
+            self._keys = OrderedDict()
+
+    def save(self):
+        """将缓存写入磁盘（仅在有新增时写入）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._keys)
+            self._dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_file = self.cache_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_file, self.cache_file)
+            self.logger.debug(f"已保存 {len(data)} 个拼音排序键")
+        except Exception as e:
+            self.logger.error(f"保存拼音排序键缓存失败: {e}")
+
+
+_pinyin_key_cache = None
+_pinyin_key_cache_lock = threading.Lock()
+
+
+def get_pinyin_key_cache():
+    """获取全局拼音键缓存实例"""
+    global _pinyin_key_cache
+    with _pinyin_key_cache_lock:
+        if _pinyin_key_cache is None:
+            _pinyin_key_cache = PinyinKeyCache()
+        return _pinyin_key_cache
+
+
+_pinyin_initials_cache = None
+_pinyin_initials_cache_lock = threading.Lock()
+
+
+def get_pinyin_initials_cache():
+    """获取全局拼音首字母缓存实例（如“周杰伦”对应“zjl”）"""
+    global _pinyin_initials_cache
+    with _pinyin_initials_cache_lock:
+        if _pinyin_initials_cache is None:
+            _pinyin_initials_cache = PinyinKeyCache(
+                os.path.join(CACHE_DIR, "pinyin_initials.json"),
+                style=pypinyin.Style.FIRST_LETTER
+            )
+        return _pinyin_initials_cache
+
+
+def name_sort_key(item):
+    """文件项的名称排序键，优先使用后台线程预先计算的结果"""
+    key = item.sort_key
+    if key is None:
+        key = get_pinyin_key_cache().get_key(item.name)
+        item.sort_key = key
+    return key
+
+
+def name_initials(item):
+    """文件项名称的拼音首字母，优先使用后台线程预先计算的结果"""
+    initials = item.initials
+    if initials is None:
+        initials = get_pinyin_initials_cache().get_key(item.name)
+        item.initials = initials
+    return initials
+
+
+# 匹配超过微秒精度的小数秒（部分存储返回纳秒精度时间）
+_FRACTION_PATTERN = re.compile(r'(\.\d{6})\d+')
+
+
+def parse_timestamp(date_str):
+    """
+    将API返回的修改时间解析为Unix时间戳
+
+    Args:
+        date_str: ISO格式时间字符串，如 2025-10-15T10:30:00Z
+
+    Returns:
+        时间戳（秒），无法解析时返回0.0
+    """
+    if not date_str:
+        return 0.0
+
+    try:
+        text = date_str[:-1] + '+00:00' if date_str.endswith('Z') else date_str
+        if '.' in text:
+            text = _FRACTION_PATTERN.sub(r'\1', text)
+        return datetime.fromisoformat(text).timestamp()
+    except (ValueError, TypeError, OverflowError, OSError):
+        return 0.0
+
+
+def size_sort_key(item):
+    """文件项的大小排序键，文件夹排在最前"""
+    if item.is_dir:
+        return -1
+    return item.size
+
+
+def date_sort_key(item):
+    """文件项的修改时间排序键"""
+    return item.timestamp
@@ -28,6 +28,7 @@ class AudioPlayer:
         self.on_stop_callback = None
         self.on_time_update_callback = None
         self.on_error_callback = None
+        self.on_track_changed_callback = None
 
         # 初始化播放器
         self._initialize()
@@ -42,6 +43,7 @@ class AudioPlayer:
             self.player_core.add_event_callback('on_state_changed', self._on_state_changed)
             self.player_core.add_event_callback('on_time_changed', self._on_time_changed)
             self.player_core.add_event_callback('on_error', self._on_error)
+            self.player_core.add_event_callback('on_media_changed', self._on_media_changed)
 
             self.logger.info("音频播放器初始化成功")
 
@@ -51,12 +53,13 @@ class AudioPlayer:
             if self.on_error_callback:
                 self.on_error_callback(f"播放器初始化失败: {e}")
 
-    def load_and_play(self, file_path: str) -> bool:
+    def load_and_play(self, file_path: str, position_key=None) -> bool:
         """
         加载并播放音频文件
 
         Args:
             file_path: 音频文件路径（本地路径或网络URL）
+            position_key: 记录播放位置用的 (服务器, 路径)，默认由file_path推导
 
         Returns:
             bool: 是否成功
@@ -75,7 +78,7 @@ class AudioPlayer:
                 self.logger.error(f"音频文件不存在: {file_path}")
                 return False
 
-        if not MediaFileDetector.is_audio_file(file_path):
+        if not MediaFileDetector.is_playable_audio(file_path):
             self.logger.error(f"不支持的音频格式: {file_path}")
             return False
 
@@ -85,7 +88,7 @@ class AudioPlayer:
                 self.player_core.stop()
 
             # 加载新文件
-            if self.player_core.load_media(file_path):
+            if self.player_core.load_media(file_path, position_key=position_key):
                 self.current_file = file_path
                 # 开始播放
                 return self.play()
@@ -284,6 +287,29 @@ class AudioPlayer:
             return os.path.basename(self.current_file)
         return ""
 
+    def queue_next(self, file_path: str, position_key=None) -> bool:
+        """
+        预加载下一首音频：在备用播放器上提前打开，当前曲目结束时直接切换过去
+
+        Args:
+            file_path: 下一首音频的路径或URL
+            position_key: 记录播放位置用的 (服务器, 路径)，默认由file_path推导
+
+        Returns:
+            bool: 是否预加载成功
+        """
+        if not self.is_initialized:
+            return False
+        if not MediaFileDetector.is_playable_audio(file_path):
+            self.logger.debug(f"下一首不是支持的音频格式，跳过预加载: {file_path}")
+            return False
+        return self.player_core.queue_next_media(file_path, position_key=position_key)
+
+    def clear_next(self):
+        """取消预加载的下一首"""
+        if self.is_initialized:
+            self.player_core.clear_next_media()
+
     def get_media_info(self):
         """获取媒体信息"""
         if not self.is_initialized:
@@ -310,6 +336,10 @@ class AudioPlayer:
         """设置错误回调"""
         self.on_error_callback = callback
 
+    def set_track_changed_callback(self, callback: Callable):
+        """设置自动切换到下一首时的回调（参数为新的文件路径）"""
+        self.on_track_changed_callback = callback
+
     def _on_state_changed(self, state):
         """状态变化事件处理"""
         state_str = str(state)
@@ -330,6 +360,12 @@ class AudioPlayer:
         if self.on_time_update_callback:
             self.on_time_update_callback(time_ms)
 
+    def _on_media_changed(self, file_path):
+        """自动切换到预加载曲目事件处理"""
+        self.current_file = file_path
+        if self.on_track_changed_callback:
+            self.on_track_changed_callback(file_path)
+
     def _on_error(self, error_msg):
         """错误事件处理"""
         self.logger.error(f"音频播放器错误: {error_msg}")
@@ -113,6 +113,18 @@ class MediaFileDetector:
         ext = os.path.splitext(clean_name)[1].lower()
         return ext in cls.SUPPORTED_AUDIO
 
+    @classmethod
+    def is_audio_stream(cls, url: str) -> bool:
+        """检测是否为没有扩展名的网络音频流（如电台地址），由VLC自行识别格式"""
+        if not url or not url.startswith(('http://', 'https://')):
+            return False
+        return not os.path.splitext(cls._clean_filename(url))[1]
+
+    @classmethod
+    def is_playable_audio(cls, filename: str) -> bool:
+        """检测音频播放器能否播放：音频文件或网络音频流"""
+        return cls.is_audio_file(filename) or cls.is_audio_stream(filename)
+
     @classmethod
     def is_video_file(cls, filename: str) -> bool:
         """检测是否为视频文件"""
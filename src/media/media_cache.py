@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地音频缓存
+把播放过或预取的远程音频保存到缓存目录，再次播放时直接使用本地文件。
+按 (服务器, 路径, 大小, 修改时间) 生成缓存文件名，远程文件变化后自动失效；
+超过容量上限时按最近使用时间（文件mtime）淘汰。
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from src.api.download_manager import DownloadTask
+from src.core.config_manager import CACHE_DIR
+from src.core.logger import get_logger
+
+
+class MediaCache:
+    """带容量上限的磁盘LRU媒体缓存，线程安全"""
+
+    DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+    # 单个文件最多占用缓存容量的比例，过大的文件不缓存
+    MAX_FILE_RATIO = 0.25
+
+    # 缓存文件名中保留的原文件名长度
+    NAME_LENGTH = 60
+
+    # 未完成的下载超过此时间（秒）未续传则删除
+    PARTIAL_MAX_AGE = 7 * 24 * 3600
+
+    _UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        初始化媒体缓存
+
+        Args:
+            cache_dir: 缓存目录，默认位于配置缓存目录下的media
+            max_bytes: 缓存总容量（字节）
+        """
+        self.logger = get_logger()
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, "media")
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # 文件名 -> 大小，按最近使用排序
+        self._total_bytes = 0
+        self._pending = {}              # 文件名 -> (下载管理器, 任务ID)
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._scan()
+        except OSError as e:
+            self.logger.error(f"初始化媒体缓存失败: {e}")
+
+    def _scan(self):
+        """扫描缓存目录，按mtime恢复LRU顺序"""
+        files = []
+        now = time.time()
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if entry.name.endswith(('.part', '.part.json')):
+                    if now - stat.st_mtime > self.PARTIAL_MAX_AGE:
+                        os.remove(entry.path)
+                    continue
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total_bytes += size
+
+        self.logger.debug(f"媒体缓存: {len(self._entries)} 个文件, {self._total_bytes} 字节")
+
+    def make_name(self, server, path, size, modified):
+        """生成缓存文件名（哈希前缀 + 原文件名，保留扩展名供播放器识别格式）"""
+        key = f"{server}\n{path}\n{size}\n{modified}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+        base = self._UNSAFE_CHARS.sub('_', os.path.basename(path.rstrip('/')))
+        stem, ext = os.path.splitext(base)
+        return f"{digest}_{stem[:self.NAME_LENGTH]}{ext[:16]}"
+
+    def should_cache(self, size):
+        """文件大小是否适合缓存"""
+        return bool(size) and size <= self.max_bytes * self.MAX_FILE_RATIO
+
+    def lookup(self, server, path, size, modified):
+        """
+        查找已完整缓存的文件
+
+        Returns:
+            str: 本地文件路径，未缓存或尚未下载完成时返回None
+        """
+        name = self.make_name(server, path, size, modified)
+        self._collect_finished()
+
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+
+        local_path = os.path.join(self.cache_dir, name)
+        try:
+            os.utime(local_path)
+        except OSError:
+            # 文件已被外部删除
+            with self._lock:
+                self._total_bytes -= self._entries.pop(name, 0)
+            return None
+        return local_path
+
+    def fill(self, download_manager, url, server, path, size, modified):
+        """
+        在后台把远程文件下载到缓存（已缓存、正在下载或文件过大时忽略）
+
+        Args:
+            download_manager: 用于下载的DownloadManager
+            url: 文件下载地址
+            server, path, size, modified: 缓存键
+
+        Returns:
+            bool: 是否新建了下载任务
+        """
+        if not self.should_cache(size):
+            return False
+
+        name = self.make_name(server, path, size, modified)
+        self._collect_finished()
+        with self._lock:
+            if name in self._entries or name in self._pending:
+                return False
+            # 先占位，避免并发调用重复下载
+            self._pending[name] = (download_manager, None)
+
+        try:
+            task_id = download_manager.add(url, os.path.join(self.cache_dir, name),
+                                           name=os.path.basename(path), size=size)
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(name, None)
+            self.logger.error(f"添加媒体缓存下载失败: {e}")
+            return False
+
+        with self._lock:
+            self._pending[name] = (download_manager, task_id)
+        return True
+
+    def _collect_finished(self):
+        """登记已下载完成的缓存文件并按容量淘汰"""
+        with self._lock:
+            pending = list(self._pending.items())
+
+        finished = []
+        for name, (manager, task_id) in pending:
+            if task_id is None:
+                continue
+            progress = manager.get_progress(task_id)
+            if progress is None or progress['status'] in (DownloadTask.COMPLETED, DownloadTask.FAILED, DownloadTask.CANCELLED):
+                finished.append(name)
+
+        if not finished:
+            return
+
+        with self._lock:
+            for name in finished:
+                self._pending.pop(name, None)
+                local_path = os.path.join(self.cache_dir, name)
+                if name in self._entries or not os.path.isfile(local_path):
+                    continue
+                size = os.path.getsize(local_path)
+                self._entries[name] = size
+                self._total_bytes += size
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """淘汰最久未使用的文件直到不超过容量（调用方持有锁）"""
+        for name in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # 正在播放的文件在Windows上无法删除，留到下次
+                self.logger.debug(f"暂时无法删除缓存文件 {name}: {e}")
+                continue
+            self._total_bytes -= self._entries.pop(name)
+            self.logger.debug(f"媒体缓存淘汰: {name}")
+
+    def clear(self):
+        """删除全部已完成的缓存文件"""
+        with self._lock:
+            names = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for name in names:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        self._collect_finished()
+        with self._lock:
+            return {
+                'files': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'pending': len(self._pending),
+            }
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件列表媒体索引
+目录列表加载（或重新排序）时一次性记录每个条目的媒体类型及各类媒体在列表中的位置，
+上一首/下一首、第一首等查找只需字典和列表下标访问，不再逐项扫描整个列表
+"""
+
+import threading
+from typing import List, Optional
+
+from .file_detector import MediaFileDetector
+
+
+class MediaIndex:
+    """文件列表的媒体类型索引（按文件名定位，文件名在同一目录中唯一）"""
+
+    MEDIA_TYPES = ('audio', 'video', 'playlist')
+
+    def __init__(self):
+        """初始化空索引"""
+        # 文件名 -> 媒体类型（非媒体为None），重新排序时复用，不重复解析扩展名
+        self._types = {}
+        # (类型 -> 列表位置升序列表, 文件名 -> 列表位置, 文件名 -> 在同类型位置列表中的序号)
+        # 重建、重新排序时整体替换；追加分页时在原数据上只增加条目，已有条目的位置不变，
+        # 后台线程读取时不会看到位置错乱的数据（_locate 会校验刚追加一半的条目）
+        self._state = ({media_type: [] for media_type in self.MEDIA_TYPES}, {}, {})
+        # 修改索引的操作互斥执行
+        self._lock = threading.Lock()
+        # 每次重建、重新排序或追加条目后加一，调用方据此判断列表是否变化
+        self.version = 0
+
+    def rebuild(self, files):
+        """为新的目录列表重建索引"""
+        with self._lock:
+            self._types = {}
+            self._replace(files)
+
+    def reindex(self, files):
+        """列表顺序变化（排序、反转）后重建位置，媒体类型沿用已解析的结果"""
+        with self._lock:
+            self._replace(files)
+
+    def extend(self, files, start):
+        """
+        列表末尾追加了条目（流式加载的后续分页）
+
+        Args:
+            files: 追加的条目
+            start: 第一个追加条目在列表中的位置
+        """
+        with self._lock:
+            self._append(files, start, *self._state)
+            self.version += 1
+
+    def _replace(self, files):
+        """为整个列表建立新的索引状态，完成后整体替换"""
+        state = ({media_type: [] for media_type in self.MEDIA_TYPES}, {}, {})
+        self._append(files, 0, *state)
+        self._state = state
+        self.version += 1
+
+    def _append(self, files, start, positions, index_by_name, rank):
+        """在给定的索引数据中登记从start开始的条目"""
+        for offset, entry in enumerate(files):
+            position = start + offset
+            index_by_name[entry.name] = position
+            media_type = self.media_type(entry)
+            if media_type:
+                rank[entry.name] = len(positions[media_type])
+                positions[media_type].append(position)
+
+    def snapshot(self) -> 'MediaIndex':
+        """
+        当前列表的索引副本（共享已建立的索引数据，不重新解析条目）
+
+        之后重建或重新排序不影响副本；追加的分页也会出现在副本中，位置超出副本对应列表的条目由调用方忽略
+        """
+        copy = MediaIndex()
+        copy._types = self._types
+        copy._state = self._state
+        copy.version = self.version
+        return copy
+
+    def media_type(self, entry) -> Optional[str]:
+        """条目的媒体类型（audio、video、playlist），文件夹和非媒体文件返回None"""
+        media_type = self._types.get(entry.name, False)
+        if media_type is False:
+            media_type = None if entry.is_dir else MediaFileDetector.get_media_type(entry.name)
+            self._types[entry.name] = media_type
+        return media_type
+
+    def index_of(self, name) -> int:
+        """文件在列表中的位置，不存在时返回-1"""
+        return self._state[1].get(name, -1)
+
+    def positions(self, media_type='audio') -> List[int]:
+        """指定类型的全部条目位置（升序，调用方不要修改）"""
+        return self._state[0][media_type]
+
+    def count(self, media_type='audio') -> int:
+        """指定类型的条目数"""
+        return len(self._state[0][media_type])
+
+    def first(self, media_type='audio') -> Optional[int]:
+        """第一个指定类型条目的位置"""
+        items = self._state[0][media_type]
+        return items[0] if items else None
+
+    def neighbor(self, name, step, media_type='audio', wrap=True) -> Optional[int]:
+        """
+        相对指定文件的上一个/下一个同类型条目
+
+        Args:
+            name: 当前文件名
+            step: 1为下一个，-1为上一个
+            media_type: 媒体类型
+            wrap: 到达两端时是否循环
+
+        Returns:
+            int: 目标条目的列表位置；当前文件不在索引中或不循环且已到两端时返回None
+        """
+        items, current = self._locate(name, media_type)
+        if current is None:
+            return None
+
+        target = current + step
+        if 0 <= target < len(items):
+            return items[target]
+        if wrap:
+            return items[target % len(items)]
+        return None
+
+    def upcoming(self, name, count, media_type='audio') -> List[int]:
+        """指定文件之后的最多count个同类型条目位置（不循环）"""
+        items, current = self._locate(name, media_type)
+        if current is None:
+            return []
+        return items[current + 1:current + 1 + count]
+
+    def _locate(self, name, media_type):
+        """
+        查找文件在同类型位置列表中的序号
+
+        Returns:
+            tuple: (同类型位置列表, 序号)，文件不存在或不是该类型时序号为None
+        """
+        positions, index_by_name, rank = self._state
+        items = positions[media_type]
+        current = rank.get(name)
+        if current is None or current >= len(items) or items[current] != index_by_name.get(name):
+            return items, None
+        return items, current
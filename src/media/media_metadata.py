@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+媒体元数据探测
+用libvlc在后台解析文件列表中可见的音视频文件，获取时长、码率、标题和艺术家，
+结果按 (服务器, 路径, 大小, 修改时间) 保存在SQLite中，远程文件变化后自动重新探测
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.config_manager import CACHE_DIR
+from src.core.logger import get_logger
+from .media_player_core import MediaPlayerCore
+from .vlc_runtime import get_vlc_runtime
+
+
+class MediaMetadataCache:
+    """基于SQLite的媒体元数据缓存，线程安全"""
+
+    # 每写入多少次检查一次容量
+    PRUNE_INTERVAL = 200
+
+    def __init__(self, db_path=None, max_entries=200000):
+        """
+        初始化元数据缓存
+
+        Args:
+            db_path: 数据库文件路径，默认位于缓存目录
+            max_entries: 最多保留的条目数，超出后按更新时间淘汰
+        """
+        self.logger = get_logger()
+        self.db_path = db_path or os.path.join(CACHE_DIR, "media_metadata.db")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._conn = None
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS media_metadata (
+                    server TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    modified TEXT NOT NULL,
+                    duration_ms INTEGER NOT NULL,
+                    bitrate INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    artist TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (server, path, size, modified)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_media_metadata_updated ON media_metadata (updated_at)"
+            )
+            self._conn.commit()
+        except Exception as e:
+            self.logger.error(f"初始化媒体元数据缓存失败: {e}")
+            self._conn = None
+
+    def get_many(self, server, keys):
+        """
+        批量读取元数据
+
+        Args:
+            server: 服务器标识
+            keys: (路径, 大小, 修改时间) 列表
+
+        Returns:
+            dict: (路径, 大小, 修改时间) -> 元数据字典，只包含命中的条目
+        """
+        if self._conn is None or not keys:
+            return {}
+
+        result = {}
+        try:
+            with self._lock:
+                for key in keys:
+                    row = self._conn.execute(
+                        """
+                        SELECT duration_ms, bitrate, title, artist FROM media_metadata
+                        WHERE server = ? AND path = ? AND size = ? AND modified = ?
+                        """,
+                        (server, *key)
+                    ).fetchone()
+                    if row is not None:
+                        result[key] = {
+                            'duration': row[0],
+                            'bitrate': row[1],
+                            'title': row[2],
+                            'artist': row[3],
+                        }
+        except Exception as e:
+            self.logger.error(f"读取媒体元数据缓存失败: {e}")
+        return result
+
+    def put(self, server, key, info):
+        """写入一个文件的元数据"""
+        if self._conn is None:
+            return
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO media_metadata
+                        (server, path, size, modified, duration_ms, bitrate, title, artist, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (server, *key, info.get('duration', 0), info.get('bitrate', 0),
+                     info.get('title', ''), info.get('artist', ''), time.time())
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self.PRUNE_INTERVAL:
+                    self._writes_since_prune = 0
+                    self._prune_locked()
+                self._conn.commit()
+        except Exception as e:
+            self.logger.error(f"写入媒体元数据缓存失败: {key[0]}: {e}")
+
+    def _prune_locked(self):
+        """按更新时间淘汰超出容量的条目（调用方需持有锁）"""
+        count = self._conn.execute("SELECT COUNT(*) FROM media_metadata").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                """
+                DELETE FROM media_metadata WHERE rowid IN (
+                    SELECT rowid FROM media_metadata ORDER BY updated_at LIMIT ?
+                )
+                """,
+                (excess,)
+            )
+            self.logger.debug(f"媒体元数据缓存已淘汰 {excess} 个条目")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception as e:
+                    self.logger.error(f"关闭媒体元数据缓存失败: {e}")
+                self._conn = None
+
+
+class MediaMetadataProber:
+    """后台媒体元数据探测器：有限并发，同一文件只探测一次"""
+
+    # 单个文件的解析超时（毫秒）
+    PARSE_TIMEOUT_MS = 8000
+
+    # 等待VLC预加载完成的最长时间（秒）
+    VLC_WAIT_TIMEOUT = 30
+
+    def __init__(self, server_key, url_builder, on_probed=None, cache=None, max_workers=2):
+        """
+        初始化探测器
+
+        Args:
+            server_key: 服务器标识，用作缓存键的一部分
+            url_builder: url_builder(entry, path) 返回文件的播放地址，在后台线程中调用
+            on_probed: 探测完成回调 on_probed(entry)，在后台线程中调用
+            cache: 持久化缓存，默认使用缓存目录下的media_metadata.db
+            max_workers: 最大并发探测数
+        """
+        self.logger = get_logger()
+        self.server_key = server_key
+        self.url_builder = url_builder
+        self.on_probed = on_probed
+        self.cache = cache or MediaMetadataCache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="MediaProbe")
+        self._results = {}   # (路径, 大小, 修改时间) -> 元数据字典，探测失败为空字典
+        self._pending = {}   # (路径, 大小, 修改时间) -> Future
+        # 取消Future时完成回调会在当前线程中同步执行，需要可重入锁
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def probe(self, items):
+        """
+        探测一组文件，取消已不在其中的排队请求
+
+        已知结果（内存或磁盘缓存）立即写入条目的media_info，其余提交到线程池。
+
+        Args:
+            items: 按优先级排列的 (服务器路径, FileEntry) 列表
+        """
+        wanted = {}
+        for path, entry in items:
+            wanted.setdefault((path, entry.size, entry.modified_time), entry)
+
+        with self._lock:
+            if self._closed:
+                return
+            unknown = []
+            for key, entry in wanted.items():
+                info = self._results.get(key)
+                if info is not None:
+                    entry.media_info = info
+                elif key not in self._pending:
+                    unknown.append(key)
+
+        cached = self.cache.get_many(self.server_key, unknown)
+
+        with self._lock:
+            if self._closed:
+                return
+
+            # 滚动离开可见范围的文件不再需要，取消仍在排队的请求
+            for key, future in list(self._pending.items()):
+                if key not in wanted and future.cancel():
+                    self._pending.pop(key, None)
+
+            for key in unknown:
+                entry = wanted[key]
+                if key in cached:
+                    self._results[key] = entry.media_info = cached[key]
+                    continue
+                if key in self._pending:
+                    continue
+                future = self._executor.submit(self._probe, key, entry)
+                self._pending[key] = future
+                future.add_done_callback(lambda f, k=key, e=entry: self._on_done(k, e, f))
+
+    def _probe(self, key, entry):
+        """后台线程：解析单个文件"""
+        url = self.url_builder(entry, key[0])
+        info = self._parse(url, entry.size)
+        if info:
+            self.cache.put(self.server_key, key, info)
+        return info
+
+    def _parse(self, url, size):
+        """用libvlc解析媒体，返回元数据字典，失败返回None"""
+        runtime = get_vlc_runtime(timeout=self.VLC_WAIT_TIMEOUT)
+        vlc_lib = runtime.vlc_lib
+        media = runtime.vlc_instance.media_new(url)
+        parsed = threading.Event()
+        event_manager = media.event_manager()
+        try:
+            event_manager.event_attach(vlc_lib.EventType.MediaParsedChanged, lambda event: parsed.set())
+            if media.parse_with_options(vlc_lib.MediaParseFlag.network, self.PARSE_TIMEOUT_MS) == -1:
+                return None
+            parsed.wait(self.PARSE_TIMEOUT_MS / 1000 + 1)
+            if media.get_parsed_status() != vlc_lib.MediaParsedStatus.done:
+                return None
+
+            duration = max(0, media.get_duration() or 0)
+            bitrate = 0
+            for track in media.tracks_get() or ():
+                if track.type in (vlc_lib.TrackType.audio, vlc_lib.TrackType.video):
+                    bitrate += track.bitrate or 0
+            if not bitrate and duration and size:
+                # 可变码率文件的轨道码率通常为0，按文件大小估算
+                bitrate = int(size * 8 * 1000 / duration)
+
+            return {
+                'duration': duration,
+                'bitrate': bitrate,
+                'title': MediaPlayerCore._decode_c_string(media.get_meta(vlc_lib.Meta.Title)),
+                'artist': MediaPlayerCore._decode_c_string(media.get_meta(vlc_lib.Meta.Artist)),
+            }
+        finally:
+            try:
+                event_manager.event_detach(vlc_lib.EventType.MediaParsedChanged)
+            except Exception:
+                pass
+            media.release()
+
+    def _on_done(self, key, entry, future):
+        """探测完成，记录结果并通知界面"""
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if future.cancelled() or self._closed:
+                return
+
+        try:
+            info = future.result()
+        except Exception as e:
+            self.logger.debug(f"探测媒体元数据失败: {key[0]}: {e}")
+            info = None
+
+        # 失败的文件本次运行不再重试，记为空字典
+        with self._lock:
+            self._results[key] = entry.media_info = info or {}
+
+        if self.on_probed:
+            try:
+                self.on_probed(entry)
+            except Exception as e:
+                self.logger.error(f"媒体元数据回调失败: {e}")
+
+    def close(self):
+        """停止探测并关闭缓存"""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
@@ -9,11 +9,13 @@ import os
 import time
 import platform
 import threading
+import urllib.parse
 from typing import Optional, Callable
 
 import vlc
 from src.core.logger import get_logger
-from .vlc_loader import VLCLoader
+from .vlc_runtime import get_vlc_runtime
+from .playback_positions import get_playback_position_store
 
 
 class MediaPlayerState:
@@ -46,15 +48,44 @@ class MediaInfo:
 class MediaPlayerCore:
     """媒体播放器核心类"""
 
+    # 异步解析媒体信息的超时时间（毫秒）
+    MEDIA_PARSE_TIMEOUT_MS = 5000
+
+    # 备用播放器打开下一首并进入暂停的最长等待时间（秒）
+    STANDBY_OPEN_TIMEOUT = 15.0
+
+    # 播放中保存播放位置的最小间隔（秒）
+    POSITION_SAVE_INTERVAL = 1.0
+
     def __init__(self):
         """初始化媒体播放器"""
         self.logger = get_logger()
+        self.vlc_runtime = None
         self.vlc_loader = None
         self.vlc_instance = None
         self.vlc_player = None
         self.vlc_media = None
         self.vlc_media_list = None
         self.vlc_media_list_player = None
+        self._player_event_manager = None
+        self._attached_event_types = []
+        self._media_event_manager = None
+
+        # 预加载的下一首媒体 (file_path, vlc.Media, position_key)，当前媒体播放结束时切换
+        self._next_media = None
+        self._next_media_lock = threading.Lock()
+        self._advancing = False
+
+        # 备用播放器：从播放器池再租借一个，提前打开下一首并停在开头（暂停），
+        # 当前媒体结束时取消暂停并换为主播放器；_standby_ready表示已打开完成
+        self._standby_player = None
+        self._standby_ready = False
+        self._standby_generation = 0
+
+        # 播放位置记录：当前媒体的 (服务器, 路径) 键
+        self.position_store = None
+        self._position_key = None
+        self._last_position_save = 0.0
 
         # 播放状态
         self.state = MediaPlayerState.STOPPED
@@ -84,6 +115,8 @@ class MediaPlayerCore:
         # 事件回调
         self.event_callbacks = {
             'on_media_loaded': [],
+            'on_media_parsed': [],
+            'on_media_changed': [],
             'on_state_changed': [],
             'on_time_changed': [],
             'on_volume_changed': [],
@@ -97,12 +130,16 @@ class MediaPlayerCore:
     def _initialize_player(self):
         """初始化播放器"""
         try:
-            # 加载VLC
-            self.vlc_loader = VLCLoader()
-            self.vlc_instance = self.vlc_loader.get_vlc_instance()
+            # 使用进程内共享的VLC运行时，只在首次使用时加载libvlc
+            self.vlc_runtime = get_vlc_runtime()
+            self.vlc_loader = self.vlc_runtime.vlc_loader
+            self.vlc_instance = self.vlc_runtime.vlc_instance
+
+            # 从播放器池租借播放器
+            self.vlc_player = self.vlc_runtime.lease_player()
 
-            # 创建播放器
-            self.vlc_player = self.vlc_instance.media_player_new()
+            # 播放位置存储（长媒体停止后再次播放时从上次位置继续）
+            self.position_store = get_playback_position_store()
 
             # 创建媒体列表播放器（用于播放列表）
             self.vlc_media_list = self.vlc_instance.media_list_new()
@@ -126,23 +163,25 @@ class MediaPlayerCore:
         """Set up VLC event listeners."""
         try:
             event_manager = self.vlc_player.event_manager()
+            self._player_event_manager = event_manager
+            self._attached_event_types = []
             vlc_lib = self.vlc_loader.get_vlc_lib()
 
             # Media end event
-            event_manager.event_attach(
+            self._attach_player_event(
                 vlc_lib.EventType.MediaPlayerEndReached,
                 self._on_media_ended
             )
 
             # Playback time changed
-            event_manager.event_attach(
+            self._attach_player_event(
                 vlc_lib.EventType.MediaPlayerTimeChanged,
                 self._on_time_changed
             )
 
             # Player state changed (not available on some builds)
             try:
-                event_manager.event_attach(
+                self._attach_player_event(
                     vlc_lib.EventType.MediaPlayerStateChanged,
                     self._on_state_changed
                 )
@@ -151,33 +190,81 @@ class MediaPlayerCore:
 
             # Player started playing – used to reapply audio device
             try:
-                event_manager.event_attach(
+                self._attach_player_event(
                     vlc_lib.EventType.MediaPlayerPlaying,
                     self._on_media_playing
                 )
             except AttributeError:
                 self.logger.debug("MediaPlayerPlaying event unavailable; audio device reapply relies on manual calls")
 
-            # Media parsed event
-            try:
-                event_manager.event_attach(
-                    vlc_lib.EventType.MediaParsedChanged,
-                    self._on_media_parsed
-                )
-            except AttributeError:
-                self.logger.warning("MediaParsedChanged event unavailable; metadata updates may be limited")
+            # MediaParsedChanged is a media event; it is attached per media in _parse_media_async
 
         except Exception as e:
             self.logger.error(f"Failed to set up VLC event manager: {e}")
             # allow playback to continue even if hooks fail
 
+    def _attach_player_event(self, event_type, callback):
+        """Attach a player event and remember it so it can be detached before the player is pooled."""
+        self._player_event_manager.event_attach(event_type, callback)
+        self._attached_event_types.append(event_type)
+
+    def _detach_player_events(self):
+        """Detach every player event attached by this core."""
+        event_manager = self._player_event_manager
+        if event_manager is not None:
+            for event_type in self._attached_event_types:
+                try:
+                    event_manager.event_detach(event_type)
+                except Exception as e:
+                    self.logger.debug(f"Failed to detach VLC event {event_type}: {e}")
+        self._player_event_manager = None
+        self._attached_event_types = []
+
 
-    def load_media(self, file_path: str) -> bool:
+    def _parse_media_async(self, media):
+        """异步解析媒体（含网络流），完成后由_on_media_parsed填充媒体信息"""
+        try:
+            vlc_lib = self.vlc_loader.get_vlc_lib()
+            event_manager = media.event_manager()
+            event_manager.event_attach(
+                vlc_lib.EventType.MediaParsedChanged,
+                self._on_media_parsed,
+                media
+            )
+            self._media_event_manager = event_manager
+
+            if media.get_parsed_status() == vlc_lib.MediaParsedStatus.done:
+                # 预加载时已经解析过，不会再触发MediaParsedChanged
+                self._on_media_parsed(None, media)
+            elif hasattr(media, 'parse_with_options'):
+                flags = vlc_lib.MediaParseFlag.local | vlc_lib.MediaParseFlag.network
+                if media.parse_with_options(flags, self.MEDIA_PARSE_TIMEOUT_MS) == -1:
+                    self.logger.warning("启动媒体异步解析失败，媒体信息将在播放后更新")
+            else:
+                # libvlc 2.x 没有parse_with_options，只能使用不带超时的异步解析
+                media.parse_async()
+
+        except Exception as e:
+            self.logger.warning(f"启动媒体异步解析失败: {e}")
+
+    def _detach_media_events(self):
+        """解除当前媒体上的解析事件监听"""
+        event_manager = self._media_event_manager
+        self._media_event_manager = None
+        if event_manager is None:
+            return
+        try:
+            event_manager.event_detach(self.vlc_loader.get_vlc_lib().EventType.MediaParsedChanged)
+        except Exception as e:
+            self.logger.debug(f"解除媒体解析事件失败: {e}")
+
+    def load_media(self, file_path: str, position_key=None) -> bool:
         """
         加载媒体文件
 
         Args:
             file_path: 媒体文件路径（本地路径或网络URL）
+            position_key: 记录播放位置用的 (服务器, 路径)，默认由file_path推导
 
         Returns:
             bool: 是否加载成功
@@ -193,17 +280,31 @@ class MediaPlayerCore:
                     self.logger.error(f"媒体文件不存在: {file_path}")
                     return False
 
+            # 切换前记录上一个媒体的播放位置（设为加载状态后不会再保存）
+            self._save_position()
+
             self.state = MediaPlayerState.LOADING
             self.logger.info(f"正在加载媒体: {file_path}")
 
-            # 创建媒体对象
+            # 手动加载新媒体时，之前预加载的下一首不再有效
+            self.clear_next_media()
+
+            # 创建媒体对象，替换掉上一个媒体
+            previous_media = self.vlc_media
+            self._detach_media_events()
             self.vlc_media = self.vlc_instance.media_new(file_path)
+            self._position_key = position_key or self._default_position_key(file_path)
+            self._apply_saved_position(self.vlc_media, self._position_key)
 
             # 设置媒体到播放器
             self.vlc_player.set_media(self.vlc_media)
+            if previous_media is not None:
+                previous_media.release()
+
+            self.current_media_info = MediaInfo()
 
-            # 解析媒体信息
-            self.vlc_media.parse()
+            # 后台解析媒体信息，不阻塞调用线程，解析结果在MediaParsedChanged回调中填充
+            self._parse_media_async(self.vlc_media)
 
             # 更新媒体信息
             self._update_media_info(file_path)
@@ -315,6 +416,8 @@ class MediaPlayerCore:
             info = self.get_current_audio_device_info()
             pending_value = self._normalize_device_id(info.get('id')) or ''
 
+            self.clear_next_media()
+            self._save_position()
             self.vlc_player.stop()
             self._audio_device_pending = True
             self._pending_audio_device_id = pending_value
@@ -328,6 +431,183 @@ class MediaPlayerCore:
             self.logger.error(f"停止播放失败: {e}")
             return False
 
+    def queue_next_media(self, file_path: str, position_key=None) -> bool:
+        """
+        预加载下一首媒体，当前媒体播放结束时直接切换
+
+        下一首在备用播放器上提前打开（建立连接、缓冲并停在开头），结束时只需取消暂停；
+        备用播放器未能及时打开时，退回在主播放器上重新加载。
+
+        Args:
+            file_path: 下一首媒体的路径或URL
+            position_key: 记录播放位置用的 (服务器, 路径)，默认由file_path推导
+
+        Returns:
+            bool: 是否预加载成功
+        """
+        try:
+            if not self.vlc_instance:
+                return False
+
+            media = self.vlc_instance.media_new(file_path)
+            position_key = position_key or self._default_position_key(file_path)
+            self._apply_saved_position(media, position_key)
+            if hasattr(media, 'parse_with_options'):
+                vlc_lib = self.vlc_loader.get_vlc_lib()
+                flags = vlc_lib.MediaParseFlag.local | vlc_lib.MediaParseFlag.network
+                media.parse_with_options(flags, self.MEDIA_PARSE_TIMEOUT_MS)
+
+            with self._next_media_lock:
+                previous = self._next_media
+                self._next_media = (file_path, media, position_key)
+                standby = self._take_standby_locked()
+                generation = self._standby_generation
+            self._release_queued(previous, standby)
+
+            threading.Thread(
+                target=self._open_standby,
+                args=(file_path, position_key, generation),
+                name="MediaStandby",
+                daemon=True
+            ).start()
+
+            self.logger.debug(f"已预加载下一首媒体: {file_path}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"预加载下一首媒体失败: {e}")
+            return False
+
+    def _open_standby(self, file_path: str, position_key, generation: int):
+        """后台线程：在备用播放器上打开下一首，打开后停在开头等待切换"""
+        runtime = self.vlc_runtime
+        if runtime is None:
+            return
+
+        player = runtime.lease_player()
+        try:
+            media = self.vlc_instance.media_new(file_path)
+            self._apply_saved_position(media, position_key)
+            # 打开、缓冲后立即暂停，不输出声音
+            media.add_option(":start-paused")
+
+            with self._next_media_lock:
+                if generation != self._standby_generation:
+                    media.release()
+                    runtime.release_player(player)
+                    return
+                self._standby_player = player
+                player.set_rate(self.playback_rate)
+                player.set_media(media)
+                player.play()
+            media.release()
+
+            vlc_lib = self.vlc_loader.get_vlc_lib()
+            deadline = time.monotonic() + self.STANDBY_OPEN_TIMEOUT
+            state = player.get_state()
+            while state not in (vlc_lib.State.Paused, vlc_lib.State.Error, vlc_lib.State.Ended):
+                if generation != self._standby_generation or time.monotonic() > deadline:
+                    return
+                time.sleep(0.05)
+                state = player.get_state()
+
+            with self._next_media_lock:
+                if generation == self._standby_generation and state == vlc_lib.State.Paused:
+                    self._standby_ready = True
+                    self.logger.debug(f"备用播放器已打开下一首: {file_path}")
+
+        except Exception as e:
+            self.logger.debug(f"备用播放器打开下一首失败: {e}")
+
+    def _take_standby_locked(self):
+        """取走备用播放器并作废正在打开的备用播放（调用方持有_next_media_lock）"""
+        standby = self._standby_player
+        self._standby_player = None
+        self._standby_ready = False
+        self._standby_generation += 1
+        return standby
+
+    def _release_queued(self, queued, standby):
+        """释放预加载的媒体和备用播放器"""
+        if queued is not None:
+            try:
+                queued[1].release()
+            except Exception as e:
+                self.logger.debug(f"释放预加载媒体失败: {e}")
+        if standby is not None and self.vlc_runtime is not None:
+            try:
+                self.vlc_runtime.release_player(standby)
+            except Exception as e:
+                self.logger.debug(f"归还备用播放器失败: {e}")
+
+    def clear_next_media(self):
+        """取消预加载的下一首媒体"""
+        with self._next_media_lock:
+            queued = self._next_media
+            self._next_media = None
+            standby = self._take_standby_locked()
+        self._release_queued(queued, standby)
+
+    def has_next_media(self) -> bool:
+        """是否已预加载下一首媒体"""
+        return self._next_media is not None
+
+    def _advance_to_next_media(self, file_path: str, media, position_key, standby=None, ready=False):
+        """切换到预加载的下一首媒体（不能在VLC事件线程中直接调用播放器接口）
+
+        Args:
+            standby: 备用播放器
+            ready: 备用播放器是否已打开下一首并暂停；未就绪时放弃它，在主播放器上重新加载
+        """
+        try:
+            if standby is not None and not ready:
+                self._release_queued(None, standby)
+                standby = None
+
+            self._position_key = position_key
+            previous_media = self.vlc_media
+            self._detach_media_events()
+
+            if standby is not None:
+                # 备用播放器换为主播放器，取消暂停即开始播放；原播放器归还到池中
+                previous_player = self.vlc_player
+                self._detach_player_events()
+                self.vlc_player = standby
+                self._setup_event_manager()
+                standby.audio_set_volume(self.volume)
+                standby.audio_set_mute(self.is_muted)
+                self._apply_audio_device(reason='standby-switch')
+                standby.set_pause(0)
+
+                media.release()
+                media = standby.get_media()
+                self.vlc_runtime.release_player(previous_player)
+            else:
+                self.vlc_player.set_media(media)
+                self.vlc_player.play()
+
+            self.vlc_media = media
+            if previous_media is not None:
+                previous_media.release()
+
+            self.current_media_info = MediaInfo()
+            self._parse_media_async(media)
+            self._update_media_info(file_path)
+
+            self.state = MediaPlayerState.PLAYING
+            if standby is not None:
+                self.logger.info(f"已切换到备用播放器上预先打开的下一首: {file_path}")
+            else:
+                self.logger.info(f"备用播放器未就绪，已重新加载下一首: {file_path}")
+            self._trigger_event('on_media_changed', file_path)
+
+        except Exception as e:
+            self.logger.error(f"切换到下一首媒体失败: {e}")
+            self.state = MediaPlayerState.ERROR
+            self._trigger_event('on_error', str(e))
+        finally:
+            self._advancing = False
+
     def is_playing(self) -> bool:
         """检查是否正在播放"""
         return self.state == MediaPlayerState.PLAYING
@@ -906,15 +1186,15 @@ class MediaPlayerCore:
         """更新媒体信息"""
         try:
             self.current_media_info.file_path = file_path
-            self.current_media_info.title = os.path.splitext(os.path.basename(file_path))[0]
+            # 异步解析可能已经先填入了元数据标题
+            if not self.current_media_info.title:
+                self.current_media_info.title = os.path.splitext(os.path.basename(file_path))[0]
 
-            # 获取媒体详细信息
+            # 获取时长（解析完成前为0，由解析回调或播放后补全）
             if self.vlc_media:
-                # 获取时长
-                self.current_media_info.duration = self.vlc_player.get_length()
-
-                # 获取媒体信息（需要等待解析完成）
-                self._extract_media_details()
+                duration = self.vlc_player.get_length()
+                if duration > 0:
+                    self.current_media_info.duration = duration
 
             # 检测媒体类型
             from .file_detector import MediaFileDetector
@@ -923,17 +1203,65 @@ class MediaPlayerCore:
         except Exception as e:
             self.logger.error(f"更新媒体信息失败: {e}")
 
-    def _extract_media_details(self):
-        """提取媒体详细信息"""
+    def _extract_media_details(self, media=None):
+        """从已解析的媒体中提取元数据、时长和音视频轨道信息"""
+        media = media or self.vlc_media
+        if media is None:
+            return
+
         try:
-            # 这里可以添加更多媒体信息提取逻辑
-            # VLC的媒体信息提取比较复杂，暂时使用基础信息
-            pass
+            vlc_lib = self.vlc_loader.get_vlc_lib()
+            info = self.current_media_info
+
+            duration = media.get_duration()
+            if duration and duration > 0:
+                info.duration = duration
+
+            for attr, meta in (('title', vlc_lib.Meta.Title),
+                               ('artist', vlc_lib.Meta.Artist),
+                               ('album', vlc_lib.Meta.Album)):
+                value = self._decode_c_string(media.get_meta(meta))
+                if value:
+                    setattr(info, attr, value)
+
+            for track in media.tracks_get() or ():
+                if track.type == vlc_lib.TrackType.audio and not info.sample_rate:
+                    audio = track.audio.contents
+                    info.sample_rate = audio.rate
+                    info.channels = audio.channels
+                    info.bitrate = info.bitrate or track.bitrate
+                elif track.type == vlc_lib.TrackType.video and not info.video_width:
+                    video = track.video.contents
+                    info.video_width = video.width
+                    info.video_height = video.height
+                    info.bitrate = info.bitrate or track.bitrate
+
         except Exception as e:
             self.logger.error(f"提取媒体详细信息失败: {e}")
 
     def _on_media_ended(self, event):
         """媒体播放结束事件"""
+        # 已播完，下次从头播放
+        if self.position_store and self._position_key:
+            self.position_store.remove(self._position_key)
+
+        with self._next_media_lock:
+            queued = self._next_media
+            self._next_media = None
+            ready = self._standby_ready
+            standby = self._take_standby_locked()
+            if queued is not None:
+                self._advancing = True
+
+        if queued is not None:
+            threading.Thread(
+                target=self._advance_to_next_media,
+                args=queued + (standby, ready),
+                name="MediaAdvance",
+                daemon=True
+            ).start()
+            return
+
         self.logger.info("媒体播放结束")
         self.state = MediaPlayerState.STOPPED
         self.current_media_info.current_time = 0
@@ -943,7 +1271,45 @@ class MediaPlayerCore:
 
     def _on_time_changed(self, event):
         """播放时间变化事件"""
-        self._trigger_event('on_time_changed', self.get_current_time())
+        current_time = self.get_current_time()
+        now = time.monotonic()
+        if now - self._last_position_save >= self.POSITION_SAVE_INTERVAL:
+            self._last_position_save = now
+            self._save_position(current_time)
+        self._trigger_event('on_time_changed', current_time)
+
+    @staticmethod
+    def _default_position_key(file_path: str):
+        """由媒体地址推导播放位置键：URL为 (主机, 路径)，本地文件为 ('', 绝对路径)"""
+        if file_path.startswith(('http://', 'https://')):
+            parsed = urllib.parse.urlsplit(file_path)
+            return parsed.netloc, urllib.parse.unquote(parsed.path)
+        return '', os.path.abspath(file_path)
+
+    def _apply_saved_position(self, media, position_key):
+        """媒体有保存的播放位置时，设置从该位置开始播放"""
+        if not self.position_store or not position_key:
+            return
+        position_ms = self.position_store.get(position_key)
+        if position_ms:
+            media.add_option(f":start-time={position_ms / 1000:.3f}")
+            self.logger.info(f"从上次位置继续播放: {position_ms // 1000} 秒")
+
+    def _save_position(self, position_ms=None):
+        """记录当前媒体的播放位置（只写内存，由存储的后台线程写盘）"""
+        if not self.position_store or not self._position_key or not self.vlc_player:
+            return
+        if self.state not in (MediaPlayerState.PLAYING, MediaPlayerState.PAUSED):
+            # 已停止的播放器位置无意义，不能覆盖停止时保存的位置
+            return
+        try:
+            if position_ms is None:
+                position_ms = self.vlc_player.get_time()
+            duration_ms = self.vlc_player.get_length()
+            if position_ms is not None and position_ms >= 0:
+                self.position_store.update(self._position_key, position_ms, duration_ms)
+        except Exception as e:
+            self.logger.debug(f"记录播放位置失败: {e}")
 
     def _on_state_changed(self, event):
         """播放器状态变化事件"""
@@ -951,6 +1317,10 @@ class MediaPlayerCore:
             vlc_state = self.vlc_player.get_state()
             vlc_lib = self.vlc_loader.get_vlc_lib()
 
+            if vlc_state == vlc_lib.State.Ended and (self._advancing or self._next_media is not None):
+                # 即将切换到预加载的下一首，不把中间的结束状态通知出去
+                return
+
             # 映射VLC状态到我们的状态
             state_map = {
                 vlc_lib.State.NothingSpecial: MediaPlayerState.STOPPED,
@@ -982,12 +1352,21 @@ class MediaPlayerCore:
                 self.logger.debug('Audio device still pending after MediaPlayerPlaying event')
 
 
-    def _on_media_parsed(self, event):
-        """媒体解析完成事件"""
+    def _on_media_parsed(self, event, media):
+        """媒体解析完成事件（在VLC事件线程中回调）"""
         try:
-            if self.vlc_media.get_parsed_status() == self.vlc_loader.get_vlc_lib().MediaParsedStatus.Done:
-                self._extract_media_details()
+            if media is not self.vlc_media:
+                # 解析完成前已切换到其他媒体
+                return
+
+            status = media.get_parsed_status()
+            vlc_lib = self.vlc_loader.get_vlc_lib()
+            if status == vlc_lib.MediaParsedStatus.done:
+                self._extract_media_details(media)
                 self.logger.debug("媒体解析完成")
+                self._trigger_event('on_media_parsed', self.current_media_info)
+            elif status in (vlc_lib.MediaParsedStatus.failed, vlc_lib.MediaParsedStatus.timeout):
+                self.logger.info(f"媒体解析未完成（{status}），使用播放中获取的信息")
         except Exception as e:
             self.logger.error(f"处理媒体解析事件失败: {e}")
 
@@ -1537,15 +1916,13 @@ class MediaPlayerCore:
         try:
             self.logger.debug("开始清理媒体播放器资源")
 
-            # 停止播放 - 添加更安全的检查
-            if self.vlc_player is not None:
-                try:
-                    self.vlc_player.stop()
-                except Exception as stop_error:
-                    self.logger.warning(f"停止播放时出错: {stop_error}")
+            # 解除事件监听，避免归还后的播放器继续回调本对象
+            self._detach_player_events()
 
-            # 按照依赖关系顺序释放VLC资源
-            # 先释放媒体和播放器相关的资源
+            # 先释放媒体资源（归还播放器时会一并停止播放）
+            self._save_position()
+            self.clear_next_media()
+            self._detach_media_events()
             if self.vlc_media is not None:
                 try:
                     self.vlc_media.release()
@@ -1555,12 +1932,17 @@ class MediaPlayerCore:
                 finally:
                     self.vlc_media = None
 
+            # 播放器归还到共享运行时的播放器池
             if self.vlc_player is not None:
                 try:
-                    self.vlc_player.release()
-                    self.logger.debug("已释放VLC播放器")
+                    if self.vlc_runtime is not None:
+                        self.vlc_runtime.release_player(self.vlc_player)
+                        self.logger.debug("已归还VLC播放器")
+                    else:
+                        self.vlc_player.stop()
+                        self.vlc_player.release()
                 except Exception as player_error:
-                    self.logger.warning(f"释放VLC播放器时出错: {player_error}")
+                    self.logger.warning(f"归还VLC播放器时出错: {player_error}")
                 finally:
                     self.vlc_player = None
 
@@ -1582,15 +1964,10 @@ class MediaPlayerCore:
                 finally:
                     self.vlc_media_list = None
 
-            # 最后清理VLC加载器
-            if self.vlc_loader is not None:
-                try:
-                    self.vlc_loader.cleanup()
-                    self.logger.debug("已清理VLC加载器")
-                except Exception as loader_error:
-                    self.logger.warning(f"清理VLC加载器时出错: {loader_error}")
-                finally:
-                    self.vlc_loader = None
+            # VLC实例由共享运行时持有，应用退出时统一释放
+            self.vlc_instance = None
+            self.vlc_loader = None
+            self.vlc_runtime = None
 
             self.logger.info("媒体播放器资源已清理完成")
 
@@ -1604,4 +1981,6 @@ class MediaPlayerCore:
             self.vlc_player = None
             self.vlc_media_list_player = None
             self.vlc_media_list = None
+            self.vlc_instance = None
             self.vlc_loader = None
+            self.vlc_runtime = None
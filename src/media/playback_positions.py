@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+播放位置存储
+记录长音视频（有声书、电影等）每个 (服务器, 路径) 上次停止的位置，再次播放时从该位置继续。
+查询走内存字典；写入先进入待写队列，由后台线程定期批量写入SQLite，播放线程不会等待磁盘。
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from src.core.config_manager import CONFIG_DIR
+from src.core.logger import get_logger
+
+
+class PlaybackPositionStore:
+    """播放位置存储，线程安全"""
+
+    # 只记录时长不少于此值（毫秒）的媒体
+    MIN_DURATION_MS = 5 * 60 * 1000
+
+    # 开头或结尾这段时间（毫秒）内停止视为未开始/已播完，不保留位置
+    EDGE_MARGIN_MS = 15 * 1000
+
+    # 后台批量写入间隔（秒）
+    FLUSH_INTERVAL = 2.0
+
+    def __init__(self, db_path=None, max_entries=50000):
+        """
+        初始化播放位置存储
+
+        Args:
+            db_path: 数据库文件路径，默认位于配置目录
+            max_entries: 最多保留的条目数，超出后按更新时间淘汰
+        """
+        self.logger = get_logger()
+        self.db_path = db_path or os.path.join(CONFIG_DIR, "playback_positions.db")
+        self.max_entries = max_entries
+        self._positions = {}     # (服务器, 路径) -> (位置毫秒, 时长毫秒, 更新时间)
+        self._pending = {}       # 待写入的变更，值为None表示删除
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._conn = None
+        self._writer = None
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS positions (
+                    server TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    position_ms INTEGER NOT NULL,
+                    duration_ms INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (server, path)
+                )
+                """
+            )
+            self._conn.commit()
+
+            for server, path, position, duration, updated_at in self._conn.execute(
+                    "SELECT server, path, position_ms, duration_ms, updated_at FROM positions"):
+                self._positions[(server, path)] = (position, duration, updated_at)
+
+            self._writer = threading.Thread(target=self._writer_loop, name="PlaybackPositionWriter", daemon=True)
+            self._writer.start()
+            self.logger.debug(f"已加载 {len(self._positions)} 条播放位置")
+
+        except sqlite3.Error as e:
+            self.logger.error(f"打开播放位置数据库失败: {e}")
+            self._conn = None
+
+    def get(self, key):
+        """
+        获取保存的播放位置
+
+        Args:
+            key: (服务器, 路径)
+
+        Returns:
+            int: 播放位置（毫秒），没有记录时返回None
+        """
+        entry = self._positions.get(key)
+        return entry[0] if entry else None
+
+    def update(self, key, position_ms, duration_ms):
+        """
+        记录播放位置（只更新内存，由后台线程写盘）
+
+        短媒体不记录；位置在开头或接近结尾时清除记录。
+        """
+        if not key or not duration_ms or duration_ms < self.MIN_DURATION_MS:
+            return
+
+        if position_ms < self.EDGE_MARGIN_MS or duration_ms - position_ms < self.EDGE_MARGIN_MS:
+            self.remove(key)
+            return
+
+        entry = (int(position_ms), int(duration_ms), time.time())
+        with self._lock:
+            self._positions[key] = entry
+            self._pending[key] = entry
+
+    def remove(self, key):
+        """清除播放位置（播完时调用）"""
+        with self._lock:
+            if self._positions.pop(key, None) is not None:
+                self._pending[key] = None
+
+    def __len__(self):
+        return len(self._positions)
+
+    def flush(self):
+        """把待写入的变更批量写入数据库"""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+
+        if not pending or self._conn is None:
+            return
+
+        upserts = [(key[0], key[1], entry[0], entry[1], entry[2])
+                   for key, entry in pending.items() if entry is not None]
+        deletes = [key for key, entry in pending.items() if entry is None]
+
+        try:
+            with self._conn:
+                if upserts:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO positions (server, path, position_ms, duration_ms, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        upserts
+                    )
+                if deletes:
+                    self._conn.executemany("DELETE FROM positions WHERE server = ? AND path = ?", deletes)
+            self._prune()
+        except sqlite3.Error as e:
+            self.logger.error(f"保存播放位置失败: {e}")
+
+    def _prune(self):
+        """条目数超过上限时删除最久未更新的记录"""
+        with self._lock:
+            excess = len(self._positions) - self.max_entries
+            if excess <= 0:
+                return
+            oldest = sorted(self._positions.items(), key=lambda item: item[1][2])[:excess]
+            for key, _ in oldest:
+                del self._positions[key]
+
+        with self._conn:
+            self._conn.executemany("DELETE FROM positions WHERE server = ? AND path = ?",
+                                   [key for key, _ in oldest])
+
+    def _writer_loop(self):
+        """后台线程：定期批量写入"""
+        while not self._closed:
+            self._wakeup.wait(self.FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        """写入剩余变更并关闭数据库"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._writer:
+            self._writer.join(timeout=5)
+        self.flush()
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+
+_position_store = None
+_position_store_lock = threading.Lock()
+
+
+def get_playback_position_store():
+    """获取全局播放位置存储实例"""
+    global _position_store
+    with _position_store_lock:
+        if _position_store is None:
+            _position_store = PlaybackPositionStore()
+        return _position_store
+
+
+def close_playback_position_store():
+    """关闭全局播放位置存储（应用退出时调用）"""
+    global _position_store
+    with _position_store_lock:
+        store = _position_store
+        _position_store = None
+    if store is not None:
+        store.close()
@@ -2,10 +2,13 @@
 # -*- coding: utf-8 -*-
 """
 播放列表管理器
-管理音频播放列表，支持上一首/下一首功能
+管理音频播放列表，支持上一首/下一首和随机播放功能。
+播放列表维护 路径 -> 索引 的映射，查重和定位都是O(1)；随机播放使用预先生成的排列，可以按排列回到上一首。
 """
 
-from typing import List, Optional, Dict, Any
+import random
+from collections import deque
+from typing import List, Optional, Dict, Any, Iterable
 from src.core.logger import get_logger
 
 
@@ -32,9 +35,20 @@ class PlaylistManager:
         self.current_index: int = -1
         self.repeat_mode: str = "none"  # none, one, all
 
+        # 文件路径 -> 播放列表索引
+        self._index_by_path: Dict[str, int] = {}
+
+        # 随机播放：播放顺序（索引排列）及 索引 -> 在排列中的位置
+        self.shuffle_enabled: bool = False
+        self._shuffle_order: List[int] = []
+        self._shuffle_position: Dict[int, int] = {}
+        # 列表循环时下一轮的排列（首次需要时生成，peek_next和next_track得到同一首）
+        self._next_round: List[int] = []
+        self._random = random.Random()
+
         # 播放历史
-        self.played_history: List[int] = []
         self.max_history_size: int = 100
+        self.played_history = deque(maxlen=self.max_history_size)
 
         # 回调函数
         self.on_playlist_changed = None
@@ -57,14 +71,13 @@ class PlaylistManager:
                 return False
 
             # 检查是否已存在
-            for item in self.playlist:
-                if item.file_path == file_path:
-                    self.logger.debug(f"项目已存在于播放列表: {file_path}")
-                    return True
+            if file_path in self._index_by_path:
+                self.logger.debug(f"项目已存在于播放列表: {file_path}")
+                return True
 
             # 创建新的播放项
             item = PlaylistItem(file_path, display_name, metadata)
-            self.playlist.append(item)
+            self._append_items([item])
 
             self.logger.info(f"添加到播放列表: {item.display_name}")
             self._trigger_playlist_changed()
@@ -74,6 +87,73 @@ class PlaylistManager:
             self.logger.error(f"添加播放列表项失败: {e}")
             return False
 
+    def add_items(self, items: Iterable) -> int:
+        """
+        批量添加项目到播放列表，只触发一次播放列表变化事件
+
+        Args:
+            items: 可迭代对象，元素为文件路径、PlaylistItem或 (文件路径, 显示名称[, 元数据]) 元组
+
+        Returns:
+            int: 新添加的项目数量（已存在的项目不重复添加）
+        """
+        try:
+            new_items = []
+            seen = set()
+            for entry in items:
+                if isinstance(entry, PlaylistItem):
+                    item = entry
+                elif isinstance(entry, str):
+                    item = PlaylistItem(entry) if entry else None
+                else:
+                    item = PlaylistItem(*entry) if entry and entry[0] else None
+
+                if item is None or item.file_path in self._index_by_path or item.file_path in seen:
+                    continue
+                seen.add(item.file_path)
+                new_items.append(item)
+
+            if not new_items:
+                return 0
+
+            self._append_items(new_items)
+            self.logger.info(f"批量添加到播放列表: {len(new_items)} 项")
+            self._trigger_playlist_changed()
+            return len(new_items)
+
+        except Exception as e:
+            self.logger.error(f"批量添加播放列表项失败: {e}")
+            return 0
+
+    def _append_items(self, items: List[PlaylistItem]):
+        """追加项目并更新索引映射和随机顺序"""
+        start = len(self.playlist)
+        self.playlist.extend(items)
+        for offset, item in enumerate(items):
+            self._index_by_path[item.file_path] = start + offset
+
+        if self.shuffle_enabled:
+            # 新项目与尚未播放的部分一起重新打乱，已播放的部分保持不变
+            position = self._shuffle_position.get(self.current_index, -1)
+            upcoming = self._shuffle_order[position + 1:]
+            upcoming.extend(range(start, len(self.playlist)))
+            self._random.shuffle(upcoming)
+            self._shuffle_order[position + 1:] = upcoming
+            self._reindex_shuffle(position + 1)
+
+    def index_of(self, file_path: str) -> int:
+        """
+        获取文件在播放列表中的索引
+
+        Returns:
+            int: 索引，不在播放列表中时返回-1
+        """
+        return self._index_by_path.get(file_path, -1)
+
+    def contains(self, file_path: str) -> bool:
+        """文件是否在播放列表中"""
+        return file_path in self._index_by_path
+
     def remove_item(self, index: int) -> bool:
         """
         从播放列表中移除项目
@@ -89,6 +169,20 @@ class PlaylistManager:
                 removed_item = self.playlist.pop(index)
                 self.logger.info(f"从播放列表移除: {removed_item.display_name}")
 
+                # 后面项目的索引前移
+                del self._index_by_path[removed_item.file_path]
+                for i in range(index, len(self.playlist)):
+                    self._index_by_path[self.playlist[i].file_path] = i
+
+                if self.shuffle_enabled:
+                    self._shuffle_order = [i - 1 if i > index else i for i in self._shuffle_order if i != index]
+                    self._reindex_shuffle()
+
+                self.played_history = deque(
+                    (i - 1 if i > index else i for i in self.played_history if i != index),
+                    maxlen=self.max_history_size
+                )
+
                 # 调整当前索引
                 if self.current_index == index:
                     self.current_index = -1
@@ -107,6 +201,10 @@ class PlaylistManager:
         """清空播放列表"""
         try:
             self.playlist.clear()
+            self._index_by_path.clear()
+            self._shuffle_order = []
+            self._shuffle_position = {}
+            self._next_round = []
             self.current_index = -1
             self.played_history.clear()
             self.logger.info("播放列表已清空")
@@ -172,23 +270,20 @@ class PlaylistManager:
             if self.current_index != -1:
                 self._add_to_history(self.current_index)
 
-            # 根据重复模式决定下一首
-            if self.repeat_mode == "one":
-                # 单曲循环，返回当前项
-                next_index = self.current_index if self.current_index != -1 else 0
-            else:
-                # 获取下一首
-                if self.current_index < len(self.playlist) - 1:
-                    next_index = self.current_index + 1
-                elif self.repeat_mode == "all":
-                    # 列表循环，回到第一首
-                    next_index = 0
-                else:
-                    # 没有更多项目
-                    return None
+            # 随机播放且列表循环时，当前是排列的最后一首则进入新一轮
+            new_round = (self.shuffle_enabled and self.repeat_mode == "all" and
+                         self._shuffle_position.get(self.current_index) == len(self._shuffle_order) - 1)
+
+            next_index = self._get_next_index()
+            if next_index is None:
+                return None
 
             if 0 <= next_index < len(self.playlist):
                 self.current_index = next_index
+                if new_round:
+                    # 换用重新打乱的下一轮排列，其第一首就是peek_next给出的曲目
+                    self._shuffle_order = self._next_round
+                    self._reindex_shuffle()
                 item = self.playlist[next_index]
                 self.logger.info(f"播放下一首: {item.display_name}")
                 self._trigger_current_track_changed()
@@ -200,6 +295,40 @@ class PlaylistManager:
             self.logger.error(f"播放下一首失败: {e}")
             return None
 
+    def peek_next(self) -> Optional[PlaylistItem]:
+        """
+        查看下一首但不切换（用于预加载）
+
+        Returns:
+            PlaylistItem: 下一首项目，如果没有则返回None
+        """
+        next_index = self._get_next_index()
+        if next_index is not None and 0 <= next_index < len(self.playlist):
+            return self.playlist[next_index]
+        return None
+
+    def _get_next_index(self) -> Optional[int]:
+        """根据重复模式和随机播放计算下一首的索引，没有下一首时返回None"""
+        if not self.playlist:
+            return None
+
+        if self.repeat_mode == "one":
+            # 单曲循环，返回当前项
+            return self.current_index if self.current_index != -1 else 0
+
+        if self.shuffle_enabled:
+            # 随机播放，按排列取下一个
+            return self._shuffle_step(1)
+
+        # 获取下一首
+        if self.current_index < len(self.playlist) - 1:
+            return self.current_index + 1
+        if self.repeat_mode == "all":
+            # 列表循环，回到第一首
+            return 0
+        # 没有更多项目
+        return None
+
     def previous_track(self) -> Optional[PlaylistItem]:
         """
         播放上一首
@@ -219,6 +348,11 @@ class PlaylistManager:
             if self.repeat_mode == "one":
                 # 单曲循环，返回当前项
                 prev_index = self.current_index if self.current_index != -1 else len(self.playlist) - 1
+            elif self.shuffle_enabled:
+                # 随机播放，按排列回到上一个
+                prev_index = self._shuffle_step(-1)
+                if prev_index is None:
+                    return None
             else:
                 # 获取上一首
                 if self.current_index > 0:
@@ -263,6 +397,83 @@ class PlaylistManager:
         """获取重复模式"""
         return self.repeat_mode
 
+    def set_shuffle(self, enabled: bool):
+        """
+        开启或关闭随机播放
+
+        开启时生成新的随机排列，当前曲目排在最前面，之后按排列播放，上一首按排列往回走。
+        """
+        self.shuffle_enabled = bool(enabled)
+        if self.shuffle_enabled:
+            self._build_shuffle_order()
+        else:
+            self._shuffle_order = []
+            self._shuffle_position = {}
+            self._next_round = []
+        self.logger.info(f"随机播放: {'开启' if self.shuffle_enabled else '关闭'}")
+
+    def is_shuffle_enabled(self) -> bool:
+        """是否开启随机播放"""
+        return self.shuffle_enabled
+
+    def _build_shuffle_order(self):
+        """生成随机排列，当前曲目放在第一位"""
+        order = list(range(len(self.playlist)))
+        self._random.shuffle(order)
+        if self.current_index != -1:
+            position = order.index(self.current_index)
+            order[0], order[position] = order[position], order[0]
+        self._shuffle_order = order
+        self._reindex_shuffle()
+
+    def _reindex_shuffle(self, start: int = 0):
+        """从start开始重建 索引 -> 排列位置 的映射（排列变化后下一轮需重新生成）"""
+        self._next_round = []
+        if start == 0:
+            self._shuffle_position = {}
+        for position in range(start, len(self._shuffle_order)):
+            self._shuffle_position[self._shuffle_order[position]] = position
+
+    def _shuffle_step(self, step: int) -> Optional[int]:
+        """
+        在随机排列中前进或后退一步（不改变当前位置）
+
+        Args:
+            step: 1为下一首，-1为上一首
+
+        Returns:
+            int: 目标索引，到达排列两端且不循环时返回None
+        """
+        if not self._shuffle_order:
+            return None
+
+        position = self._shuffle_position.get(self.current_index)
+        if position is None:
+            # 尚未开始播放，从排列开头（或结尾）开始
+            return self._shuffle_order[0 if step > 0 else -1]
+
+        target = position + step
+        if 0 <= target < len(self._shuffle_order):
+            return self._shuffle_order[target]
+
+        if self.repeat_mode == "all":
+            if step > 0:
+                # 整个排列播完，下一轮重新打乱
+                return self._get_next_round()[0]
+            return self._shuffle_order[-1]
+        return None
+
+    def _get_next_round(self) -> List[int]:
+        """列表循环时下一轮的随机排列，避免刚播完的曲目紧接着再播一次"""
+        if len(self._next_round) != len(self._shuffle_order):
+            order = list(self._shuffle_order)
+            self._random.shuffle(order)
+            if len(order) > 1 and order[0] == self.current_index:
+                swap = self._random.randrange(1, len(order))
+                order[0], order[swap] = order[swap], order[0]
+            self._next_round = order
+        return self._next_round
+
     def has_next(self) -> bool:
         """是否有下一首"""
         if not self.playlist:
@@ -274,6 +485,10 @@ class PlaylistManager:
         if self.repeat_mode == "all":
             return True
 
+        if self.shuffle_enabled:
+            position = self._shuffle_position.get(self.current_index, -1)
+            return position < len(self._shuffle_order) - 1
+
         return self.current_index < len(self.playlist) - 1
 
     def has_previous(self) -> bool:
@@ -287,6 +502,9 @@ class PlaylistManager:
         if self.repeat_mode == "all":
             return True
 
+        if self.shuffle_enabled:
+            return self._shuffle_position.get(self.current_index, 0) > 0
+
         return self.current_index > 0
 
     def get_playlist_info(self) -> Dict[str, Any]:
@@ -296,19 +514,16 @@ class PlaylistManager:
             "current_index": self.current_index,
             "current_track": self.get_current_item().display_name if self.get_current_item() else None,
             "repeat_mode": self.repeat_mode,
+            "shuffle": self.shuffle_enabled,
             "has_next": self.has_next(),
             "has_previous": self.has_previous()
         }
 
     def _add_to_history(self, index: int):
-        """添加到播放历史"""
+        """添加到播放历史（超过max_history_size时deque自动丢弃最早的记录）"""
         if index not in self.played_history:
             self.played_history.append(index)
 
-            # 限制历史大小
-            if len(self.played_history) > self.max_history_size:
-                self.played_history.pop(0)
-
     def _trigger_playlist_changed(self):
         """触发播放列表变化事件"""
         if self.on_playlist_changed:
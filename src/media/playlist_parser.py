@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+播放列表解析器
+增量解析 M3U/M3U8/PLS/XSPF 播放列表：数据按块到达时即可取出已完整的条目，
+远程大列表不必等整个文件下载完成就能开始播放第一项。
+"""
+
+import codecs
+import os
+import posixpath
+import re
+import urllib.parse
+import xml.etree.ElementTree as ET
+from typing import List, Optional
+
+from src.core.logger import get_logger
+
+
+class PlaylistEntry:
+    """播放列表条目"""
+
+    def __init__(self, location: str, title: str = None, duration: float = None):
+        self.location = location
+        self.title = title or None
+        self.duration = duration
+
+    def __repr__(self):
+        return f"PlaylistEntry({self.location!r}, {self.title!r})"
+
+
+class PlaylistParser:
+    """增量播放列表解析器"""
+
+    FORMATS = ('m3u', 'pls', 'xspf')
+
+    _PLS_KEY = re.compile(r'^(file|title|length)(\d+)$', re.IGNORECASE)
+
+    def __init__(self, playlist_format: str, encoding: str = None):
+        """
+        初始化解析器
+
+        Args:
+            playlist_format: 列表格式（m3u、pls、xspf）
+            encoding: 文本编码，None表示自动检测（UTF-8，失败时使用GBK）
+        """
+        if playlist_format not in self.FORMATS:
+            raise ValueError(f"不支持的播放列表格式: {playlist_format}")
+
+        self.logger = get_logger()
+        self.format = playlist_format
+        self.encoding = encoding
+        self._decoder = None
+        self._buffer = ""
+        self._closed = False
+
+        # M3U：#EXTINF 给出的下一条目信息
+        self._extinf = None
+
+        # PLS：正在收集的条目 {序号: {'file':..., 'title':..., 'length':...}}
+        self._pls_pending = {}
+
+        # XSPF：事件驱动的XML解析器
+        self._xml_parser = ET.XMLPullParser(events=('end',)) if playlist_format == 'xspf' else None
+
+    @classmethod
+    def for_filename(cls, filename: str, encoding: str = None) -> 'PlaylistParser':
+        """根据文件扩展名创建解析器（.m3u8固定使用UTF-8）"""
+        ext = os.path.splitext(filename.split('?')[0])[1].lower()
+        if ext == '.m3u8':
+            return cls('m3u', encoding or 'utf-8')
+        if ext in ('.m3u', '.pls', '.xspf'):
+            return cls(ext[1:], encoding)
+        raise ValueError(f"不支持的播放列表格式: {ext}")
+
+    def feed(self, data: bytes) -> List[PlaylistEntry]:
+        """
+        输入一块数据
+
+        Returns:
+            list: 本块数据中已完整的条目
+        """
+        if self._closed:
+            raise ValueError("解析器已关闭")
+        if not data:
+            return []
+
+        if self._xml_parser is not None:
+            self._xml_parser.feed(data)
+            return self._read_xml_events()
+
+        text = self._decode(data, final=False)
+        return self._parse_text(text, final=False)
+
+    def close(self) -> List[PlaylistEntry]:
+        """
+        结束输入
+
+        Returns:
+            list: 剩余的条目
+        """
+        if self._closed:
+            return []
+        self._closed = True
+
+        if self._xml_parser is not None:
+            try:
+                self._xml_parser.close()
+            except ET.ParseError as e:
+                # 截断的文件仍保留已解析出的条目
+                self.logger.warning(f"XSPF播放列表格式错误: {e}")
+            return self._read_xml_events()
+
+        text = self._decode(b"", final=True)
+        return self._parse_text(text, final=True)
+
+    def _decode(self, data: bytes, final: bool) -> str:
+        """增量解码，第一块含非ASCII字符的数据决定编码"""
+        if self._decoder is None:
+            if data.isascii() and not final:
+                return data.decode('ascii')
+            encoding = self.encoding or self._detect_encoding(data)
+            self._decoder = codecs.getincrementaldecoder(
+                'utf-8-sig' if encoding.replace('_', '-').lower() in ('utf-8', 'utf8') else encoding
+            )(errors='replace')
+        return self._decoder.decode(data, final)
+
+    @staticmethod
+    def _detect_encoding(data: bytes) -> str:
+        """检测文本编码：能按UTF-8解码（忽略末尾被截断的字符）即为UTF-8，否则按GBK处理"""
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(data, False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'gbk'
+
+    def _parse_text(self, text: str, final: bool) -> List[PlaylistEntry]:
+        """按行解析M3U/PLS，不完整的最后一行留到下次"""
+        self._buffer += text
+        lines = self._buffer.splitlines()
+        if not final and lines and not self._buffer.endswith(('\n', '\r')):
+            self._buffer = lines.pop()
+        else:
+            self._buffer = ""
+
+        entries = []
+        parse_line = self._parse_m3u_line if self.format == 'm3u' else self._parse_pls_line
+        for line in lines:
+            line = line.strip()
+            if line:
+                parse_line(line, entries)
+
+        if final and self.format == 'pls':
+            entries.extend(self._flush_pls())
+        return entries
+
+    def _parse_m3u_line(self, line: str, entries: List[PlaylistEntry]):
+        """解析一行M3U"""
+        if line.startswith('#'):
+            if line.upper().startswith('#EXTINF:'):
+                info = line[8:]
+                duration, _, title = info.partition(',')
+                try:
+                    # 去掉时长后可能跟随的属性（如 tvg-name="..."）
+                    seconds = float(duration.split()[0]) if duration.strip() else None
+                except ValueError:
+                    seconds = None
+                self._extinf = (seconds if seconds and seconds > 0 else None, title.strip())
+            return
+
+        duration, title = self._extinf or (None, None)
+        self._extinf = None
+        entries.append(PlaylistEntry(line, title, duration))
+
+    def _parse_pls_line(self, line: str, entries: List[PlaylistEntry]):
+        """解析一行PLS，序号变化时输出之前已完整的条目"""
+        key, sep, value = line.partition('=')
+        if not sep:
+            return
+        match = self._PLS_KEY.match(key.strip())
+        if not match:
+            return
+
+        field, number = match.group(1).lower(), int(match.group(2))
+        if number not in self._pls_pending:
+            # 按序号顺序书写的列表中，出现新序号说明之前的条目已经完整
+            entries.extend(self._flush_pls(before=number))
+        self._pls_pending.setdefault(number, {})[field] = value.strip()
+
+    def _flush_pls(self, before: int = None) -> List[PlaylistEntry]:
+        """输出序号小于before（None表示全部）的PLS条目"""
+        entries = []
+        for number in sorted(self._pls_pending):
+            if before is not None and number >= before:
+                break
+            fields = self._pls_pending.pop(number)
+            location = fields.get('file')
+            if not location:
+                continue
+            try:
+                duration = float(fields.get('length', ''))
+            except ValueError:
+                duration = None
+            entries.append(PlaylistEntry(location, fields.get('title'), duration if duration and duration > 0 else None))
+        return entries
+
+    def _read_xml_events(self) -> List[PlaylistEntry]:
+        """取出已解析完的XSPF track元素"""
+        entries = []
+        for _, element in self._xml_parser.read_events():
+            if self._local_name(element.tag) != 'track':
+                continue
+
+            fields = {}
+            for child in element:
+                name = self._local_name(child.tag)
+                if name in ('location', 'title', 'duration') and name not in fields and child.text:
+                    fields[name] = child.text.strip()
+            # 已处理的元素释放掉，大列表内存不随条目数增长
+            element.clear()
+
+            location = fields.get('location')
+            if not location:
+                continue
+            if len(urllib.parse.urlsplit(location).scheme) <= 1:
+                # XSPF的location是URI，相对地址需要解码
+                location = urllib.parse.unquote(location)
+            try:
+                duration = int(fields.get('duration', '')) / 1000
+            except ValueError:
+                duration = None
+            entries.append(PlaylistEntry(location, fields.get('title'), duration))
+        return entries
+
+    @staticmethod
+    def _local_name(tag) -> str:
+        """去掉XML命名空间"""
+        return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def resolve_playlist_location(location: str, playlist_path: str, base_path: str = None) -> Optional[str]:
+    """
+    把播放列表条目解析为服务器路径或URL
+
+    - 带协议的地址（http、rtsp等）原样返回，file:// 按本地路径处理
+    - 以/开头的路径视为服务器路径，包含用户基础路径时去掉该前缀
+    - 相对路径相对播放列表所在目录解析
+
+    Args:
+        location: 条目中的位置
+        playlist_path: 播放列表文件在服务器上的路径
+        base_path: 用户基础路径
+
+    Returns:
+        str: 服务器路径（以/开头）或URL，无法解析或越出根目录时返回None
+    """
+    location = location.strip()
+    if not location:
+        return None
+
+    parsed = urllib.parse.urlsplit(location)
+    if parsed.scheme == 'file':
+        location = urllib.parse.unquote(parsed.path)
+    elif len(parsed.scheme) > 1:
+        # 单字母scheme是Windows盘符，按路径处理
+        return location
+
+    location = location.replace('\\', '/')
+    if re.match(r'^[A-Za-z]:/', location):
+        # 本机绝对路径无法映射到服务器，只保留文件名相对列表目录查找
+        location = posixpath.basename(location)
+
+    if location.startswith('/'):
+        path = posixpath.normpath(location)
+        base = (base_path or '/').rstrip('/')
+        if base and (path == base or path.startswith(base + '/')):
+            path = path[len(base):] or '/'
+    else:
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(playlist_path) or '/', location))
+
+    if not path.startswith('/') or '/../' in path + '/':
+        return None
+    return path
+
+
+def iter_remote_playlist(session, url: str, filename: str, chunk_size: int = 64 * 1024, timeout=None):
+    """
+    流式下载并解析远程播放列表
+
+    Args:
+        session: requests会话（复用OpenList客户端的连接池）
+        url: 播放列表下载地址
+        filename: 播放列表文件名，用于判断格式
+        chunk_size: 每次读取的字节数
+        timeout: 请求超时
+
+    Yields:
+        list: 每块数据解析出的条目（可能为空列表时不产出）
+    """
+    parser = PlaylistParser.for_filename(filename)
+    with session.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            entries = parser.feed(chunk)
+            if entries:
+                yield entries
+    entries = parser.close()
+    if entries:
+        yield entries
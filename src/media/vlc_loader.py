@@ -431,7 +431,6 @@ class VLCLoader:
             '--no-snapshot-preview',         # 不显示截图预览
             '--no-interact',                 # 禁用交互接口
             '--ignore-config',               # 忽略配置文件
-            '--no-plugins-cache',            # 禁用插件缓存
             '--no-xlib',                     # 禁用X11相关功能
         ]
 
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享VLC运行时
+进程内只加载一次libvlc并创建一个VLC实例，音频/视频播放器通过租借/归还的方式复用媒体播放器对象，
+避免每次打开播放窗口都重新扫描插件、创建实例。
+应用启动时通过start_vlc_warmup在后台线程预加载，播放入口调用get_vlc_runtime时才等待加载完成。
+"""
+
+import platform
+import threading
+from concurrent.futures import Future
+
+from src.core.logger import get_logger
+from .vlc_loader import VLCLoader
+
+
+class VLCRuntime:
+    """进程级VLC运行时（VLC实例 + 媒体播放器池）"""
+
+    # 池中最多保留的空闲播放器数量
+    DEFAULT_POOL_SIZE = 2
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        初始化VLC运行时
+
+        Args:
+            pool_size: 空闲播放器池的最大容量
+        """
+        self.logger = get_logger()
+        self.pool_size = max(0, pool_size)
+        self._lock = threading.Lock()
+        self._idle_players = []
+        self._leased_count = 0
+
+        self.vlc_loader = VLCLoader()
+        self.vlc_instance = self.vlc_loader.get_vlc_instance()
+        self.vlc_lib = self.vlc_loader.get_vlc_lib()
+
+    def lease_player(self):
+        """
+        租借一个媒体播放器，池中无空闲播放器时新建
+
+        Returns:
+            vlc.MediaPlayer: 媒体播放器对象，使用完毕后须调用release_player归还
+        """
+        with self._lock:
+            player = self._idle_players.pop() if self._idle_players else None
+            self._leased_count += 1
+
+        if player is None:
+            player = self.vlc_instance.media_player_new()
+            self.logger.debug("VLC播放器池无空闲播放器，已新建播放器")
+        else:
+            self.logger.debug("复用VLC播放器池中的播放器")
+        return player
+
+    def release_player(self, player):
+        """
+        归还媒体播放器：停止播放并重置状态后放回池中，池满时直接释放
+
+        调用方需在归还前解除自己注册的事件监听。
+        """
+        if player is None:
+            return
+
+        pooled = self._reset_player(player)
+        with self._lock:
+            self._leased_count = max(0, self._leased_count - 1)
+            if pooled and len(self._idle_players) < self.pool_size:
+                self._idle_players.append(player)
+                return
+
+        try:
+            player.release()
+            self.logger.debug("已释放VLC播放器")
+        except Exception as e:
+            self.logger.warning(f"释放VLC播放器时出错: {e}")
+
+    def _reset_player(self, player) -> bool:
+        """重置播放器状态，返回是否可以放回池中"""
+        try:
+            player.stop()
+            player.set_media(None)
+            player.set_rate(1.0)
+            player.audio_set_mute(False)
+
+            # 解除与已关闭窗口的绑定
+            system = platform.system()
+            if system == 'Windows':
+                player.set_hwnd(0)
+            elif system == 'Darwin':
+                player.set_nsobject(0)
+            else:
+                player.set_xwindow(0)
+            return True
+        except Exception as e:
+            self.logger.warning(f"重置VLC播放器失败，不再复用: {e}")
+            return False
+
+    def get_pool_info(self) -> dict:
+        """获取播放器池状态"""
+        with self._lock:
+            return {
+                'idle': len(self._idle_players),
+                'leased': self._leased_count,
+                'pool_size': self.pool_size,
+            }
+
+    def shutdown(self):
+        """释放池中播放器和VLC实例（应用退出时调用）"""
+        with self._lock:
+            idle_players = self._idle_players
+            self._idle_players = []
+
+        for player in idle_players:
+            try:
+                player.release()
+            except Exception as e:
+                self.logger.warning(f"释放VLC播放器时出错: {e}")
+
+        self.vlc_loader.cleanup()
+        self.vlc_instance = None
+        self.logger.info("VLC运行时已关闭")
+
+
+_runtime_future = None
+_runtime_lock = threading.Lock()
+
+
+def _load_runtime(future: Future):
+    """后台加载VLC运行时并把结果写入future"""
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        runtime = VLCRuntime()
+        get_logger().info("VLC运行时预加载完成")
+        future.set_result(runtime)
+    except Exception as e:
+        get_logger().error(f"VLC运行时加载失败: {e}")
+        future.set_exception(e)
+
+
+def start_vlc_warmup() -> Future:
+    """
+    在后台线程开始加载VLC运行时（重复调用只会启动一次）
+
+    Returns:
+        Future: 加载完成后结果为VLCRuntime，失败时包含异常
+    """
+    global _runtime_future
+    with _runtime_lock:
+        if _runtime_future is None:
+            _runtime_future = Future()
+            threading.Thread(
+                target=_load_runtime,
+                args=(_runtime_future,),
+                name="VLCWarmup",
+                daemon=True
+            ).start()
+        return _runtime_future
+
+
+def get_vlc_runtime(timeout=None) -> VLCRuntime:
+    """
+    获取全局VLC运行时，尚未加载完成时等待预加载结果
+
+    Args:
+        timeout: 最长等待秒数，None表示一直等待
+
+    Raises:
+        加载失败时抛出VLC加载过程中的异常，超时时抛出TimeoutError
+    """
+    return start_vlc_warmup().result(timeout)
+
+
+def is_vlc_ready() -> bool:
+    """VLC运行时是否已加载成功（不会触发加载，也不会等待）"""
+    future = _runtime_future
+    return future is not None and future.done() and future.exception() is None
+
+
+def is_vlc_failed() -> bool:
+    """VLC运行时是否已确定加载失败"""
+    future = _runtime_future
+    return future is not None and future.done() and future.exception() is not None
+
+
+def shutdown_vlc_runtime():
+    """关闭全局VLC运行时（未加载或仍在加载时不做任何事）"""
+    global _runtime_future
+    with _runtime_lock:
+        future = _runtime_future
+        _runtime_future = None
+    if future is not None and future.done() and future.exception() is None:
+        future.result().shutdown()
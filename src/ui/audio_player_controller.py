@@ -5,12 +5,15 @@
 集成音频播放功能到主窗口，不打开新窗口
 """
 
+import os
+import threading
 import wx
 import wx.lib.newevent
 from typing import Optional, List, Callable
 from src.core.logger import get_logger
 from src.media.audio_player import AudioPlayer
-from src.media.vlc_loader import VLCLoader
+from src.media.vlc_runtime import is_vlc_ready, is_vlc_failed
+from src.ui.coalescing_dispatcher import CoalescingDispatcher
 
 # 定义自定义事件
 PlayerStatusEvent, EVT_PLAYER_STATUS = wx.lib.newevent.NewEvent()
@@ -20,19 +23,24 @@ PlayerProgressEvent, EVT_PLAYER_PROGRESS = wx.lib.newevent.NewEvent()
 class AudioPlayerController:
     """音频播放控制器"""
 
-    def __init__(self, parent_window):
+    # 播放进度刷新到界面的最小间隔（毫秒）
+    TIME_UPDATE_INTERVAL_MS = 250
+
+    def __init__(self, parent_window, time_update_interval_ms: int = TIME_UPDATE_INTERVAL_MS):
         """
         初始化音频播放控制器
 
         Args:
             parent_window: 父窗口（主窗口）
+            time_update_interval_ms: 播放进度刷新到界面的最小间隔（毫秒）
         """
         self.parent_window = parent_window
         self.logger = get_logger()
 
-        # 音频播放器
+        # 音频播放器（首次需要时才创建，避免启动时等待VLC加载）
         self.audio_player = None
         self.is_initialized = False
+        self._init_failed = False
 
         # 播放状态
         self.current_file = None
@@ -51,6 +59,12 @@ class AudioPlayerController:
         self.volume_field = 3      # 音量
         self.speed_field = 4       # 倍速
 
+        # 状态栏各字段上次写入的文本，未变化时不重复写入
+        self._status_texts = {}
+
+        # VLC线程的时间事件合并后按固定频率在UI线程中处理
+        self._time_dispatcher = CoalescingDispatcher(self._apply_time_update, time_update_interval_ms)
+
         # 音频设备列表
         self.audio_devices = []
         self.current_device = None
@@ -59,8 +73,35 @@ class AudioPlayerController:
         self.on_status_change_callback = None
         self.on_progress_change_callback = None
 
-        # 初始化
-        self._initialize_player()
+        # 下一首预加载：next_track_provider(当前文件名) 在后台线程中返回 (文件URL, 文件名[, 播放位置键]) 或 None
+        self.next_track_provider = None
+        self.on_track_changed_callback = None
+        self._queued_next = None
+        self._preload_generation = 0
+        self._preload_lock = threading.Lock()
+
+        # 等待VLC就绪后再填充的设备菜单
+        self._pending_device_menu = None
+        self._device_parent_menu = None
+
+    def ensure_player(self) -> bool:
+        """
+        确保音频播放器已创建，VLC仍在后台加载时等待其完成
+
+        Returns:
+            bool: 播放器是否可用
+        """
+        if self.is_initialized:
+            return True
+        if self._init_failed:
+            return False
+
+        if is_vlc_ready():
+            self._initialize_player()
+        else:
+            with wx.BusyCursor():
+                self._initialize_player()
+        return self.is_initialized
 
     def _initialize_player(self):
         """初始化音频播放器"""
@@ -74,15 +115,19 @@ class AudioPlayerController:
             self.audio_player.set_stop_callback(self._on_stop)
             self.audio_player.set_time_update_callback(self._on_time_update)
             self.audio_player.set_error_callback(self._on_error)
+            self.audio_player.set_track_changed_callback(self._on_track_changed)
 
-            # 设置初始音量
+            # 应用初始化前设置的音量和倍速
             self.audio_player.set_volume(self.volume)
+            if self.playback_rate != 1.0:
+                self.audio_player.player_core.set_rate(self.playback_rate)
 
             self.logger.info("音频播放控制器初始化成功")
 
         except Exception as e:
             self.logger.error(f"音频播放控制器初始化失败: {e}")
             self.is_initialized = False
+            self._init_failed = True
 
     def set_status_bar(self, status_bar):
         """
@@ -92,6 +137,7 @@ class AudioPlayerController:
             status_bar: 状态栏对象
         """
         self.status_bar = status_bar
+        self._status_texts.clear()
         self._update_status_bar()
 
     def set_status_change_callback(self, callback: Callable):
@@ -102,19 +148,33 @@ class AudioPlayerController:
         """设置进度变化回调"""
         self.on_progress_change_callback = callback
 
+    def set_next_track_provider(self, provider: Callable):
+        """
+        设置下一首提供者
+
+        Args:
+            provider: 接收当前文件名，返回 (文件URL, 文件名[, 播放位置键]) 或 None；在后台线程中调用
+        """
+        self.next_track_provider = provider
+
+    def set_track_changed_callback(self, callback: Callable):
+        """设置自动切换到下一首后的回调（在UI线程中调用，参数为新的文件名）"""
+        self.on_track_changed_callback = callback
+
     # 播放控制方法
-    def play_file(self, file_path: str, filename: str = None) -> bool:
+    def play_file(self, file_path: str, filename: str = None, position_key=None) -> bool:
         """
         播放音频文件
 
         Args:
             file_path: 文件路径
             filename: 显示的文件名
+            position_key: 记录播放位置用的 (服务器, 路径)，本地缓存文件需要指定原始位置
 
         Returns:
             bool: 是否成功开始播放
         """
-        if not self.is_initialized:
+        if not self.ensure_player():
             self.logger.error("音频播放器未初始化")
             return False
 
@@ -127,8 +187,9 @@ class AudioPlayerController:
             self.current_file = file_path
             self.current_filename = filename or file_path.split('/')[-1].split('\\')[-1]
 
-            # 播放文件
-            success = self.audio_player.load_and_play(file_path)
+            # 播放文件（加载新文件会丢弃之前预加载的下一首）
+            self._invalidate_next_preload()
+            success = self.audio_player.load_and_play(file_path, position_key=position_key)
             if success:
                 self.is_playing = True
                 self.is_paused = False
@@ -138,6 +199,9 @@ class AudioPlayerController:
                 # 触发状态变化事件
                 self._trigger_status_event("播放", self.current_filename)
 
+                # 在播放期间准备下一首
+                self._schedule_next_preload()
+
             return success
 
         except Exception as e:
@@ -212,6 +276,7 @@ class AudioPlayerController:
             return False
 
         try:
+            self._invalidate_next_preload()
             success = self.audio_player.stop()
             if success:
                 self.is_playing = False
@@ -270,11 +335,16 @@ class AudioPlayerController:
         Returns:
             bool: 是否成功
         """
-        if not self.is_initialized:
-            return False
-
         volume = max(0, min(100, volume))  # 限制范围
 
+        if not self.is_initialized:
+            # 播放器尚未创建，记下音量，创建时再应用
+            if self._init_failed:
+                return False
+            self.volume = volume
+            self._update_status_bar()
+            return True
+
         try:
             success = self.audio_player.set_volume(volume)
             if success:
@@ -311,7 +381,12 @@ class AudioPlayerController:
             bool: 是否成功
         """
         if not self.is_initialized:
-            return False
+            # 播放器尚未创建，记下倍速，创建时再应用
+            if self._init_failed:
+                return False
+            self.playback_rate = rate
+            self._update_status_bar()
+            return True
 
         try:
             # VLC的倍速设置
@@ -339,6 +414,8 @@ class AudioPlayerController:
         try:
             devices = self.audio_player.player_core.get_available_audio_devices()
             self.audio_devices = devices
+            # 枚举后当前设备可能已回退为默认设备，下次刷新状态栏时重新获取
+            self.current_device = None
             return devices
         except Exception as e:
             self.logger.error(f"获取音频设备列表失败: {e}")
@@ -389,6 +466,7 @@ class AudioPlayerController:
         try:
             devices = self.audio_player.player_core.refresh_audio_devices()
             self.audio_devices = devices
+            self.current_device = None
             return devices
         except Exception as e:
             self.logger.error(f"刷新音频设备列表失败: {e}")
@@ -398,13 +476,50 @@ class AudioPlayerController:
         """
         创建音频设备子菜单
 
+        VLC尚未就绪时先显示占位项，菜单打开时再填充实际设备。
+
         Args:
             parent_menu: 父菜单对象
         """
-        try:
-            # 创建设备子菜单
-            device_menu = wx.Menu()
+        device_menu = wx.Menu()
+        if self.is_initialized:
+            self._populate_device_menu(device_menu)
+            return device_menu
+
+        loading_item = device_menu.Append(
+            wx.ID_ANY,
+            "正在加载音频设备...",
+            "音频播放功能尚未就绪"
+        )
+        loading_item.Enable(False)
+
+        self._pending_device_menu = device_menu
+        self._device_parent_menu = parent_menu
+        self.parent_window.Bind(wx.EVT_MENU_OPEN, self._on_menu_open)
+        return device_menu
+
+    def _on_menu_open(self, event):
+        """播放菜单或设备菜单打开时，VLC已就绪则填充设备列表"""
+        event.Skip()
 
+        device_menu = self._pending_device_menu
+        if device_menu is None or event.GetMenu() not in (device_menu, self._device_parent_menu):
+            return
+        if not is_vlc_ready() and not is_vlc_failed():
+            return
+
+        self._pending_device_menu = None
+        self._device_parent_menu = None
+        self.parent_window.Unbind(wx.EVT_MENU_OPEN, handler=self._on_menu_open)
+
+        for item in list(device_menu.GetMenuItems()):
+            device_menu.Delete(item)
+        self.ensure_player()
+        self._populate_device_menu(device_menu)
+
+    def _populate_device_menu(self, device_menu):
+        """向设备子菜单添加可用音频设备"""
+        try:
             # 获取可用设备
             if not self.is_initialized:
                 no_device_item = device_menu.Append(
@@ -413,7 +528,7 @@ class AudioPlayerController:
                     "音频播放功能尚未就绪"
                 )
                 no_device_item.Enable(False)
-                return device_menu
+                return
 
             devices = self.get_available_devices()
             current_info = self.audio_player.player_core.get_current_audio_device_info()
@@ -456,11 +571,8 @@ class AudioPlayerController:
                 )
                 no_device_item.Enable(False)
 
-            return device_menu
-
         except Exception as e:
             self.logger.error(f"创建设备菜单失败: {e}")
-            return wx.Menu()
 
     def _on_device_selected(self, device):
         """
@@ -493,6 +605,83 @@ class AudioPlayerController:
                 except Exception as status_err:
                     self.logger.debug(f"更新状态栏时发生异常: {status_err}")
 
+    # 下一首预加载
+    def _invalidate_next_preload(self):
+        """使进行中的预加载失效"""
+        with self._preload_lock:
+            self._preload_generation += 1
+            self._queued_next = None
+
+    def _schedule_next_preload(self):
+        """在后台解析下一首的URL并预加载媒体"""
+        if not self.next_track_provider or not self.is_initialized:
+            return
+
+        with self._preload_lock:
+            generation = self._preload_generation
+
+        threading.Thread(
+            target=self._preload_next_worker,
+            args=(generation, self.current_filename),
+            name="AudioNextPreload",
+            daemon=True
+        ).start()
+
+    def ensure_next_preload(self):
+        """尚未预加载下一首时重新尝试（如播放列表仍在加载，上次预加载时还没有下一首）"""
+        with self._preload_lock:
+            queued = self._queued_next is not None
+        if self.current_file and not queued:
+            self._schedule_next_preload()
+
+    def _preload_next_worker(self, generation: int, current_filename: str):
+        """预加载工作线程"""
+        try:
+            next_track = self.next_track_provider(current_filename)
+            if not next_track:
+                return
+
+            file_path, filename = next_track[:2]
+            position_key = next_track[2] if len(next_track) > 2 else None
+            with self._preload_lock:
+                if generation != self._preload_generation:
+                    return
+                if self.audio_player.queue_next(file_path, position_key=position_key):
+                    self._queued_next = (file_path, filename)
+                    self.logger.info(f"已预加载下一首: {filename}")
+
+        except Exception as e:
+            self.logger.error(f"预加载下一首失败: {e}")
+
+    def _on_track_changed(self, file_path: str):
+        """播放器已切换到预加载的曲目（来自播放线程）"""
+        wx.CallAfter(self._apply_track_change, file_path)
+
+    def _apply_track_change(self, file_path: str):
+        """在UI线程中同步切换后的播放状态"""
+        with self._preload_lock:
+            queued = self._queued_next
+            self._queued_next = None
+            self._preload_generation += 1
+
+        if queued and queued[0] == file_path:
+            filename = queued[1]
+        else:
+            filename = os.path.basename(file_path.split('?')[0])
+
+        self.current_file = file_path
+        self.current_filename = filename
+        self.is_playing = True
+        self.is_paused = False
+        self._update_status_bar()
+        self.logger.info(f"自动播放下一首: {filename}")
+        self._trigger_status_event("播放", filename)
+
+        if self.on_track_changed_callback:
+            self.on_track_changed_callback(filename)
+
+        self._schedule_next_preload()
+
     # 状态和进度方法
     def get_current_time(self) -> int:
         """获取当前播放时间（毫秒）"""
@@ -549,47 +738,66 @@ class AudioPlayerController:
             progress = self.get_progress_percentage()
             progress_text = f"{progress:.1f}%"
 
-            # 音量和当前设备
-            current_device = self.get_current_device()
-            volume_text = f"音量:{self.volume}% [{current_device}]"
+            # 音量和当前设备（设备名在切换设备时更新，不再每次查询播放器）
+            if self.current_device is None:
+                self.current_device = self.get_current_device()
+            volume_text = f"音量:{self.volume}% [{self.current_device}]"
 
             # 倍速
             speed_text = f"{self.playback_rate}x"
 
-            # 更新状态栏 - 5个字段全部用于音频播放功能
-            self.status_bar.SetStatusText(status_text, self.status_field)     # 播放状态
-            self.status_bar.SetStatusText(time_text, self.time_field)         # 播放时间
-            self.status_bar.SetStatusText(progress_text, self.progress_field) # 播放进度
-            self.status_bar.SetStatusText(volume_text, self.volume_field)     # 音量和设备
-            self.status_bar.SetStatusText(speed_text, self.speed_field)       # 播放倍速
+            # 更新状态栏 - 5个字段全部用于音频播放功能，文本未变化的字段跳过
+            self._set_status_text(status_text, self.status_field)     # 播放状态
+            self._set_status_text(time_text, self.time_field)         # 播放时间
+            self._set_status_text(progress_text, self.progress_field) # 播放进度
+            self._set_status_text(volume_text, self.volume_field)     # 音量和设备
+            self._set_status_text(speed_text, self.speed_field)       # 播放倍速
 
         except Exception as e:
             self.logger.error(f"更新状态栏失败: {e}")
 
-    # 事件处理
+    def _set_status_text(self, text: str, field: int):
+        """写入状态栏字段，文本与上次相同时跳过"""
+        if self._status_texts.get(field) == text:
+            return
+        self._status_texts[field] = text
+        self.status_bar.SetStatusText(text, field)
+
+    # 事件处理（播放器回调可能来自VLC事件线程，界面更新统一转到UI线程）
+    def _refresh_status_bar(self):
+        """在UI线程中刷新状态栏"""
+        if wx.IsMainThread():
+            self._update_status_bar()
+        else:
+            wx.CallAfter(self._update_status_bar)
+
     def _on_play(self):
         """播放事件回调"""
         self.is_playing = True
         self.is_paused = False
-        self._update_status_bar()
+        self._refresh_status_bar()
         self._trigger_status_event("播放", self.current_filename)
 
     def _on_pause(self):
         """暂停事件回调"""
         self.is_playing = False
         self.is_paused = True
-        self._update_status_bar()
+        self._refresh_status_bar()
         self._trigger_status_event("暂停", self.current_filename)
 
     def _on_stop(self):
         """停止事件回调"""
         self.is_playing = False
         self.is_paused = False
-        self._update_status_bar()
+        self._refresh_status_bar()
         self._trigger_status_event("停止", "")
 
     def _on_time_update(self, time_ms):
-        """时间更新事件回调"""
+        """时间更新事件回调（VLC事件线程），合并后交给UI线程处理"""
+        self._time_dispatcher.post(time_ms)
+
+    def _apply_time_update(self, time_ms):
+        """UI线程：按合并后的频率刷新状态栏和进度事件"""
         self._update_status_bar()
 
         # 触发进度变化事件
@@ -600,6 +808,10 @@ class AudioPlayerController:
                 progress=self.get_progress_percentage()
             ))
 
+    def set_time_update_interval(self, interval_ms: int):
+        """设置播放进度刷新到界面的最小间隔（毫秒）"""
+        self._time_dispatcher.set_interval(interval_ms)
+
     def _on_error(self, error_msg):
         """错误事件回调"""
         self.logger.error(f"音频播放错误: {error_msg}")
@@ -615,8 +827,10 @@ class AudioPlayerController:
 
     # 工具方法
     def is_available(self) -> bool:
-        """检查播放器是否可用"""
-        return self.is_initialized
+        """检查播放器是否可用（VLC仍在后台加载时视为可用，使用时再等待）"""
+        if self.is_initialized:
+            return True
+        return not self._init_failed and not is_vlc_failed()
 
     def get_current_filename(self) -> str:
         """获取当前播放文件名"""
@@ -635,6 +849,7 @@ class AudioPlayerController:
         """清理状态栏显示"""
         try:
             if self.status_bar:
+                self._status_texts.clear()
                 # 清空所有状态栏字段
                 self.status_bar.SetStatusText("", 0)  # 播放状态
                 self.status_bar.SetStatusText("", 1)  # 播放时间
@@ -648,6 +863,7 @@ class AudioPlayerController:
     def cleanup(self):
         """清理资源"""
         try:
+            self._time_dispatcher.close()
             if self.audio_player:
                 self.audio_player.cleanup()
             self.logger.info("音频播放控制器资源已清理")
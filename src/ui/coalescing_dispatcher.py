@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合并分发器
+把后台线程（如VLC事件线程）的高频事件合并，按固定频率在UI线程中只投递最新一次
+"""
+
+import threading
+import time
+
+import wx
+
+
+class CoalescingDispatcher:
+    """高频事件合并分发器，post可在任意线程调用，回调总在UI线程中执行"""
+
+    def __init__(self, callback, interval_ms=250):
+        """
+        初始化分发器
+
+        Args:
+            callback: 在UI线程中调用的回调，参数为最近一次post的值
+            interval_ms: 两次回调之间的最小间隔（毫秒）
+        """
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._pending = None
+        self._scheduled = False
+        self._closed = False
+        self._last_flush = 0.0
+
+    def post(self, value=None):
+        """提交一个事件值，同一间隔内的多次提交只保留最后一次"""
+        with self._lock:
+            if self._closed:
+                return
+            self._pending = value
+            if self._scheduled:
+                return
+            self._scheduled = True
+        wx.CallAfter(self._schedule)
+
+    def set_interval(self, interval_ms):
+        """修改最小投递间隔（毫秒）"""
+        self.interval_ms = max(0, interval_ms)
+
+    def close(self):
+        """停止投递，丢弃尚未投递的事件"""
+        with self._lock:
+            self._closed = True
+            self._pending = None
+
+    def _schedule(self):
+        """UI线程：距上次投递不足间隔时延迟到间隔结束"""
+        elapsed_ms = (time.monotonic() - self._last_flush) * 1000
+        delay_ms = int(self.interval_ms - elapsed_ms)
+        if delay_ms > 0:
+            wx.CallLater(delay_ms, self._flush)
+        else:
+            self._flush()
+
+    def _flush(self):
+        """UI线程：投递最新的事件值"""
+        with self._lock:
+            if self._closed:
+                return
+            value = self._pending
+            self._pending = None
+            self._scheduled = False
+        self._last_flush = time.monotonic()
+        self.callback(value)
@@ -5,23 +5,63 @@
 登录成功后显示的文件管理界面
 """
 
+import itertools
+import os
 import threading
+import time
 
 import wx
 import wx.lib.mixins.listctrl as listmix
 from src.core.logger import get_logger
+from src.core.directory_cache import DirectoryCache
+from src.core.file_entry import FileEntry, format_file_size
+from src.core.name_search import NameSearchIndex, MatchPositions
+from src.api.directory_prefetcher import DirectoryPrefetcher
+from src.api.download_manager import DownloadManager, TokenBucket, safe_local_name
+from src.media.media_cache import MediaCache
+from src.media.media_metadata import MediaMetadataProber
+from src.core.request_trace import trace_event, redact_url
+from src.core.sort_keys import (
+    get_pinyin_key_cache, get_pinyin_initials_cache, name_sort_key, size_sort_key, date_sort_key
+)
 from src.ui.server_select_dialog import ServerSelectDialog
 from src.core.version import get_about_text, get_version_info
 from src.media.file_detector import MediaFileDetector
+from src.media.media_index import MediaIndex
+from src.media.playlist_manager import PlaylistManager, PlaylistItem
+from src.media.playlist_parser import iter_remote_playlist, resolve_playlist_location
 from src.ui.media_player_window import MediaPlayerWindow
 from src.ui.audio_player_controller import AudioPlayerController
+from src.ui.coalescing_dispatcher import CoalescingDispatcher
+from src.ui.search_dialog import SearchDialog
+from src.ui.folder_info_dialog import FolderInfoDialog
 from src.ui.video_player_window import VideoPlayerWindow
-import pypinyin
+
+
+class _AudioFolder:
+    """开始播放时记录的目录列表，自动切换下一首时使用，不受之后浏览其他目录影响"""
+
+    def __init__(self, path, files, media_index):
+        self.path = path
+        self.files = list(files)
+        # 直接沿用文件列表已建立的媒体索引，不重新解析每个条目
+        self.media_index = media_index.snapshot()
+        self.version = media_index.version
+
+    def matches(self, path, media_index):
+        """目录及其列表（加载、排序、追加分页）自开始播放以来是否未变化"""
+        return self.path == path and self.version == media_index.version
 
 
 class FileManagerWindow(wx.Frame):
     """文件管理主窗口"""
 
+    # 焦点停留多久后开始预取目录（毫秒）
+    PREFETCH_DELAY_MS = 400
+
+    # 统计文件夹大小时，一次遍历最多写入目录缓存的文件夹数（避免整棵目录树挤掉常用缓存）
+    WALK_CACHE_LIMIT = 200
+
     def __init__(self, server_info, client):
         """
         初始化文件管理窗口
@@ -44,20 +84,76 @@ class FileManagerWindow(wx.Frame):
         self.file_list = []
         self._load_sequence = 0
 
+        # 目录列表磁盘缓存
+        self.directory_cache = DirectoryCache()
+
+        # 拼音排序键缓存（在后台加载线程中为每个文件项预先计算）
+        self._pinyin_keys = get_pinyin_key_cache()
+        self._pinyin_initials = get_pinyin_initials_cache()
+
+        # 目录预取：焦点停留时在后台获取焦点文件夹、相邻文件夹和上级目录
+        self._prefetcher = None
+        self._prefetch_timer = None
+        if server_info.get('prefetch_directories', True):
+            self._prefetcher = DirectoryPrefetcher(client, on_loaded=self._on_directory_prefetched)
+
         # 目录导航历史栈 (带路径验证的智能历史栈)
         # 每个元素包含: {'path': str, 'files': list, 'selected_index': int}
         self._navigation_history = []
 
+        # 下载管理器（首次下载时创建）及上次选择的保存目录
+        self.download_manager = None
+        self._download_dir = os.path.expanduser("~")
+
+        # 批量下载和音频缓存共用的限速器，download_speed_limit是两者的总限速
+        self._download_bandwidth = TokenBucket((server_info.get('download_speed_limit') or 0) * 1024)
+
+        # 本地音频缓存：曲目播放结束后或预取时在后台下载到本地，再次播放直接使用本地文件
+        self.media_cache = None
+        self._media_cache_downloader = None
+        # 正在播放、等播放结束后再缓存的远程音频 (地址, 缓存键)，及已预加载的下一首 (文件名, 地址, 缓存键)
+        self._deferred_cache_fill = None
+        self._queued_cache_fill = None
+        if server_info.get('media_cache', True):
+            self.media_cache = MediaCache(max_bytes=server_info.get('media_cache_size_mb', 2048) * 1024 * 1024)
+
+        # 媒体元数据：在后台探测列表中可见的音视频文件，显示时长
+        self._metadata_prober = None
+        self._metadata_refresh = None
+        if server_info.get('media_metadata', True):
+            self._metadata_prober = MediaMetadataProber(
+                client.server_key,
+                self._build_metadata_url,
+                on_probed=self._on_media_metadata_probed
+            )
+            self._metadata_refresh = CoalescingDispatcher(self._refresh_probed_items, interval_ms=200)
+
         # 媒体播放器相关
         self.media_player_window = None
         self.video_player_window = None  # 新增：视频播放窗口
 
         # 音频播放控制器
         self.audio_controller = AudioPlayerController(self)
+        self.audio_controller.set_next_track_provider(self._resolve_next_audio_track)
+        self.audio_controller.set_track_changed_callback(self._on_audio_track_changed)
+
+        # 从播放列表文件（m3u/pls/xspf）播放时的曲目列表
+        self.playlist_manager = PlaylistManager()
+        self._playlist_sequence = 0
 
         # 记住最后通过回车键选择的文件（用于停止后恢复播放）
         self._last_selected_file = None
 
+        # 正在播放的音频所在目录的列表，自动切换下一首时使用
+        self._audio_folder = None
+
+        # 搜索对话框（非模态，首次按Ctrl+F时创建），及从搜索结果定位时目录加载后要选中的文件名
+        self._search_dialog = None
+        self._pending_select_name = None
+
+        # 打开中的文件夹信息对话框（非模态，后台递归统计文件夹大小）
+        self._folder_info_dialogs = []
+
         # 初始化UI
         self._create_ui()
         self._create_menu()
@@ -75,6 +171,8 @@ class FileManagerWindow(wx.Frame):
         # 创建文件列表
         self.file_list_ctrl = FileListCtrl(self)
         self.file_list_ctrl.SetMinSize((760, 500))
+        if self._metadata_prober:
+            self.file_list_ctrl.metadata_requester = self._probe_media_metadata
 
         main_sizer.Add(self.file_list_ctrl, 1, wx.ALL | wx.EXPAND, 10)
 
@@ -109,6 +207,8 @@ class FileManagerWindow(wx.Frame):
         edit_menu.AppendSeparator()
         copy_name_item = edit_menu.Append(wx.ID_ANY, "复制文件名(&C)\tCtrl+C", "复制选中文件的名称")
         copy_path_item = edit_menu.Append(wx.ID_ANY, "复制路径(&P)\tCtrl+Shift+C", "复制选中文件的完整路径")
+        edit_menu.AppendSeparator()
+        search_item = edit_menu.Append(wx.ID_ANY, "搜索(&F)\tCtrl+F", "在服务器上按文件名搜索")
 
         # 播放菜单
         play_menu = wx.Menu()
@@ -179,6 +279,7 @@ class FileManagerWindow(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_select_all, select_all_item)
         self.Bind(wx.EVT_MENU, self.on_copy_name, copy_name_item)
         self.Bind(wx.EVT_MENU, self.on_copy_path, copy_path_item)
+        self.Bind(wx.EVT_MENU, self.on_search, search_item)
 
         # 播放菜单事件
         self.Bind(wx.EVT_MENU, self.on_play_pause, play_pause_item)
@@ -216,6 +317,7 @@ class FileManagerWindow(wx.Frame):
             (wx.ACCEL_SHIFT, wx.WXK_RETURN, wx.ID_HIGHEST + 7),  # Shift+Enter 查看说明
             (wx.ACCEL_ALT | wx.ACCEL_SHIFT, wx.WXK_RETURN, wx.ID_HIGHEST + 8),  # Alt+Shift+Enter 批量下载
             (wx.ACCEL_NORMAL, ord('O'), wx.ID_HIGHEST + 9),  # O 打开
+            (wx.ACCEL_CTRL, ord('F'), wx.ID_HIGHEST + 10),  # Ctrl+F 搜索
             (wx.ACCEL_NORMAL, wx.WXK_F1, wx.ID_ABOUT),   # F1 关于
 
             # 音频播放快捷键
@@ -242,6 +344,7 @@ class FileManagerWindow(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_view_info_hotkey, id=wx.ID_HIGHEST + 7)
         self.Bind(wx.EVT_MENU, self.on_batch_download_hotkey, id=wx.ID_HIGHEST + 8)
         self.Bind(wx.EVT_MENU, self.on_open_hotkey, id=wx.ID_HIGHEST + 9)
+        self.Bind(wx.EVT_MENU, self.on_search, id=wx.ID_HIGHEST + 10)
 
         # 音频播放快捷键事件
         self.logger.info("正在绑定音频快捷键事件...")
@@ -331,6 +434,7 @@ class FileManagerWindow(wx.Frame):
         """绑定事件"""
         self.Bind(wx.EVT_CLOSE, self.on_close)
         self.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_item_activated, self.file_list_ctrl)
+        self.Bind(wx.EVT_LIST_ITEM_FOCUSED, self.on_item_focused, self.file_list_ctrl)
         # 绑定文件列表控件的键盘事件
         self.file_list_ctrl.Bind(wx.EVT_CHAR, self.on_char)
         # 在父窗口级别也捕获键盘事件，以确保上下文菜单键能被识别
@@ -338,8 +442,12 @@ class FileManagerWindow(wx.Frame):
 
 
 
-    def _load_file_list(self):
-        """加载文件列表"""
+    def _load_file_list(self, force_refresh=False):
+        """加载文件列表
+
+        Args:
+            force_refresh: 为True时跳过目录缓存，直接从服务器获取
+        """
         self._load_sequence += 1
         load_id = self._load_sequence
         target_path = self.current_path
@@ -348,51 +456,256 @@ class FileManagerWindow(wx.Frame):
 
         worker = threading.Thread(
             target=self._load_file_list_worker,
-            args=(target_path, load_id),
+            args=(target_path, load_id, force_refresh),
             daemon=True,
         )
         worker.start()
 
-    def _load_file_list_worker(self, path, load_id):
-        """后台线程：请求文件列表并格式化数据"""
-        files = []
-        total = 0
-        error = None
+    def _load_file_list_worker(self, path, load_id, force_refresh=False):
+        """后台线程：优先显示缓存的目录列表，再从服务器分页获取并校验"""
+        server_key = self.client.server_key
+        cached_rows = None if force_refresh else self.directory_cache.get(server_key, path)
+
+        if cached_rows is not None:
+            try:
+                files = self._prepare_file_entries([FileEntry.from_row(row) for row in cached_rows])
+            except (TypeError, ValueError) as exc:
+                self.logger.debug(f"目录缓存格式无效，重新加载: {path}: {exc}")
+                self._stream_file_list(path, load_id)
+                return
+            wx.CallAfter(
+                self._apply_file_list_page,
+                path,
+                files,
+                len(files),
+                True,
+                True,
+                load_id
+            )
+            wx.CallAfter(self._apply_search_index, path, NameSearchIndex(files), load_id)
+
+            # 文件夹修改时间不能反映子文件夹内部的变化，缓存内容总是在后台重新校验，
+            # 列表未变化时不替换显示内容
+            self._revalidate_file_list(path, load_id, cached_rows)
+            return
+
+        self._stream_file_list(path, load_id)
+
+    def _stream_file_list(self, path, load_id):
+        """分页请求文件列表，逐页交给UI显示，完成后写入目录缓存"""
+        loaded = 0
+        all_entries = []
+        pages = self.client.iter_file_list(path)
 
         try:
-            response = self.client.get_file_list(path)
-
-            raw_files = response.get('files', [])
-            for file_data in raw_files:
-                file_item = {
-                    "name": file_data.get('name', ''),
-                    "size": self._format_file_size(file_data.get('size', 0)),
-                    "date": self._format_date(file_data.get('modified_time')),
-                    "type": self._get_file_type(
-                        file_data.get('mime_type', ''),
-                        file_data.get('name', '')
-                    ),
-                    "mime_type": file_data.get('mime_type', ''),
-                    "path": file_data.get('path', ''),
-                    "sign": file_data.get('sign', ''),
-                    "id": file_data.get('id', '')
-                }
-                files.append(file_item)
-
-            total = response.get('total', len(files))
+            for response in pages:
+                if load_id != self._load_sequence:
+                    # 已切换到其他目录，停止拉取后续分页
+                    return
+
+                files = self._prepare_file_entries(response.get('files', []))
+                all_entries.extend(files)
+                loaded += len(files)
+                total = response.get('total', loaded)
+                is_first = response.get('page', 1) == 1
+                is_last = (
+                    not files
+                    or loaded >= total
+                    or response.get('page', 1) >= response.get('total_pages', 1)
+                )
+
+                wx.CallAfter(
+                    self._apply_file_list_page,
+                    path,
+                    files,
+                    total,
+                    is_first,
+                    is_last,
+                    load_id
+                )
+
+                if is_last:
+                    wx.CallAfter(self._apply_search_index, path, NameSearchIndex(all_entries), load_id)
+                    self._store_directory_cache(path, all_entries)
+                    return
 
         except Exception as exc:
-            error = exc
             self.logger.error(f"加载文件列表失败: {exc}")
+            wx.CallAfter(
+                self._apply_file_list_result,
+                path,
+                [],
+                loaded,
+                exc,
+                load_id
+            )
+        finally:
+            pages.close()
 
-        wx.CallAfter(
-            self._apply_file_list_result,
-            path,
-            files,
-            total,
-            error,
-            load_id
-        )
+    def _revalidate_file_list(self, path, load_id, cached_rows):
+        """后台校验缓存的目录列表，有变化时替换显示内容"""
+        raw_entries = []
+        pages = self.client.iter_file_list(path)
+
+        try:
+            for response in pages:
+                if load_id != self._load_sequence:
+                    return
+                raw_entries.extend(response.get('files', []))
+        except Exception as exc:
+            # 已显示缓存内容，校验失败只记录日志
+            self.logger.error(f"后台刷新文件列表失败: {path}: {exc}")
+            return
+        finally:
+            pages.close()
+
+        rows = self._store_directory_cache(path, raw_entries)
+        if rows == cached_rows:
+            self.logger.debug(f"目录内容未变化: {path}")
+            return
+
+        files = self._prepare_file_entries(raw_entries)
+        wx.CallAfter(self._apply_revalidated_file_list, path, files, load_id)
+        wx.CallAfter(self._apply_search_index, path, NameSearchIndex(files), load_id)
+
+    def _store_directory_cache(self, path, entries):
+        """将服务器返回的目录列表写入缓存
+
+        Returns:
+            写入缓存的紧凑行数据
+        """
+        rows = [entry.to_row() for entry in entries]
+        self.directory_cache.put(self.client.server_key, path, rows)
+        return rows
+
+    def _apply_revalidated_file_list(self, path, files, load_id):
+        """在UI线程中用刷新后的列表替换缓存内容，保持选中的文件不变"""
+        if load_id != self._load_sequence or path != self.current_path:
+            return
+
+        selected_index = self.file_list_ctrl.get_first_selected()
+        selected_name = None
+        if 0 <= selected_index < len(self.file_list):
+            selected_name = self.file_list[selected_index].name
+
+        self.file_list = files
+        self.file_list_ctrl.load_files(files)
+
+        new_index = 0
+        if selected_name is not None:
+            new_index = self.media_index.index_of(selected_name)
+            if new_index == -1:
+                new_index = min(selected_index, len(self.file_list) - 1)
+        if self.file_list:
+            self._select_file_index(new_index)
+
+        self.logger.info(f"目录已刷新: {path}, {len(files)} 个项目")
+
+    def on_item_focused(self, event):
+        """列表焦点变化：延迟触发目录预取，快速移动焦点时不发送请求"""
+        event.Skip()
+        if not self._prefetcher:
+            return
+
+        if self._prefetch_timer and self._prefetch_timer.IsRunning():
+            self._prefetch_timer.Stop()
+        self._prefetch_timer = wx.CallLater(self.PREFETCH_DELAY_MS, self._prefetch_around_focus)
+
+    def _prefetch_around_focus(self):
+        """预取焦点文件夹、相邻文件夹及上级目录"""
+        index = self.file_list_ctrl.GetFocusedItem()
+        files = self.file_list_ctrl.files
+        if not 0 <= index < len(files):
+            return
+
+        base = self.current_path.rstrip('/')
+        paths = []
+        for i in (index, index + 1, index - 1):
+            if 0 <= i < len(files) and files[i].is_dir:
+                paths.append(f"{base}/{files[i].name}")
+
+        if self.current_path != "/":
+            paths.append(base.rsplit('/', 1)[0] or "/")
+
+        if paths:
+            self._prefetcher.prefetch(paths)
+
+    def _on_directory_prefetched(self, path, entries):
+        """后台线程：预取完成后补充条目字段并写入目录缓存"""
+        self._prepare_file_entries(entries)
+        self._store_directory_cache(path, entries)
+
+    def _make_walk_cache_writer(self):
+        """
+        创建统计文件夹时写入目录缓存的回调（在遍历线程中调用）
+
+        只写入紧凑行数据，不计算拼音、不记录修改时间，且最多写入WALK_CACHE_LIMIT个文件夹
+        """
+        server_key = self.client.server_key
+        counter = itertools.count()
+
+        def store(path, entries):
+            if next(counter) < self.WALK_CACHE_LIMIT:
+                self.directory_cache.put(server_key, path, [entry.to_row() for entry in entries])
+
+        return store
+
+    def _show_prefetched_list(self, path):
+        """使用预取的目录列表立即显示
+
+        Returns:
+            bool: 是否命中预取结果
+        """
+        if not self._prefetcher:
+            return False
+
+        entries = self._prefetcher.get(path)
+        if entries is None:
+            return False
+
+        # 使旧的加载请求失效；复制列表，避免排序影响缓存中的结果
+        self._load_sequence += 1
+        self.file_list = list(entries)
+        self.file_list_ctrl.load_files(self.file_list)
+        self._auto_select_first_item()
+        self.logger.info(f"使用预取结果显示目录: {path}, {len(entries)} 个项目")
+        return True
+
+    def _prepare_file_entries(self, entries):
+        """为API返回的文件条目补充显示类型和排序键（在后台线程中调用）"""
+        for entry in entries:
+            entry.file_type = self._get_file_type(entry.mime_type, entry.name)
+            entry.sort_key = self._pinyin_keys.get_key(entry.name)
+            entry.initials = self._pinyin_initials.get_key(entry.name)
+        return entries
+
+    def _apply_search_index(self, path, index, load_id):
+        """在UI线程中设置后台线程建立的名称查找索引"""
+        if load_id != self._load_sequence or path != self.current_path:
+            return
+        self.file_list_ctrl.search_index = index
+
+    def _apply_file_list_page(self, path, files, total, is_first, is_last, load_id):
+        """在UI线程中追加一页文件列表，首页到达即可显示"""
+        if load_id != self._load_sequence or path != self.current_path:
+            # 过期的加载请求，忽略结果
+            return
+
+        if is_first:
+            self.file_list = files
+            # 只有一页时直接排序；有后续分页时保持服务器顺序，避免已显示的行在加载完成后移动
+            self.file_list_ctrl.load_files(files, apply_sort=is_last)
+            # 自动选择第一项（新目录首页到达时）
+            self._auto_select_first_item()
+        else:
+            self.file_list_ctrl.append_files(files)
+
+        if is_last:
+            if not is_first:
+                self.file_list_ctrl.finish_streaming()
+            self.file_list = self.file_list_ctrl.files
+            self._select_pending_name(final=True)
+            self.logger.info(f"已加载 {len(self.file_list)} 个项目，总计 {total} 个")  # 只记录日志
 
     def _apply_file_list_result(self, path, files, total, error, load_id):
         """在UI线程中应用文件列表加载结果"""
@@ -404,9 +717,10 @@ class FileManagerWindow(wx.Frame):
             message = f"加载文件列表失败: {error}"
             self.logger.error(message)  # 记录错误日志
 
-            # 清空文件列表显示空白
-            self.file_list = []
-            self.file_list_ctrl.load_files([])
+            # 已显示部分分页时保留现有内容，否则清空显示空白
+            if not total:
+                self.file_list = []
+                self.file_list_ctrl.load_files([])
 
             # 显示错误对话框，提供重试功能
             retry_callback = lambda: self._load_file_list()
@@ -419,36 +733,7 @@ class FileManagerWindow(wx.Frame):
 
         # 自动选择第一项（新目录加载完成时）
         self._auto_select_first_item()
-    def _format_file_size(self, size_bytes):
-        """格式化文件大小"""
-        if size_bytes == 0:
-            return "-"
-
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
-
-    def _format_date(self, date_str):
-        """格式化日期"""
-        if not date_str:
-            return "-"
-
-        try:
-            # 尝试解析ISO格式的日期
-            if 'T' in date_str:
-                # ISO格式: 2025-10-15T10:30:00Z
-                from datetime import datetime
-                dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                return dt.strftime("%Y-%m-%d %H:%M")
-            else:
-                return date_str
-        except:
-            return date_str
+        self._pending_select_name = None
 
     def _get_file_type(self, mime_type, filename=None):
         """根据MIME类型获取文件类型"""
@@ -525,13 +810,13 @@ class FileManagerWindow(wx.Frame):
         index = event.GetIndex()
         if index >= 0 and index < len(self.file_list):
             file_item = self.file_list[index]
-            if file_item["mime_type"] == "inode/directory":
+            if file_item.mime_type == "inode/directory":
                 # 进入文件夹
-                self.logger.info(f"进入文件夹: {file_item['name']}")
+                self.logger.info(f"进入文件夹: {file_item.name}")
                 self._navigate_to_folder(file_item)
             else:
                 # 打开文件
-                self.logger.info(f"打开文件: {file_item['name']}")
+                self.logger.info(f"打开文件: {file_item.name}")
                 self._open_file(file_item)
 
     def _navigate_to_folder(self, folder_item):
@@ -539,12 +824,13 @@ class FileManagerWindow(wx.Frame):
         try:
             # 保存当前状态到历史栈
             self._save_current_state_to_history()
+            self._pending_select_name = None
 
             # 构建新的路径
             if self.current_path == "/":
-                new_path = f"/{folder_item['name']}"
+                new_path = f"/{folder_item.name}"
             else:
-                new_path = f"{self.current_path}/{folder_item['name']}".replace("//", "/")
+                new_path = f"{self.current_path}/{folder_item.name}".replace("//", "/")
 
             self.logger.info(f"导航到路径: {new_path}")
             self.current_path = new_path
@@ -552,8 +838,9 @@ class FileManagerWindow(wx.Frame):
             # 更新窗口标题
             self.SetTitle(f"文件管理 - {self.server_info.get('name')} - {new_path}")
 
-            # 重新加载文件列表
-            self._load_file_list()
+            # 优先使用预取的列表，否则重新加载文件列表
+            if not self._show_prefetched_list(new_path):
+                self._load_file_list()
 
         except Exception as e:
             self.logger.error(f"文件夹导航失败: {e}")
@@ -562,10 +849,15 @@ class FileManagerWindow(wx.Frame):
     def _open_file(self, file_item):
         """打开文件 - 根据API返回的文件类型进行不同处理"""
         try:
-            self.logger.info(f"准备打开文件: {file_item['name']} (类型: {file_item['mime_type']})")
+            self.logger.info(f"准备打开文件: {file_item.name} (类型: {file_item.mime_type})")
+
+            # 播放列表文件：解析后按列表播放
+            if MediaFileDetector.is_playlist_file(file_item.name):
+                self._play_playlist_file(file_item)
+                return
 
             # 根据API返回的mime_type进行处理
-            mime_type = file_item['mime_type']
+            mime_type = file_item.mime_type
 
             if mime_type == 'audio':
                 # 音频文件：使用现有音频播放器
@@ -607,9 +899,10 @@ class FileManagerWindow(wx.Frame):
         """键盘事件处理"""
         key_code = event.GetKeyCode()
 
-        # 空格键 - 播放/暂停（仅在文件列表有焦点时生效）
+        # 空格键 - 播放/暂停（仅在文件列表有焦点时生效，正在输入查找时作为查找文字）
         if key_code == wx.WXK_SPACE and self.file_list_ctrl.HasFocus():
-            self._handle_space_key_playback()
+            if not self._route_to_type_ahead(' '):
+                self._handle_space_key_playback()
             return  # 不继续处理事件
 
         # 退格键 - 返回上级目录
@@ -617,9 +910,35 @@ class FileManagerWindow(wx.Frame):
             self._go_back()
             return  # 不继续处理事件
 
+        # 可打印字符 - 按名称、拼音或拼音首字母查找文件（仅在文件列表有焦点时生效）
+        if self.file_list_ctrl.HasFocus() and not (event.ControlDown() or event.AltDown()):
+            char = event.GetUnicodeKey()
+            if char != wx.WXK_NONE and chr(char).isprintable():
+                self._type_ahead(chr(char))
+                return  # 不交给原生控件逐行查找
+
         # 对于其他按键，让事件继续传播到快捷键处理
         event.Skip()
 
+    def _type_ahead(self, char):
+        """在文件列表中按输入的字符查找，没有匹配时提示音"""
+        if not self.file_list_ctrl.find_as_you_type(char):
+            wx.Bell()
+
+    def _route_to_type_ahead(self, char):
+        """
+        正在输入查找文字时，把O、空格等单键快捷键的字符交给查找
+
+        单键快捷键在EVT_CHAR之前由快捷键表处理，输入“zhou”时O会被当作“打开”。
+
+        Returns:
+            bool: 是否已作为查找文字处理
+        """
+        if not (self.file_list_ctrl.HasFocus() and self.file_list_ctrl.is_type_ahead_active()):
+            return False
+        self._type_ahead(char)
+        return True
+
     def on_main_key_down(self, event):
         """主窗口键盘事件处理"""
         key_code = event.GetKeyCode()
@@ -649,8 +968,8 @@ class FileManagerWindow(wx.Frame):
             self.file_list_ctrl.SetFocus()
 
             # 确保有选中项，如果没有则选中第一项
-            if self.file_list_ctrl.GetFirstSelected() == -1 and self.file_list_ctrl.GetItemCount() > 0:
-                self.file_list_ctrl.Select(0, True)
+            if self.file_list_ctrl.get_first_selected() == -1 and self.file_list_ctrl.GetItemCount() > 0:
+                self.file_list_ctrl.select_index(0)
 
             # 直接触发右键菜单
             self._show_context_menu_at_selection()
@@ -662,8 +981,8 @@ class FileManagerWindow(wx.Frame):
             self.file_list_ctrl.SetFocus()
 
             # 确保有选中项，如果没有则选中第一项
-            if self.file_list_ctrl.GetFirstSelected() == -1 and self.file_list_ctrl.GetItemCount() > 0:
-                self.file_list_ctrl.Select(0, True)
+            if self.file_list_ctrl.get_first_selected() == -1 and self.file_list_ctrl.GetItemCount() > 0:
+                self.file_list_ctrl.select_index(0)
 
             # 直接触发右键菜单
             self._show_context_menu_at_selection()
@@ -676,7 +995,7 @@ class FileManagerWindow(wx.Frame):
         """在当前选中项位置显示上下文菜单"""
         try:
             # 获取当前选中项
-            selected_index = self.file_list_ctrl.GetFirstSelected()
+            selected_index = self.file_list_ctrl.get_first_selected()
             if selected_index != -1:
                 # 获取选中项的位置
                 pos = self.file_list_ctrl.GetItemPosition(selected_index)
@@ -716,14 +1035,16 @@ class FileManagerWindow(wx.Frame):
 
                 self.logger.info(f"返回上级目录: {self.current_path} -> {new_path}")
                 self.current_path = new_path
+                self._pending_select_name = None
 
                 # 更新窗口标题
                 self.SetTitle(f"文件管理 - {self.server_info.get('name')} - {new_path}")
 
                 # 尝试从历史栈恢复状态
                 if not self._try_restore_from_history(new_path):
-                    # 历史栈中没有对应状态，重新加载
-                    self._load_file_list()
+                    # 历史栈中没有对应状态，使用预取结果或重新加载
+                    if not self._show_prefetched_list(new_path):
+                        self._load_file_list()
             else:
                 # 已经在根目录，显示提示
                 self.logger.info("已经在根目录")
@@ -736,9 +1057,10 @@ class FileManagerWindow(wx.Frame):
     def _save_current_state_to_history(self):
         """保存当前目录状态到历史栈"""
         if self.file_list:  # 只有当文件列表不为空时才保存
-            current_selected = self.file_list_ctrl.GetFirstSelected()
-            # 确保保存的是FileListCtrl中当前排序的文件列表
-            current_files = self.file_list_ctrl.files.copy()
+            current_selected = self.file_list_ctrl.get_first_selected()
+            # 保存FileListCtrl中当前排序的文件列表；进入新目录后控件会换用新列表，
+            # 此列表不再被修改，直接保存引用即可
+            current_files = self.file_list_ctrl.files
             history_entry = {
                 'path': self.current_path,
                 'files': current_files,
@@ -800,21 +1122,20 @@ class FileManagerWindow(wx.Frame):
                 self.file_list_ctrl.SetFocus()
                 return
 
-            for i in range(total):
-                self.file_list_ctrl.Select(i, on=(i == index))
-
+            # 只取消原选中行、选中新行，不逐行遍历整个列表
+            self.file_list_ctrl.select_index(index)
             if 0 <= index < total:
-                self.file_list_ctrl.Focus(index)
-                self.file_list_ctrl.EnsureVisible(index)
                 self.logger.debug(f"已选择文件列表项: {index}")
         except Exception as e:
             self.logger.debug(f"更新文件列表选中项失败: {e}")
 
     def _auto_select_first_item(self):
-        """自动选择第一项并设置焦点"""
+        """自动选择第一项并设置焦点（从搜索结果定位时选中目标文件）"""
+        if self._select_pending_name():
+            return
         if self.file_list and len(self.file_list) > 0:
             self._select_file_index(0)
-            self.logger.debug(f"已自动选择第一项: {self.file_list[0]['name']}")
+            self.logger.debug(f"已自动选择第一项: {self.file_list[0].name}")
         else:
             # 空目录，只设置焦点到列表控件
             self.file_list_ctrl.SetFocus()
@@ -823,7 +1144,7 @@ class FileManagerWindow(wx.Frame):
     def _play_media_file(self, file_item):
         """播放媒体文件"""
         try:
-            self.logger.info(f"开始播放媒体文件: {file_item['name']}")
+            self.logger.info(f"开始播放媒体文件: {file_item.name}")
             # 不再更新状态栏，状态栏仅用于音频播放器控制器
 
             # 构建文件URL（用于播放器）
@@ -846,21 +1167,27 @@ class FileManagerWindow(wx.Frame):
             # 不再更新状态栏，状态栏仅用于音频播放器控制器
             wx.MessageBox(f"播放媒体文件失败: {e}", "播放错误", wx.OK | wx.ICON_ERROR)
 
-    def _build_file_url(self, file_item):
-        """构建文件URL - 使用AList签名下载格式"""
+    def _build_file_url(self, file_item, parent_path=None):
+        """构建文件URL - 使用AList签名下载格式
+
+        Args:
+            file_item: 文件条目
+            parent_path: 文件所在目录，默认为当前浏览路径
+        """
         try:
             import urllib.parse
 
-            # 构建文件路径：使用用户当前浏览路径 + 文件名
-            if self.current_path == "/":
-                file_path = f"/{file_item['name']}"
+            # 构建文件路径：使用文件所在目录 + 文件名
+            parent_path = parent_path or self.current_path
+            if parent_path == "/":
+                file_path = f"/{file_item.name}"
             else:
-                file_path = f"{self.current_path}/{file_item['name']}"
+                file_path = f"{parent_path}/{file_item.name}"
 
             self.logger.debug(f"构建文件URL，文件路径: {file_path}")
 
             # 获取签名信息
-            sign = file_item.get('sign', '')
+            sign = file_item.sign
 
             if sign:
                 # 使用签名构建下载URL
@@ -907,22 +1234,18 @@ class FileManagerWindow(wx.Frame):
                 # 构建最终URL：http://server:port/d/encoded_path?sign=signature
                 final_url = f"{base_url}/d/{encoded_path}?sign={sign}"
 
-                self.logger.debug(f"构建的签名URL: {final_url}")
-                print(f"[URL构建] 使用签名URL: {final_url}")
+                trace_event("构建签名URL: %s", redact_url(final_url))
                 return final_url
             else:
                 # 没有签名，回退到API客户端方法
                 self.logger.debug(f"没有签名信息，使用API客户端方法")
-                print(f"[URL构建] 没有签名，使用API客户端方法")
 
                 try:
                     media_url = self.client.get_media_url(file_path)
-                    self.logger.debug(f"API返回的媒体URL: {media_url}")
-                    print(f"[URL构建] API返回URL: {media_url}")
+                    trace_event("API返回的媒体URL: %s", redact_url(media_url))
                     return media_url
                 except Exception as api_error:
                     self.logger.warning(f"API获取URL失败，回退到手动构建: {api_error}")
-                    print(f"[URL构建] API获取失败，回退到手动构建")
 
                     # 最后的回退：直接URL
                     server_url = self.server_info.get('url', '').rstrip('/')
@@ -935,13 +1258,12 @@ class FileManagerWindow(wx.Frame):
                     else:
                         full_url = f"{server_url}{file_path}"
 
-                    print(f"[URL构建] 手动构建URL: {full_url}")
+                    trace_event("手动构建URL: %s", redact_url(full_url))
                     return full_url
 
         except Exception as e:
             self.logger.error(f"构建文件URL失败: {e}")
-            print(f"[URL构建] 构建失败: {e}")
-            return file_item.get('name', '')
+            return file_item.name
 
     # 菜单事件处理
     def on_switch_server(self, event):
@@ -949,8 +1271,10 @@ class FileManagerWindow(wx.Frame):
         self.switch_server()
 
     def on_refresh(self, event):
-        """刷新文件列表"""
-        self._load_file_list()
+        """刷新文件列表（跳过缓存，强制从服务器获取）"""
+        if self._prefetcher:
+            self._prefetcher.discard(self.current_path)
+        self._load_file_list(force_refresh=True)
 
     def on_exit(self, event):
         """退出程序"""
@@ -965,7 +1289,7 @@ class FileManagerWindow(wx.Frame):
         """复制文件名"""
         selected_items = self.file_list_ctrl.get_selected_items()
         if selected_items:
-            names = [item["name"] for item in selected_items]
+            names = [item.name for item in selected_items]
             text = "\n".join(names)
             if wx.TheClipboard.Open():
                 wx.TheClipboard.SetData(wx.TextDataObject(text))
@@ -978,7 +1302,7 @@ class FileManagerWindow(wx.Frame):
         """复制路径"""
         selected_items = self.file_list_ctrl.get_selected_items()
         if selected_items:
-            paths = [item["path"] for item in selected_items]
+            paths = [item.path for item in selected_items]
             text = "\n".join(paths)
             if wx.TheClipboard.Open():
                 wx.TheClipboard.SetData(wx.TextDataObject(text))
@@ -1034,6 +1358,65 @@ class FileManagerWindow(wx.Frame):
         """复制文件名快捷键"""
         self.on_copy_name(event)
 
+    def on_search(self, event):
+        """打开搜索对话框（已打开时切换过去）"""
+        try:
+            if not self._search_dialog:
+                self._search_dialog = SearchDialog(
+                    self,
+                    self.client,
+                    max_workers=self.server_info.get('search_workers', 4)
+                )
+            self._search_dialog.focus_query()
+        except Exception as e:
+            self.logger.error(f"打开搜索对话框失败: {e}")
+            wx.MessageBox(f"打开搜索对话框失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
+
+    def locate_file(self, file_path):
+        """进入文件所在目录并选中该文件（从搜索结果定位）"""
+        parent_path, _, name = file_path.rstrip('/').rpartition('/')
+        parent_path = parent_path or "/"
+
+        if parent_path == self.current_path:
+            index = self.media_index.index_of(name)
+            if index >= 0:
+                self._select_file_index(index)
+                self.file_list_ctrl.SetFocus()
+                return
+
+        self.logger.info(f"定位到文件: {file_path}")
+        # 跳转不是逐级进入，历史栈中的状态不再对应上级目录
+        self._navigation_history.clear()
+        self._pending_select_name = name
+        self.current_path = parent_path
+        self.SetTitle(f"文件管理 - {self.server_info.get('name')} - {parent_path}")
+
+        if not self._show_prefetched_list(parent_path):
+            self._load_file_list()
+        self.file_list_ctrl.SetFocus()
+
+    def _select_pending_name(self, final=False):
+        """
+        选中从搜索结果定位的文件
+
+        Args:
+            final: 目录已全部加载，未找到时也不再等待
+
+        Returns:
+            bool: 是否已选中
+        """
+        name = self._pending_select_name
+        if name is None:
+            return False
+
+        index = self.media_index.index_of(name)
+        if index >= 0 or final:
+            self._pending_select_name = None
+        if index < 0:
+            return False
+        self._select_file_index(index)
+        return True
+
     def on_copy_path_hotkey(self, event):
         """复制路径快捷键"""
         self.on_copy_path(event)
@@ -1064,6 +1447,8 @@ class FileManagerWindow(wx.Frame):
 
     def on_open_hotkey(self, event):
         """打开快捷键"""
+        if self._route_to_type_ahead('o'):
+            return
         selected_items = self.file_list_ctrl.get_selected_items()
         if selected_items:
             self.on_context_open(selected_items[0])
@@ -1117,9 +1502,39 @@ class FileManagerWindow(wx.Frame):
             if hasattr(self, 'audio_controller'):
                 self.audio_controller.cleanup()
 
+            # 关闭搜索及文件夹信息对话框（停止正在进行的搜索和统计）
+            if self._search_dialog:
+                self._search_dialog.Close()
+            for dialog in self._folder_info_dialogs:
+                if dialog:
+                    dialog.Close()
+
             # 关闭客户端连接
             if self.client:
                 self.client.close()
+
+            # 取消未完成的下载（已下载部分保留用于续传）
+            if self.download_manager:
+                self.download_manager.shutdown()
+            if self._media_cache_downloader:
+                self._media_cache_downloader.shutdown()
+
+            # 停止媒体元数据探测
+            if self._metadata_refresh:
+                self._metadata_refresh.close()
+            if self._metadata_prober:
+                self._metadata_prober.close()
+
+            # 停止目录预取
+            if self._prefetch_timer:
+                self._prefetch_timer.Stop()
+            if self._prefetcher:
+                self._prefetcher.close()
+
+            # 关闭目录缓存，保存拼音排序键
+            self.directory_cache.close()
+            self._pinyin_keys.save()
+            self._pinyin_initials.save()
         except:
             pass
 
@@ -1128,22 +1543,22 @@ class FileManagerWindow(wx.Frame):
     # 右键菜单事件处理
     def on_context_open(self, file_item):
         """右键菜单：打开文件或文件夹"""
-        if file_item["mime_type"] == "inode/directory":
+        if file_item.mime_type == "inode/directory":
             # 进入文件夹
-            self.logger.info(f"右键进入文件夹: {file_item['name']}")
+            self.logger.info(f"右键进入文件夹: {file_item.name}")
             self._navigate_to_folder(file_item)
         else:
             # 打开文件
-            self.logger.info(f"右键打开文件: {file_item['name']}")
+            self.logger.info(f"右键打开文件: {file_item.name}")
             self._open_file(file_item)
 
     def on_context_play_media(self, file_item):
         """右键菜单：播放媒体文件"""
         try:
-            if MediaFileDetector.is_media_file(file_item['name']):
+            if MediaFileDetector.is_media_file(file_item.name):
                 self._play_media_file(file_item)
             else:
-                wx.MessageBox(f"这不是媒体文件: {file_item['name']}", "提示", wx.OK | wx.ICON_INFORMATION)
+                wx.MessageBox(f"这不是媒体文件: {file_item.name}", "提示", wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
             self.logger.error(f"播放媒体文件失败: {e}")
             wx.MessageBox(f"播放失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
@@ -1156,9 +1571,9 @@ class FileManagerWindow(wx.Frame):
 
             # 构建完整的文件URL：使用用户当前浏览路径 + 文件名
             if self.current_path == "/":
-                file_path = f"/{file_item['name']}"
+                file_path = f"/{file_item.name}"
             else:
-                file_path = f"{self.current_path}/{file_item['name']}"
+                file_path = f"{self.current_path}/{file_item.name}"
 
             # 构建完整的URL，包含端口
             server_url = self.server_info.get('url', '').rstrip('/')
@@ -1179,7 +1594,7 @@ class FileManagerWindow(wx.Frame):
             webbrowser.open(encoded_url)
 
             # 不再更新状态栏，状态栏仅用于音频信息
-            self.logger.info(f"已在浏览器中打开: {file_item['name']}")
+            self.logger.info(f"已在浏览器中打开: {file_item.name}")
 
         except Exception as e:
             self.logger.error(f"网页打开失败: {e}")
@@ -1187,34 +1602,45 @@ class FileManagerWindow(wx.Frame):
 
     def on_context_view_info(self, file_item):
         """右键菜单：查看文件详细信息"""
+        if file_item.is_dir:
+            self._show_folder_info(file_item)
+            return
+
         try:
             # 构建详细信息文本
-            info_text = f"文件名: {file_item['name']}\n"
-            info_text += f"大小: {file_item['size']}\n"
-            info_text += f"修改时间: {file_item['date']}\n"
+            info_text = f"文件名: {file_item.name}\n"
+            info_text += f"大小: {file_item.size_text}\n"
+            info_text += f"修改时间: {file_item.date_text}\n"
 
-            if file_item["path"]:
-                info_text += f"路径: {file_item['path']}\n"
+            if file_item.path:
+                info_text += f"路径: {file_item.path}\n"
             else:
                 if self.current_path == "/":
-                    info_text += f"路径: /{file_item['name']}\n"
+                    info_text += f"路径: /{file_item.name}\n"
                 else:
-                    info_text += f"路径: {self.current_path}/{file_item['name']}\n"
+                    info_text += f"路径: {self.current_path}/{file_item.name}\n"
 
-            info_text += f"文件类型: {file_item['mime_type']}\n"
-            info_text += f"文件ID: {file_item.get('id', 'N/A')}\n"
+            info_text += f"文件类型: {file_item.mime_type}\n"
+            info_text += f"文件ID: {file_item.id or 'N/A'}\n"
 
-            # 如果是文件夹，添加特殊说明
-            if file_item["mime_type"] == "inode/directory":
-                info_text += "\n这是一个文件夹"
-            else:
-                info_text += "\n这是一个文件"
+            # 已探测到的音视频元数据
+            media_info = file_item.media_info or {}
+            if media_info.get('duration'):
+                info_text += f"时长: {file_item.duration_text}\n"
+            if media_info.get('bitrate'):
+                info_text += f"码率: {media_info['bitrate'] // 1000} kbps\n"
+            if media_info.get('title'):
+                info_text += f"标题: {media_info['title']}\n"
+            if media_info.get('artist'):
+                info_text += f"艺术家: {media_info['artist']}\n"
+
+            info_text += "\n这是一个文件"
 
             # 显示详细信息对话框
             dlg = wx.MessageDialog(
                 self,
                 info_text,
-                f"文件详细信息 - {file_item['name']}",
+                f"文件详细信息 - {file_item.name}",
                 wx.OK | wx.ICON_INFORMATION
             )
             dlg.ShowModal()
@@ -1224,25 +1650,169 @@ class FileManagerWindow(wx.Frame):
             self.logger.error(f"查看文件信息失败: {e}")
             wx.MessageBox(f"查看文件信息失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
 
+    def _show_folder_info(self, folder_item):
+        """打开文件夹信息对话框，在后台递归统计文件数、总大小和音视频时长"""
+        try:
+            folder_path = self._audio_position_key(folder_item)[1]
+            dialog = FolderInfoDialog(
+                self,
+                self.client,
+                folder_item,
+                folder_path,
+                on_listed=self._make_walk_cache_writer(),
+                metadata_cache=self._metadata_prober.cache if self._metadata_prober else None,
+                max_workers=self.server_info.get('walk_workers', 4)
+            )
+            self._folder_info_dialogs = [d for d in self._folder_info_dialogs if d]
+            self._folder_info_dialogs.append(dialog)
+            dialog.Show()
+        except Exception as e:
+            self.logger.error(f"查看文件夹信息失败: {e}")
+            wx.MessageBox(f"查看文件夹信息失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
+
     def on_context_batch_download(self, selected_items):
-        """右键菜单：批量下载"""
+        """右键菜单：批量下载选中的文件或文件夹"""
         try:
-            # 暂时显示开发中提示
-            file_names = [item['name'] for item in selected_items]
-            files_text = "\n".join(file_names[:5])  # 只显示前5个文件名
-            if len(file_names) > 5:
-                files_text += f"\n... 等共{len(file_names)}个文件"
-
-            wx.MessageBox(
-                f"选中的文件:\n{files_text}\n\n批量下载功能正在开发中，敬请期待！",
-                "批量下载",
-                wx.OK | wx.ICON_INFORMATION
+            dialog = wx.DirDialog(
+                self,
+                "选择下载保存位置",
+                defaultPath=self._download_dir,
+                style=wx.DD_DEFAULT_STYLE | wx.DD_DIR_MUST_EXIST
+            )
+            if dialog.ShowModal() != wx.ID_OK:
+                dialog.Destroy()
+                return
+            target_dir = dialog.GetPath()
+            dialog.Destroy()
+            self._download_dir = target_dir
+
+            worker = threading.Thread(
+                target=self._batch_download_worker,
+                args=(list(selected_items), self.current_path, target_dir),
+                daemon=True,
             )
+            worker.start()
 
         except Exception as e:
             self.logger.error(f"批量下载失败: {e}")
             wx.MessageBox(f"批量下载失败: {e}", "错误", wx.OK | wx.ICON_ERROR)
 
+    def _get_download_manager(self):
+        """获取下载管理器（按需创建，并发数和限速取自服务器配置）"""
+        if self.download_manager is None:
+            self.download_manager = DownloadManager(
+                self.client.session,
+                max_workers=self.server_info.get('download_workers', 3),
+                bandwidth=self._download_bandwidth
+            )
+        return self.download_manager
+
+    def _batch_download_worker(self, items, parent_path, target_dir):
+        """后台线程：展开文件夹、构建下载链接并添加下载任务"""
+        manager = self._get_download_manager()
+        task_ids = []
+        error = None
+
+        try:
+            for file_item, item_parent, local_dir in self._iter_download_files(items, parent_path, target_dir):
+                url = self._build_file_url(file_item, parent_path=item_parent)
+                task_ids.append(manager.add(
+                    url,
+                    os.path.join(local_dir, safe_local_name(file_item.name)),
+                    name=file_item.name,
+                    size=file_item.size or None
+                ))
+        except Exception as exc:
+            error = exc
+            self.logger.error(f"准备下载任务失败: {exc}")
+
+        wx.CallAfter(self._show_download_progress, task_ids, error)
+
+    def _iter_download_files(self, items, parent_path, local_dir):
+        """递归展开要下载的文件
+
+        Yields:
+            (文件条目, 文件所在目录, 本地保存目录)
+        """
+        for file_item in items:
+            if file_item.is_dir:
+                folder_path = f"{parent_path.rstrip('/')}/{file_item.name}"
+                children = self.client.get_file_list(folder_path).get('files', [])
+                yield from self._iter_download_files(
+                    children,
+                    folder_path,
+                    os.path.join(local_dir, safe_local_name(file_item.name))
+                )
+            else:
+                yield file_item, parent_path, local_dir
+
+    def _show_download_progress(self, task_ids, error=None):
+        """显示批量下载进度，定时刷新直到全部任务结束"""
+        if not task_ids:
+            if error is not None:
+                wx.MessageBox(f"批量下载失败: {error}", "错误", wx.OK | wx.ICON_ERROR)
+            else:
+                wx.MessageBox("没有可下载的文件", "批量下载", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        manager = self.download_manager
+        dialog = wx.ProgressDialog(
+            "批量下载",
+            f"正在下载 {len(task_ids)} 个文件...",
+            maximum=1000,
+            parent=self,
+            style=wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME | wx.PD_REMAINING_TIME | wx.PD_SMOOTH
+        )
+        timer = wx.Timer(self)
+        cancelled = []
+
+        def on_timer(event):
+            progress = manager.get_overall_progress(task_ids)
+
+            if progress['finished'] >= progress['total']:
+                timer.Stop()
+                self.Unbind(wx.EVT_TIMER, handler=on_timer, source=timer)
+                dialog.Destroy()
+                self._show_download_summary(progress, error, bool(cancelled))
+                return
+
+            if cancelled:
+                return
+
+            message = f"已完成 {progress['finished']}/{progress['total']} 个文件"
+            message += f"，{format_file_size(progress['downloaded'])}"
+            if progress['size']:
+                message += f" / {format_file_size(progress['size'])}"
+            if progress['speed']:
+                message += f"，{format_file_size(int(progress['speed']))}/秒"
+            if progress['running']:
+                message += f"\n正在下载: {progress['running'][0]}"
+
+            value = int((progress['percent'] or 0) * 10)
+            keep_going, _ = dialog.Update(min(value, 999), message)
+            if not keep_going:
+                cancelled.append(True)
+                for task_id in task_ids:
+                    manager.cancel(task_id)
+                self.logger.info("用户取消了批量下载")
+
+        self.Bind(wx.EVT_TIMER, on_timer, timer)
+        timer.Start(500)
+
+    def _show_download_summary(self, progress, error=None, cancelled=False):
+        """显示批量下载结果"""
+        if cancelled:
+            message = f"下载已取消，已完成 {progress['completed']} 个文件。\n未完成的文件再次下载时将继续传输。"
+        else:
+            message = f"下载完成: 成功 {progress['completed']} 个"
+            if progress['failed']:
+                message += f"，失败 {progress['failed']} 个"
+        if error is not None:
+            message += f"\n\n部分文件未能加入下载: {error}"
+
+        icon = wx.ICON_WARNING if (progress['failed'] or error is not None) else wx.ICON_INFORMATION
+        wx.MessageBox(message, "批量下载", wx.OK | icon)
+
     # 音频播放相关方法
     def _handle_space_key_playback(self):
         """处理空格键播放/暂停"""
@@ -1264,6 +1834,8 @@ class FileManagerWindow(wx.Frame):
 
     def on_space_hotkey(self, event):
         """空格键全局播放/暂停"""
+        if self._route_to_type_ahead(' '):
+            return
         self.logger.info("空格键播放/暂停快捷键被触发")
         self._handle_space_key_playback()
 
@@ -1356,26 +1928,20 @@ class FileManagerWindow(wx.Frame):
                     # 优先使用最后通过回车键选择的文件
                     target_file = self._last_selected_file
                     # 在文件列表中找到这个文件的索引
-                    for idx, item in enumerate(self.file_list):
-                        if item['name'] == target_file['name']:
-                            target_index = idx
-                            break
-                    self.logger.info(f"恢复播放最后选择的文件: {target_file['name']}")
+                    target_index = self.media_index.index_of(target_file.name)
+                    self.logger.info(f"恢复播放最后选择的文件: {target_file.name}")
                 else:
                     # 没有最后选择的文件，播放列表中的第一个音频文件
-                    for idx, item in enumerate(self.file_list):
-                        if MediaFileDetector.is_media_file(item['name']):
-                            media_type = MediaFileDetector.get_media_type(item['name'])
-                            if media_type == 'audio':
-                                target_file = item
-                                target_index = idx
-                                break
+                    first_index = self.media_index.first('audio')
+                    if first_index is not None:
+                        target_file = self.file_list[first_index]
+                        target_index = first_index
                     if target_file:
-                        self.logger.info(f"自动播放第一个音频文件: {target_file['name']}")
+                        self.logger.info(f"自动播放第一个音频文件: {target_file.name}")
 
                 if target_file:
-                    file_url = self._build_file_url(target_file)
-                    self.audio_controller.play_file(file_url, target_file['name'])
+                    file_url = self._build_audio_source(target_file)
+                    self._play_folder_audio(target_file, file_url)
                     if target_index >= 0:
                         self._select_file_index(target_index)
                 else:
@@ -1393,17 +1959,18 @@ class FileManagerWindow(wx.Frame):
 
             if selected_items and len(selected_items) == 1:
                 file_item = selected_items[0]
+                media_type = self.media_index.media_type(file_item)
 
-                if MediaFileDetector.is_media_file(file_item['name']):
-                    media_type = MediaFileDetector.get_media_type(file_item['name'])
-
+                if media_type:
                     if media_type == 'audio':
-                        file_url = self._build_file_url(file_item)
+                        file_url = self._build_audio_source(file_item)
                         current_url = getattr(self.audio_controller, 'current_file', None)
                         if current_url and current_url == file_url:
                             self.audio_controller.play_pause()
                         else:
-                            self.audio_controller.play_file(file_url, file_item['name'])
+                            self._play_folder_audio(file_item, file_url)
+                    elif media_type == 'playlist':
+                        self._play_playlist_file(file_item)
                     else:
                         wx.MessageBox("只能播放音频文件", "提示", wx.OK | wx.ICON_INFORMATION)
                 else:
@@ -1415,19 +1982,12 @@ class FileManagerWindow(wx.Frame):
                     self.audio_controller.play_pause()
                 else:
                     # 没有播放文件，自动播放列表中的第一个音频文件
-                    first_audio = None
-                    first_index = -1
-                    for idx, item in enumerate(self.file_list):
-                        if MediaFileDetector.is_media_file(item['name']):
-                            media_type = MediaFileDetector.get_media_type(item['name'])
-                            if media_type == 'audio':
-                                first_audio = item
-                                first_index = idx
-                                break
+                    first_index = self.media_index.first('audio')
+                    first_audio = self.file_list[first_index] if first_index is not None else None
 
                     if first_audio:
-                        file_url = self._build_file_url(first_audio)
-                        self.audio_controller.play_file(file_url, first_audio['name'])
+                        file_url = self._build_audio_source(first_audio)
+                        self._play_folder_audio(first_audio, file_url)
                         self._select_file_index(first_index)
                     else:
                         self.logger.info("当前目录没有音频文件")
@@ -1447,40 +2007,25 @@ class FileManagerWindow(wx.Frame):
                 self._play_first_audio_file()
                 return
 
-            # 查找当前文件在列表中的索引
-            current_index = -1
-            audio_files = []  # 当前目录的所有音频文件
-
-            for i, file_item in enumerate(self.file_list):
-                if MediaFileDetector.is_media_file(file_item['name']):
-                    media_type = MediaFileDetector.get_media_type(file_item['name'])
-                    if media_type == 'audio':
-                        audio_files.append((i, file_item))
-                        if file_item['name'] == current_filename:
-                            current_index = len(audio_files) - 1
+            # 正在播放播放列表文件中的曲目，按播放列表切换
+            if self._is_playing_playlist(current_filename):
+                self._play_playlist_step(-1)
+                return
 
-            if not audio_files:
+            media_index = self.media_index
+            if not media_index.count('audio'):
                 self.logger.info("当前目录没有音频文件")
                 return
 
-            if current_index > 0:
-                # 播放上一个音频文件
-                prev_index, prev_file = audio_files[current_index - 1]
-                file_url = self._build_file_url(prev_file)
-                self.audio_controller.play_file(file_url, prev_file['name'])
-                self._select_file_index(prev_index)
-            elif current_index == 0:
-                # 已经是第一个，播放最后一个
-                last_index, last_file = audio_files[-1]
-                file_url = self._build_file_url(last_file)
-                self.audio_controller.play_file(file_url, last_file['name'])
-                self._select_file_index(last_index)
-            else:
-                # 没找到当前文件，播放第一个
-                first_index, first_file = audio_files[0]
-                file_url = self._build_file_url(first_file)
-                self.audio_controller.play_file(file_url, first_file['name'])
-                self._select_file_index(first_index)
+            # 循环切换上一个音频文件；没找到当前文件时播放第一个
+            target_index = media_index.neighbor(current_filename, -1)
+            if target_index is None:
+                target_index = media_index.first('audio')
+
+            target_file = self.file_list[target_index]
+            file_url = self._build_audio_source(target_file)
+            self._play_folder_audio(target_file, file_url)
+            self._select_file_index(target_index)
 
         except Exception as e:
             self.logger.error(f"播放上一个音频文件失败: {e}")
@@ -1495,55 +2040,326 @@ class FileManagerWindow(wx.Frame):
                 self._play_first_audio_file()
                 return
 
-            # 查找当前文件在列表中的索引
-            current_index = -1
-            audio_files = []  # 当前目录的所有音频文件
-
-            for i, file_item in enumerate(self.file_list):
-                if MediaFileDetector.is_media_file(file_item['name']):
-                    media_type = MediaFileDetector.get_media_type(file_item['name'])
-                    if media_type == 'audio':
-                        audio_files.append((i, file_item))
-                        if file_item['name'] == current_filename:
-                            current_index = len(audio_files) - 1
+            # 正在播放播放列表文件中的曲目，按播放列表切换
+            if self._is_playing_playlist(current_filename):
+                self._play_playlist_step(1)
+                return
 
-            if not audio_files:
+            media_index = self.media_index
+            if not media_index.count('audio'):
                 self.logger.info("当前目录没有音频文件")
                 return
 
-            if current_index >= 0 and current_index < len(audio_files) - 1:
-                # 播放下一个音频文件
-                next_index, next_file = audio_files[current_index + 1]
-                file_url = self._build_file_url(next_file)
-                self.audio_controller.play_file(file_url, next_file['name'])
-                self._select_file_index(next_index)
-            elif current_index == len(audio_files) - 1:
-                # 已经是最后一个，播放第一个
-                first_index, first_file = audio_files[0]
-                file_url = self._build_file_url(first_file)
-                self.audio_controller.play_file(file_url, first_file['name'])
-                self._select_file_index(first_index)
-            else:
-                # 没找到当前文件，播放第一个
-                first_index, first_file = audio_files[0]
-                file_url = self._build_file_url(first_file)
-                self.audio_controller.play_file(file_url, first_file['name'])
-                self._select_file_index(first_index)
+            # 循环切换下一个音频文件；没找到当前文件时播放第一个
+            target_index = media_index.neighbor(current_filename, 1)
+            if target_index is None:
+                target_index = media_index.first('audio')
+
+            target_file = self.file_list[target_index]
+            file_url = self._build_audio_source(target_file)
+            self._play_folder_audio(target_file, file_url)
+            self._select_file_index(target_index)
 
         except Exception as e:
             self.logger.error(f"播放下一个音频文件失败: {e}")
 
+    def _get_media_cache_downloader(self):
+        """获取音频缓存使用的下载管理器（按需创建，与批量下载分开，但共用限速器）"""
+        if self._media_cache_downloader is None:
+            self._media_cache_downloader = DownloadManager(
+                self.client.session,
+                max_workers=2,
+                bandwidth=self._download_bandwidth
+            )
+        return self._media_cache_downloader
+
+    def _probe_media_metadata(self, entries):
+        """探测文件列表中可见的音视频文件（由列表控件绘制时触发）"""
+        items = [(self._audio_position_key(entry)[1], entry) for entry in entries]
+        self._metadata_prober.probe(items)
+
+        # 命中缓存的条目已立即填入时长，重绘一次即可显示
+        if any(entry.media_info is not None for entry in entries):
+            self.file_list_ctrl.refresh_visible_items()
+
+    def _build_metadata_url(self, entry, path):
+        """生成元数据探测使用的地址（在探测线程中调用）"""
+        return self._build_file_url(entry, path.rsplit('/', 1)[0] or "/")
+
+    def _on_media_metadata_probed(self, entry):
+        """探测线程：合并刷新请求，由UI线程重绘可见行"""
+        self._metadata_refresh.post()
+
+    def _refresh_probed_items(self, _=None):
+        """UI线程：重绘可见行以显示新探测到的时长"""
+        self.file_list_ctrl.refresh_visible_items()
+
+    @property
+    def media_index(self):
+        """当前文件列表的媒体类型索引（随列表加载和排序更新）"""
+        return self.file_list_ctrl.media_index
+
+    def _audio_position_key(self, file_item, parent_path=None):
+        """音频在服务器上的标识 (服务器, 路径)，用于本地缓存和播放位置记录"""
+        parent_path = parent_path or self.current_path
+        if parent_path == "/":
+            return self.client.server_key, f"/{file_item.name}"
+        return self.client.server_key, f"{parent_path}/{file_item.name}"
+
+    def _audio_cache_key(self, file_item, parent_path=None):
+        """音频的缓存键 (服务器, 路径, 大小, 修改时间)"""
+        server_key, remote_path = self._audio_position_key(file_item, parent_path)
+        return server_key, remote_path, file_item.size, file_item.modified_time
+
+    def _build_audio_source(self, file_item, parent_path=None):
+        """
+        获取音频播放地址：已完整缓存时返回本地文件，否则返回远程URL
+
+        Args:
+            file_item: 文件条目
+            parent_path: 文件所在目录，默认为当前浏览路径
+        """
+        if self.media_cache is not None:
+            local_path = self.media_cache.lookup(*self._audio_cache_key(file_item, parent_path))
+            if local_path:
+                self.logger.info(f"使用本地缓存播放: {file_item.name}")
+                return local_path
+
+        return self._build_file_url(file_item, parent_path=parent_path)
+
+    def _is_remote_source(self, source):
+        """播放地址是否为远程URL（而非本地缓存文件）"""
+        return self.media_cache is not None and source.startswith(('http://', 'https://'))
+
+    def _flush_audio_cache_fill(self):
+        """上一首已播放结束或被切换，开始把它下载到缓存"""
+        pending, self._deferred_cache_fill = self._deferred_cache_fill, None
+        if pending is not None:
+            file_url, cache_key = pending
+            self.media_cache.fill(self._get_media_cache_downloader(), file_url, *cache_key)
+
+    def _play_folder_audio(self, file_item, source):
+        """播放当前目录中的音频，并记录目录列表供自动切换下一首使用"""
+        # 同一目录列表未变化时沿用已记录的快照，逐首播放不再复制整个列表
+        folder = self._audio_folder
+        if folder is None or not folder.matches(self.current_path, self.media_index):
+            self._audio_folder = _AudioFolder(self.current_path, self.file_list_ctrl.files, self.media_index)
+        # VLC正在流式读取远程文件，缓存下载推迟到这首播放结束，避免同一文件同时下载两遍
+        self._flush_audio_cache_fill()
+        if self._is_remote_source(source):
+            self._deferred_cache_fill = (source, self._audio_cache_key(file_item))
+        self.audio_controller.play_file(source, file_item.name, self._audio_position_key(file_item))
+
+    def _resolve_next_audio_track(self, current_filename):
+        """
+        查找正在播放的目录（或播放列表）中下一首音频并生成播放地址（在预加载线程中调用）
+
+        使用开始播放时记录的目录列表，播放期间浏览其他目录不影响曲目顺序。
+
+        开启音频缓存预取（media_cache_prefetch）时，同时把之后的若干首下载到本地缓存。
+
+        Returns:
+            tuple: (播放地址, 文件名, 播放位置键)，已是最后一首或找不到当前文件时返回None
+        """
+        if self._is_playing_playlist(current_filename):
+            next_item = self.playlist_manager.peek_next()
+            if next_item is None:
+                return None
+            source, position_key = self._resolve_playlist_source(next_item)
+            return source, next_item.display_name, position_key
+
+        folder = self._audio_folder
+        if folder is None:
+            return None
+
+        prefetch_count = self.server_info.get('media_cache_prefetch', 0) if self.media_cache else 0
+
+        upcoming = [
+            folder.files[index]
+            for index in folder.media_index.upcoming(current_filename, max(1, prefetch_count))
+            if index < len(folder.files)
+        ]
+
+        if not upcoming:
+            return None
+
+        # 之后的曲目现在就下载到缓存；下一首马上要流式播放，播放结束后再缓存
+        for file_item in upcoming[1:]:
+            source = self._build_audio_source(file_item, parent_path=folder.path)
+            if self._is_remote_source(source):
+                self.media_cache.fill(self._get_media_cache_downloader(), source,
+                                      *self._audio_cache_key(file_item, folder.path))
+
+        next_item = upcoming[0]
+        source = self._build_audio_source(next_item, parent_path=folder.path)
+        self._queued_cache_fill = None
+        if self._is_remote_source(source):
+            self._queued_cache_fill = (next_item.name, source, self._audio_cache_key(next_item, folder.path))
+        return source, next_item.name, self._audio_position_key(next_item, folder.path)
+
+    def _on_audio_track_changed(self, filename):
+        """自动切换到下一首后同步列表选中项（仍在播放的目录中时）"""
+        # 上一首已播放结束，开始缓存它；记下新曲目，等它播放结束后再缓存
+        queued, self._queued_cache_fill = self._queued_cache_fill, None
+        self._flush_audio_cache_fill()
+        if queued is not None and queued[0] == filename:
+            self._deferred_cache_fill = queued[1:]
+
+        next_item = self.playlist_manager.peek_next()
+        if next_item is not None and next_item.display_name == filename:
+            # 播放列表中的曲目，只推进播放列表位置
+            self.playlist_manager.next_track()
+            return
+
+        folder = self._audio_folder
+        if folder is None or folder.path != self.current_path:
+            return
+
+        index = self.media_index.index_of(filename)
+        if index != -1:
+            self._select_file_index(index)
+
+    def _play_playlist_file(self, file_item):
+        """流式加载播放列表文件，解析出第一批条目后立即开始播放"""
+        self._playlist_sequence += 1
+        sequence = self._playlist_sequence
+        self.playlist_manager.clear_playlist()
+
+        playlist_url = self._build_file_url(file_item)
+        playlist_path = self._audio_position_key(file_item)[1]
+        base_path = (self.client.user_info or {}).get('base_path')
+
+        self.logger.info(f"加载播放列表: {file_item.name}")
+        threading.Thread(
+            target=self._load_playlist_worker,
+            args=(sequence, playlist_url, file_item.name, playlist_path, base_path),
+            name="PlaylistLoader",
+            daemon=True
+        ).start()
+
+    def _load_playlist_worker(self, sequence, playlist_url, filename, playlist_path, base_path):
+        """后台线程：边下载边解析播放列表，分批交给UI线程
+
+        音频播放器只能播放音频文件和网络音频流，视频等其他条目跳过并在加载完成后告知用户
+        """
+        total = 0
+        skipped = 0
+        try:
+            for entries in iter_remote_playlist(self.client.session, playlist_url, filename):
+                if sequence != self._playlist_sequence:
+                    # 已经打开了别的播放列表
+                    return
+
+                items = []
+                for entry in entries:
+                    location = resolve_playlist_location(entry.location, playlist_path, base_path)
+                    if not location:
+                        continue
+                    if not MediaFileDetector.is_playable_audio(location):
+                        skipped += 1
+                        continue
+                    items.append(PlaylistItem(location, entry.title, {'duration': entry.duration}))
+                if not items:
+                    continue
+
+                # 第一批条目到达时就解析首曲地址，不等整个列表下载完
+                first_source = self._resolve_playlist_source(items[0]) if total == 0 else None
+                total += len(items)
+                wx.CallAfter(self._on_playlist_entries, sequence, items, first_source)
+
+            wx.CallAfter(self._on_playlist_loaded, sequence, filename, total, skipped)
+
+        except Exception as e:
+            self.logger.error(f"加载播放列表失败: {e}")
+            wx.CallAfter(self._on_playlist_failed, sequence, filename, e)
+
+    def _on_playlist_entries(self, sequence, items, first_source):
+        """UI线程：批量加入播放列表，首批到达时开始播放"""
+        if sequence != self._playlist_sequence:
+            return
+
+        had_next = self.playlist_manager.peek_next() is not None
+        self.playlist_manager.add_items(items)
+
+        if first_source:
+            source, position_key = first_source
+            self.playlist_manager.set_current_index(0)
+            self.audio_controller.play_file(source, items[0].display_name, position_key)
+        elif not had_next and self._is_playing_playlist(self.audio_controller.get_current_filename()):
+            # 之前播到已加载部分的末尾，还没有可预加载的下一首
+            self.audio_controller.ensure_next_preload()
+
+    def _on_playlist_loaded(self, sequence, filename, total, skipped=0):
+        """UI线程：播放列表加载完成"""
+        if sequence != self._playlist_sequence:
+            return
+        self.logger.info(f"播放列表加载完成: {filename}, 共 {total} 项, 跳过 {skipped} 个非音频条目")
+        if total == 0:
+            message = f"播放列表中没有可播放的条目: {filename}"
+            if skipped:
+                message += f"\n{skipped} 个条目不是音频（如视频），音频播放器无法播放"
+            wx.MessageBox(message, "提示", wx.OK | wx.ICON_INFORMATION)
+        elif skipped:
+            wx.MessageBox(f"播放列表共 {total} 首，跳过了 {skipped} 个非音频条目（如视频）: {filename}",
+                          "提示", wx.OK | wx.ICON_INFORMATION)
+
+    def _on_playlist_failed(self, sequence, filename, error):
+        """UI线程：播放列表加载失败"""
+        if sequence != self._playlist_sequence:
+            return
+        wx.MessageBox(f"加载播放列表失败: {filename}\n{error}", "错误", wx.OK | wx.ICON_ERROR)
+
+    def _resolve_playlist_source(self, item):
+        """
+        获取播放列表条目的播放地址（可能请求服务器，在后台线程中调用）
+
+        Returns:
+            tuple: (播放地址, 播放位置键)
+        """
+        if '://' in item.file_path:
+            return item.file_path, None
+        return self.client.get_media_url(item.file_path), (self.client.server_key, item.file_path)
+
+    def _is_playing_playlist(self, current_filename):
+        """当前播放的是否为播放列表中的曲目"""
+        item = self.playlist_manager.get_current_item()
+        return item is not None and bool(current_filename) and item.display_name == current_filename
+
+    def _play_playlist_step(self, step):
+        """切换到播放列表中的上一首/下一首"""
+        if step > 0:
+            item = self.playlist_manager.next_track()
+        else:
+            item = self.playlist_manager.previous_track()
+        if item is None:
+            self.logger.info("播放列表没有更多曲目")
+            return
+
+        threading.Thread(
+            target=self._play_playlist_item_worker,
+            args=(item,),
+            name="PlaylistItemResolve",
+            daemon=True
+        ).start()
+
+    def _play_playlist_item_worker(self, item):
+        """后台线程：解析播放列表条目地址后回到UI线程播放"""
+        try:
+            source, position_key = self._resolve_playlist_source(item)
+            wx.CallAfter(self.audio_controller.play_file, source, item.display_name, position_key)
+        except Exception as e:
+            self.logger.error(f"播放播放列表条目失败: {e}")
+
     def _play_first_audio_file(self):
         """播放第一个音频文件"""
         try:
-            for index, file_item in enumerate(self.file_list):
-                if MediaFileDetector.is_media_file(file_item['name']):
-                    media_type = MediaFileDetector.get_media_type(file_item['name'])
-                    if media_type == 'audio':
-                        file_url = self._build_file_url(file_item)
-                        self.audio_controller.play_file(file_url, file_item['name'])
-                        self._select_file_index(index)
-                        return
+            index = self.media_index.first('audio')
+            if index is not None:
+                file_item = self.file_list[index]
+                file_url = self._build_audio_source(file_item)
+                self._play_folder_audio(file_item, file_url)
+                self._select_file_index(index)
+                return
 
             self._update_status("当前目录没有音频文件")
 
@@ -1554,24 +2370,27 @@ class FileManagerWindow(wx.Frame):
     def _play_media_file(self, file_item):
         """播放媒体文件 - 优先使用音频控制器"""
         try:
-            if MediaFileDetector.is_media_file(file_item['name']):
-                media_type = MediaFileDetector.get_media_type(file_item['name'])
+            if MediaFileDetector.is_media_file(file_item.name):
+                media_type = MediaFileDetector.get_media_type(file_item.name)
 
-                if media_type == 'audio':
+                if media_type == 'playlist':
+                    # 播放列表文件解析后按列表播放
+                    self._play_playlist_file(file_item)
+                elif media_type == 'audio':
                     # 音频文件使用音频控制器
-                    self.logger.info(f"使用音频控制器播放: {file_item['name']}")
-                    file_url = self._build_file_url(file_item)
-                    self.audio_controller.play_file(file_url, file_item['name'])
+                    self.logger.info(f"使用音频控制器播放: {file_item.name}")
+                    file_url = self._build_audio_source(file_item)
+                    self._play_folder_audio(file_item, file_url)
                     # 记住最后通过回车键选择的文件
                     self._last_selected_file = file_item
-                    self.logger.info(f"已记住最后选择的文件: {file_item['name']}")
+                    self.logger.info(f"已记住最后选择的文件: {file_item.name}")
                     # 不再更新状态栏，状态栏由音频控制器自动更新
                 else:
                     # 视频文件使用原来的播放器窗口
-                    self.logger.info(f"使用视频播放器播放: {file_item['name']}")
+                    self.logger.info(f"使用视频播放器播放: {file_item.name}")
                     self._play_video_file(file_item)
             else:
-                wx.MessageBox(f"不支持的媒体文件: {file_item['name']}", "提示", wx.OK | wx.ICON_INFORMATION)
+                wx.MessageBox(f"不支持的媒体文件: {file_item.name}", "提示", wx.OK | wx.ICON_INFORMATION)
 
         except Exception as e:
             self.logger.error(f"播放媒体文件失败: {e}")
@@ -1580,7 +2399,7 @@ class FileManagerWindow(wx.Frame):
     def _play_video_file(self, file_item):
         """播放视频文件（使用全屏视频播放器）"""
         try:
-            self.logger.info(f"开始播放视频文件: {file_item['name']}")
+            self.logger.info(f"开始播放视频文件: {file_item.name}")
 
             # 检查并停止音频播放
             if self.audio_controller.is_playing or self.audio_controller.is_paused:
@@ -1621,6 +2440,15 @@ class FileManagerWindow(wx.Frame):
 class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
     """文件列表控件"""
 
+    # 需要探测时长的文件类型
+    PROBED_FILE_TYPES = ('audio', 'video')
+
+    # 绘制后等待多久再请求探测（毫秒），快速滚动时只探测停下来的位置
+    METADATA_PROBE_DELAY_MS = 150
+
+    # 按名称查找时两次输入的最长间隔（秒），超过后重新开始查找
+    TYPE_AHEAD_TIMEOUT = 1.0
+
     def __init__(self, parent):
         """初始化文件列表控件"""
         wx.ListCtrl.__init__(
@@ -1638,18 +2466,47 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
         self.InsertColumn(1, "类型", width=100)
         self.InsertColumn(2, "大小", width=100)
         self.InsertColumn(3, "修改时间", width=150)
+        self.InsertColumn(4, "时长", width=80)
 
         self.files = []
         self.sort_column = 0
         self.sort_ascending = True
 
+        # 媒体类型索引，与self.files的顺序保持同步
+        self.media_index = MediaIndex()
+
+        # 媒体元数据探测：metadata_requester(entries) 由文件管理窗口设置
+        self.metadata_requester = None
+        self._probe_scheduled = False
+
+        # 按名称查找：索引通常由后台加载线程建立后设置，缺少时首次输入再建立
+        self.search_index = None
+        # 查找索引中各键对应的列表位置，列表变化后首次输入时重新建立
+        self._match_positions = None
+        self._search_text = ""
+        self._search_range = (0, 0)
+        self._search_time = 0.0
+
+        # 选中状态由控件自己记录（选中行号集合，全选时只记一个标志），
+        # 不通过逐行查询或设置原生控件来获取/修改选中项
+        self._selected = set()
+        self._all_selected = False
+        self.Bind(wx.EVT_LIST_ITEM_SELECTED, self._on_item_selected)
+        self.Bind(wx.EVT_LIST_ITEM_DESELECTED, self._on_item_deselected)
+
         # 绑定右键菜单事件
         self.Bind(wx.EVT_CONTEXT_MENU, self.on_context_menu)
         # 绑定键盘事件以处理上下文菜单键
         self.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
 
-    def load_files(self, files):
-        """加载文件列表"""
+    def load_files(self, files, apply_sort=True):
+        """加载文件列表
+
+        Args:
+            files: 文件条目列表
+            apply_sort: 是否应用默认排序；流式加载的首页传False，保持服务器返回的顺序，
+                        后续分页追加时已显示的行不会移动
+        """
         self.Freeze()
         try:
             data = files if files is not None else []
@@ -1657,16 +2514,18 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
 
             # 应用默认排序（按名称拼音排序）
             # 只有在非历史栈恢复时才应用自动排序
-            if self.files and len(self.files) > 0 and not hasattr(self, '_skip_auto_sort'):
-                self.sort_column = 0
-                self.sort_ascending = True
+            if self.files and apply_sort and not hasattr(self, '_skip_auto_sort'):
+                self._apply_default_sort()
+            elif self.files:
+                # 历史栈恢复或流式加载的列表排序方式未知，下次排序时重新完整排序
+                self.sort_column = -1
 
-                # 拼音排序函数
-                def chinese_sort_key(name):
-                    pinyin_list = pypinyin.lazy_pinyin(name)
-                    return ''.join(pinyin_list)
+            self.media_index.rebuild(self.files)
+            self.search_index = None
+            self._search_text = ""
 
-                self.files.sort(key=lambda x: chinese_sort_key(x["name"]))
+            # 新列表的行与原选中行无关，先取消原选中行
+            self.clear_selection()
 
             count = len(self.files)
             self.SetItemCount(count)
@@ -1677,6 +2536,28 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
         # 自动调整列宽
         self._autosize_columns()
 
+    def append_files(self, files):
+        """追加一页文件（流式加载），只增加虚拟列表的条目数"""
+        if not files:
+            return
+        start = len(self.files)
+        self.files.extend(files)
+        self.media_index.extend(files, start)
+        self.search_index = None
+        # 追加的分页保持服务器返回的顺序，用户选择排序时再完整排序
+        self.sort_column = -1
+        self.SetItemCount(len(self.files))
+
+    def finish_streaming(self):
+        """流式加载完成：不重新排序（读屏软件正在阅读的行不会移动），只调整列宽"""
+        self._autosize_columns()
+
+    def _apply_default_sort(self):
+        """默认排序：按名称拼音升序"""
+        self.sort_column = 0
+        self.sort_ascending = True
+        self.files.sort(key=name_sort_key)
+
     def OnGetItemText(self, item, column):
         """虚拟列表项文本回调"""
         if item < 0 or item >= len(self.files):
@@ -1685,16 +2566,53 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
         file_item = self.files[item]
 
         if column == 0:
-            return file_item.get("name", "")
+            return file_item.name
         if column == 1:
-            return self._get_type_display_name(file_item.get("type", "default"))
+            return self._get_type_display_name(file_item.file_type)
         if column == 2:
-            return file_item.get("size", "")
+            # 大小和日期仅在显示时格式化，不为每个条目保存字符串
+            return file_item.size_text
         if column == 3:
-            return file_item.get("date", "")
+            return file_item.date_text
+        if column == 4:
+            if file_item.media_info is None and file_item.file_type in self.PROBED_FILE_TYPES:
+                # 只有绘制到的（即可见的）行才会请求探测
+                self._schedule_metadata_probe()
+            return file_item.duration_text
 
         return ""
 
+    def _schedule_metadata_probe(self):
+        """合并同一次绘制中的探测请求"""
+        if self.metadata_requester is None or self._probe_scheduled:
+            return
+        self._probe_scheduled = True
+        wx.CallLater(self.METADATA_PROBE_DELAY_MS, self._probe_visible_media)
+
+    def _probe_visible_media(self):
+        """请求探测可见范围内尚无元数据的音视频文件"""
+        if not self:
+            return
+        self._probe_scheduled = False
+
+        top = max(0, self.GetTopItem())
+        visible = self.files[top:top + self.GetCountPerPage() + 1]
+        entries = [
+            entry for entry in visible
+            if entry.media_info is None and entry.file_type in self.PROBED_FILE_TYPES
+        ]
+        if entries:
+            self.metadata_requester(entries)
+
+    def refresh_visible_items(self):
+        """重绘可见范围内的行"""
+        count = self.GetItemCount()
+        if count == 0:
+            return
+        top = max(0, self.GetTopItem())
+        bottom = min(count - 1, top + self.GetCountPerPage())
+        self.RefreshItems(top, bottom)
+
     def _autosize_columns(self):
         """自动调整列宽"""
         for col in range(self.GetColumnCount()):
@@ -1732,69 +2650,155 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
 
     def get_selected_items(self):
         """获取选中的文件"""
-        selected_items = []
-        index = self.GetFirstSelected()
+        if self._all_selected:
+            return list(self.files)
+        return [self.files[index] for index in sorted(self._selected) if index < len(self.files)]
+
+    def get_first_selected(self):
+        """第一个选中行的位置，没有选中项时返回-1"""
+        if self._all_selected:
+            return 0 if self.files else -1
+        return min(self._selected) if self._selected else -1
+
+    def select_index(self, index):
+        """只选中一行并设置焦点：只修改原选中行和新行"""
+        count = self.GetItemCount()
+        self.clear_selection()
+        if 0 <= index < count:
+            self.Select(index, True)
+            self._selected = {index}
+            self.Focus(index)
+            self.EnsureVisible(index)
+
+    def is_type_ahead_active(self):
+        """是否正在输入查找文字（上次输入未超时）"""
+        return bool(self._search_text) and time.monotonic() - self._search_time <= self.TYPE_AHEAD_TIMEOUT
+
+    def find_as_you_type(self, char):
+        """
+        输入一个字符，选中名称、完整拼音或拼音首字母以已输入文本开头的第一个文件
+
+        连续输入的字符逐步缩小索引中的匹配范围；重复输入同一字符时在以该字符开头的文件间循环。
+
+        Returns:
+            bool: 是否找到匹配的文件
+        """
+        now = time.monotonic()
+        if now - self._search_time > self.TYPE_AHEAD_TIMEOUT:
+            self._search_text = ""
+        self._search_time = now
+
+        index = self.search_index
+        if index is None or index.size != len(self.files):
+            index = self.search_index = NameSearchIndex(self.files)
+
+        text = self._search_text + char
+        cycle = len(text) > 1 and text == char * len(text)
+        if cycle:
+            # 范围保持为单个字符的匹配结果
+            lo, hi = self._search_range
+        elif self._search_text:
+            lo, hi = index.find(text, *self._search_range)
+        else:
+            lo, hi = index.find(text)
+        self._search_text = text
+        self._search_range = (lo, hi)
+        if lo == hi:
+            return False
+
+        positions = self._match_positions
+        if positions is None or positions.index is not index or positions.version != self.media_index.version:
+            positions = self._match_positions = MatchPositions(
+                index, self.media_index.index_of, self.media_index.version)
+
+        if cycle:
+            target = positions.following(lo, hi, self.GetFocusedItem())
+        else:
+            target = positions.first(lo, hi)
+        if target < 0:
+            return False
 
-        while index != -1:
-            if index < len(self.files):
-                selected_items.append(self.files[index])
-            index = self.GetNextSelected(index)
+        self.select_index(target)
+        return True
 
-        return selected_items
+    def clear_selection(self):
+        """取消全部选中"""
+        if self._all_selected:
+            # 全选是一个范围，一次调用整体取消
+            self.SetItemState(-1, 0, wx.LIST_STATE_SELECTED)
+        else:
+            count = self.GetItemCount()
+            # 取消选中会同步触发DESELECTED事件修改集合，遍历副本
+            for index in list(self._selected):
+                if index < count:
+                    self.Select(index, False)
+        self._selected = set()
+        self._all_selected = False
 
     def select_all(self):
-        """全选"""
-        self.Freeze()
-        try:
-            for i in range(self.GetItemCount()):
-                self.Select(i, True)
-        finally:
-            self.Thaw()
+        """全选：对原生控件整体设置选中状态，不逐行调用
+
+        单选列表（LC_SINGLE_SEL）不能全选，保持原有的单个选中项，
+        否则记录的全选状态会与原生控件只选中一行的实际状态不一致
+        """
+        if not self.GetItemCount() or self.HasFlag(wx.LC_SINGLE_SEL):
+            return
+        self.SetItemState(-1, wx.LIST_STATE_SELECTED, wx.LIST_STATE_SELECTED)
+        self._selected = set()
+        self._all_selected = True
+
+    def _on_item_selected(self, event):
+        """原生控件选中了一行（键盘、鼠标或程序调用）"""
+        index = event.GetIndex()
+        if self.HasFlag(wx.LC_SINGLE_SEL):
+            self._selected = {index}
+            self._all_selected = False
+        elif not self._all_selected:
+            self._selected.add(index)
+        event.Skip()
+
+    def _on_item_deselected(self, event):
+        """原生控件取消选中一行，行号为-1表示全部取消"""
+        index = event.GetIndex()
+        if index == -1:
+            self._selected = set()
+            self._all_selected = False
+        elif self._all_selected:
+            # 全选后取消其中一行，范围展开为行号集合
+            self._selected = set(range(self.GetItemCount()))
+            self._selected.discard(index)
+            self._all_selected = False
+        else:
+            self._selected.discard(index)
+        event.Skip()
 
     
     def sort_by_name(self):
         """按名称排序（使用拼音排序）"""
-        self.sort_column = 0
-        self.sort_ascending = not self.sort_ascending
-
-        # 拼音排序函数：将中文转换为拼音，非中文保持原样
-        def chinese_sort_key(name):
-            pinyin_list = pypinyin.lazy_pinyin(name)
-            return ''.join(pinyin_list)
-
-        self.files.sort(key=lambda x: chinese_sort_key(x["name"]), reverse=not self.sort_ascending)
-        self._refresh_display()
+        self._toggle_sort(0, name_sort_key)
 
     def sort_by_size(self):
         """按大小排序"""
-        self.sort_column = 1
-        self.sort_ascending = not self.sort_ascending
-        # 简单的大小转换，用于排序
-        def size_key(item):
-            size = item["size"]
-            if size == "-":
-                return -1  # 文件夹排在前面
-            # 移除单位并转换为数字
-            if "KB" in size:
-                return float(size.replace("KB", "").strip())
-            elif "MB" in size:
-                return float(size.replace("MB", "").strip()) * 1024
-            elif "GB" in size:
-                return float(size.replace("GB", "").strip()) * 1024 * 1024
-            return 0
-
-        self.files.sort(key=size_key, reverse=not self.sort_ascending)
-        self._refresh_display()
+        self._toggle_sort(1, size_sort_key)
 
     def sort_by_date(self):
         """按日期排序"""
-        self.sort_column = 2
+        self._toggle_sort(2, date_sort_key)
+
+    def _toggle_sort(self, column, key):
+        """切换排序方向；已按该列排序时只需反转列表"""
+        if self.sort_column == column:
+            self.files.reverse()
+        else:
+            self.sort_column = column
+            self.sort_ascending = True
+            self.files.sort(key=key, reverse=True)
         self.sort_ascending = not self.sort_ascending
-        self.files.sort(key=lambda x: x["date"], reverse=not self.sort_ascending)
         self._refresh_display()
 
     def _refresh_display(self):
-        """刷新显示"""
+        """刷新显示（列表顺序可能已变化，同步媒体索引）"""
+        self.media_index.reindex(self.files)
         count = len(self.files)
         self.SetItemCount(count)
         self.Refresh()
@@ -1805,7 +2809,7 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
         pos = event.GetPosition()
         if pos == wx.DefaultPosition:
             # 如果是键盘触发的右键菜单，使用当前选中项
-            item_index = self.GetFirstSelected()
+            item_index = self.get_first_selected()
             if item_index != -1:
                 pos = self.GetItemPosition(item_index)
             else:
@@ -1822,8 +2826,8 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
         # 检查是否按下了 Shift+F10 (标准上下文菜单快捷键)
         if key_code == wx.WXK_F10 and event.ShiftDown():
             # 确保有选中项，如果没有则选中第一项
-            if self.GetFirstSelected() == -1 and self.GetItemCount() > 0:
-                self.Select(0, True)
+            if self.get_first_selected() == -1 and self.GetItemCount() > 0:
+                self.select_index(0)
                 self.SetFocus()
 
             # 触发上下文菜单事件
@@ -1835,8 +2839,8 @@ class FileListCtrl(wx.ListCtrl, listmix.ListCtrlAutoWidthMixin):
         # 检查上下文菜单键（Application键）
         if key_code == 395 or raw_key_code == 93:
             # 确保有选中项，如果没有则选中第一项
-            if self.GetFirstSelected() == -1 and self.GetItemCount() > 0:
-                self.Select(0, True)
+            if self.get_first_selected() == -1 and self.GetItemCount() > 0:
+                self.select_index(0)
                 self.SetFocus()
 
             # 触发上下文菜单事件
@@ -1877,7 +2881,7 @@ class ContextMenu(wx.Menu):
         self.Bind(wx.EVT_MENU, self.on_open, open_item)
 
         # 播放媒体文件
-        if has_selection and len(selected_items) == 1 and MediaFileDetector.is_media_file(selected_items[0]['name']):
+        if has_selection and len(selected_items) == 1 and MediaFileDetector.is_media_file(selected_items[0].name):
             play_item = self.Append(wx.ID_ANY, "播放媒体(&P)\tP", "播放选中的媒体文件")
             self.Bind(wx.EVT_MENU, self.on_play_media, play_item)
             self.AppendSeparator()
@@ -1916,7 +2920,7 @@ class ContextMenu(wx.Menu):
             # 查看说明：需要选中项（第4个菜单项，索引3）
             menu_items[3].Enable(has_selection)
 
-            # 批量下载：需要选中项（暂时启用，点击提示开发中）
+            # 批量下载：需要选中项
             menu_items[4].Enable(has_selection)
 
     def on_open(self, event):
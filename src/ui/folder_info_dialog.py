@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件夹信息对话框
+非模态窗口：在后台递归统计文件夹的文件数、总大小和音视频时长，统计过程中实时更新
+"""
+
+import wx
+
+from src.core.file_entry import format_file_size, format_duration
+from src.core.logger import get_logger
+from src.api.folder_walker import FolderWalker
+from src.ui.coalescing_dispatcher import CoalescingDispatcher
+
+
+class FolderInfoDialog(wx.Dialog):
+    """文件夹信息对话框"""
+
+    # 统计结果刷新间隔（毫秒），过于频繁会打断读屏软件朗读
+    REFRESH_INTERVAL_MS = 500
+
+    def __init__(self, parent, client, folder_item, folder_path, on_listed=None,
+                 metadata_cache=None, max_workers=4):
+        """
+        初始化文件夹信息对话框
+
+        Args:
+            parent: 父窗口
+            client: 已认证的OpenList客户端
+            folder_item: 文件夹条目
+            folder_path: 文件夹在服务器上的路径
+            on_listed: 遍历中每个文件夹列表获取后的回调，用于写入目录缓存
+            metadata_cache: 媒体元数据缓存，用于累计已知时长
+            max_workers: 该服务器的最大并发请求数
+        """
+        super().__init__(
+            parent,
+            title=f"文件夹信息 - {folder_item.name}",
+            size=(460, 360),
+            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER
+        )
+        self.logger = get_logger()
+        self.folder_item = folder_item
+        self.folder_path = folder_path
+        self._totals = None
+        self._finished = False
+
+        self._refresh = CoalescingDispatcher(self._on_progress, interval_ms=self.REFRESH_INTERVAL_MS)
+        self.walker = FolderWalker(
+            client,
+            folder_path,
+            on_progress=self._refresh.post,
+            on_finished=lambda totals: wx.CallAfter(self._on_finished, totals),
+            on_listed=on_listed,
+            metadata_cache=metadata_cache,
+            max_workers=max_workers
+        )
+
+        self._create_ui()
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.CenterOnParent()
+
+        self.walker.start()
+        self._update_text()
+
+    def _create_ui(self):
+        """创建用户界面"""
+        panel = wx.Panel(self)
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        self.info_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE | wx.TE_READONLY)
+        self.info_text.SetName("文件夹信息")
+        main_sizer.Add(self.info_text, 1, wx.ALL | wx.EXPAND, 10)
+
+        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.stop_btn = wx.Button(panel, label="停止统计(&S)")
+        close_btn = wx.Button(panel, wx.ID_CANCEL, label="关闭")
+        button_sizer.Add(self.stop_btn, 0, wx.RIGHT, 5)
+        button_sizer.Add(close_btn, 0)
+        main_sizer.Add(button_sizer, 0, wx.ALL | wx.ALIGN_RIGHT, 10)
+
+        panel.SetSizer(main_sizer)
+
+        self.stop_btn.Bind(wx.EVT_BUTTON, self.on_stop)
+        # 关闭按钮和Esc键都关闭（销毁）对话框
+        self.Bind(wx.EVT_BUTTON, lambda event: self.Close(), id=wx.ID_CANCEL)
+
+        self.info_text.SetFocus()
+
+    def _update_text(self):
+        """根据当前统计结果更新显示"""
+        totals = self._totals
+        lines = [
+            f"文件夹: {self.folder_item.name}",
+            f"路径: {self.folder_path}",
+            f"修改时间: {self.folder_item.date_text}",
+        ]
+
+        if totals is None:
+            lines.append("")
+            lines.append("状态: 正在统计...")
+        else:
+            lines.append(f"文件: {totals['files']:,} 个")
+            lines.append(f"子文件夹: {totals['folders']:,} 个")
+            lines.append(f"总大小: {format_file_size(totals['bytes'])}（{totals['bytes']:,} 字节）")
+            if totals['media_files']:
+                line = f"音视频: {totals['media_files']:,} 个"
+                if totals['media_known']:
+                    line += f"，其中 {totals['media_known']:,} 个已知时长，合计 {format_duration(totals['duration'])}"
+                lines.append(line)
+            lines.append("")
+            lines.append(f"状态: {self._status_text(totals)}")
+
+        # 保留读屏软件的阅读位置
+        position = self.info_text.GetInsertionPoint()
+        self.info_text.ChangeValue("\n".join(lines))
+        self.info_text.SetInsertionPoint(min(position, self.info_text.GetLastPosition()))
+
+    def _status_text(self, totals):
+        """统计状态文本"""
+        if self.walker.cancelled:
+            status = "已停止，以上为部分结果"
+        elif self._finished:
+            status = "统计完成"
+        else:
+            status = f"正在统计（还有 {totals['pending']:,} 个文件夹）"
+        if totals['errors']:
+            status += f"，{totals['errors']:,} 个文件夹读取失败"
+        return status
+
+    def _on_progress(self, totals):
+        """UI线程：显示最新统计结果"""
+        if not self or self._finished:
+            return
+        self._totals = totals
+        self._update_text()
+
+    def _on_finished(self, totals):
+        """UI线程：统计完成"""
+        if not self:
+            return
+        self._finished = True
+        self._totals = totals
+        self.stop_btn.Disable()
+        self._update_text()
+
+    def on_stop(self, event):
+        """停止统计，保留已统计的部分结果"""
+        self.walker.cancel()
+        self._refresh.close()
+        self.stop_btn.Disable()
+        self._totals = dict(self.walker.totals)
+        self._update_text()
+
+    def on_close(self, event):
+        """关闭对话框时停止统计并销毁窗口"""
+        self.walker.cancel()
+        self._refresh.close()
+        self.Destroy()
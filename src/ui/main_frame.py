@@ -408,7 +408,10 @@ class MainFrame(wx.Frame):
                     url,
                     server['username'],
                     server['password'],
-                    server.get('ignore_ssl_errors', False)
+                    server.get('ignore_ssl_errors', False),
+                    connect_timeout=server.get('connect_timeout'),
+                    read_timeout=server.get('read_timeout'),
+                    pool_maxsize=server.get('pool_maxsize')
                 )
             except Exception as e:
                 result['message'] = f"创建客户端失败: {str(e)}"
@@ -626,10 +629,9 @@ class MainFrame(wx.Frame):
         self.add_to_playlist(file_path, display_name)
 
         # 设置为当前曲目
-        for i, item in enumerate(self.playlist_manager.get_playlist()):
-            if item.file_path == file_path:
-                self.playlist_manager.set_current_index(i)
-                break
+        index = self.playlist_manager.index_of(file_path)
+        if index != -1:
+            self.playlist_manager.set_current_index(index)
 
         return self.audio_controller.play_file(file_path, display_name)
 
@@ -798,9 +800,9 @@ class MainFrame(wx.Frame):
 
             play_menu.Remove(self.device_menu_placeholder)
 
-            self.device_menu = wx.Menu()
+            # VLC仍在后台加载时先插入占位菜单，打开菜单时再填充设备
+            self.device_menu = self.audio_controller.create_device_menu(play_menu)
             play_menu.InsertSubMenu(placeholder_pos, self.device_menu, "音频设备(&D)")
-            self.refresh_device_menu()
 
             self.logger.info("音频设备菜单初始化完成")
 
@@ -821,6 +823,9 @@ class MainFrame(wx.Frame):
 
             self.device_menu.Clear()
 
+            if not self.audio_controller.ensure_player():
+                return
+
             devices = self.audio_controller.get_available_devices()
             current_info = self.audio_controller.audio_player.player_core.get_current_audio_device_info()
             current_key = (current_info.get('module'), current_info.get('id'))
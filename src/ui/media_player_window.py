@@ -13,6 +13,7 @@ from src.core.version import VERSION
 from src.media.audio_player import AudioPlayer
 from src.media.accessibility_manager import AccessibilityManager
 from src.media.file_detector import MediaFileDetector
+from src.ui.coalescing_dispatcher import CoalescingDispatcher
 
 
 class MediaPlayerWindow(wx.Frame):
@@ -53,6 +54,7 @@ class MediaPlayerWindow(wx.Frame):
         self.is_playing = False
         self.is_paused = False
         self.update_timer = None
+        self._time_dispatcher = CoalescingDispatcher(self._apply_time_update, 250)
 
         # 初始化无障碍管理器（必须在UI创建之前）
         try:
@@ -541,7 +543,11 @@ class MediaPlayerWindow(wx.Frame):
         self._safe_announce_method("announce_playback_status", 'stopped')
 
     def on_time_update(self, time_ms):
-        """时间更新回调"""
+        """时间更新回调（VLC事件线程），合并后交给UI线程刷新进度"""
+        self._time_dispatcher.post(time_ms)
+
+    def _apply_time_update(self, time_ms):
+        """UI线程：刷新进度显示"""
         self.update_progress_display()
 
     def on_player_error(self, error_msg):
@@ -730,6 +736,7 @@ class MediaPlayerWindow(wx.Frame):
             if self.update_timer:
                 self.update_timer.Stop()
 
+            self._time_dispatcher.close()
             if self.audio_player:
                 self.audio_player.cleanup()
 
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件搜索对话框
+非模态窗口：输入关键词后在后台搜索整个服务器（或当前目录），结果边找边显示，
+回车定位到文件所在目录并选中该文件
+"""
+
+import wx
+
+from src.core.logger import get_logger
+from src.api.search_service import SearchService
+
+
+class SearchResultListCtrl(wx.ListCtrl):
+    """搜索结果列表（虚拟列表，结果较多时也只绘制可见行）"""
+
+    def __init__(self, parent):
+        wx.ListCtrl.__init__(
+            self,
+            parent,
+            style=wx.LC_REPORT | wx.LC_SINGLE_SEL | wx.LC_VIRTUAL
+        )
+        self.InsertColumn(0, "名称", width=220)
+        self.InsertColumn(1, "位置", width=280)
+        self.InsertColumn(2, "大小", width=90)
+        self.results = []
+
+    def clear_results(self):
+        """清空结果"""
+        self.results = []
+        self.SetItemCount(0)
+        self.Refresh()
+
+    def append_results(self, entries):
+        """追加结果，只增加虚拟列表的条目数"""
+        self.results.extend(entries)
+        self.SetItemCount(len(self.results))
+
+    def OnGetItemText(self, item, column):
+        """虚拟列表项文本回调"""
+        if item < 0 or item >= len(self.results):
+            return ""
+        entry = self.results[item]
+        if column == 0:
+            return entry.name
+        if column == 1:
+            return entry.path.rsplit('/', 1)[0] or "/"
+        if column == 2:
+            return "文件夹" if entry.is_dir else entry.size_text
+        return ""
+
+
+class SearchDialog(wx.Dialog):
+    """文件搜索对话框"""
+
+    def __init__(self, parent, client, max_workers=4):
+        """
+        初始化搜索对话框
+
+        Args:
+            parent: 文件管理窗口，需提供current_path属性和locate_file(path)方法
+            client: 已认证的OpenList客户端
+            max_workers: 本地遍历目录时的最大并发请求数
+        """
+        super().__init__(
+            parent,
+            title="搜索文件",
+            size=(640, 480),
+            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER
+        )
+        self.logger = get_logger()
+        self.file_manager = parent
+        self._search_id = None
+        self.service = SearchService(
+            client,
+            on_results=lambda search_id, entries: wx.CallAfter(self._on_results, search_id, entries),
+            on_finished=lambda search_id, summary: wx.CallAfter(self._on_finished, search_id, summary),
+            max_workers=max_workers
+        )
+
+        self._create_ui()
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.CenterOnParent()
+
+    def _create_ui(self):
+        """创建用户界面"""
+        panel = wx.Panel(self)
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        query_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        query_label = wx.StaticText(panel, label="关键词(&K):")
+        self.query_text = wx.TextCtrl(panel, style=wx.TE_PROCESS_ENTER)
+        self.query_text.SetName("搜索关键词")
+        self.query_text.SetHelpText("输入文件名中包含的文字，多个关键词用空格分隔，按回车搜索")
+        self.search_btn = wx.Button(panel, label="搜索(&S)")
+        query_sizer.Add(query_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+        query_sizer.Add(self.query_text, 1, wx.EXPAND | wx.RIGHT, 5)
+        query_sizer.Add(self.search_btn, 0)
+        main_sizer.Add(query_sizer, 0, wx.ALL | wx.EXPAND, 10)
+
+        self.current_folder_check = wx.CheckBox(panel, label="只搜索当前目录(&C)")
+        main_sizer.Add(self.current_folder_check, 0, wx.LEFT | wx.RIGHT, 10)
+
+        self.status_text = wx.StaticText(panel, label="")
+        self.status_text.SetName("搜索状态")
+        main_sizer.Add(self.status_text, 0, wx.ALL | wx.EXPAND, 10)
+
+        self.result_list = SearchResultListCtrl(panel)
+        self.result_list.SetName("搜索结果")
+        main_sizer.Add(self.result_list, 1, wx.LEFT | wx.RIGHT | wx.EXPAND, 10)
+
+        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.locate_btn = wx.Button(panel, label="定位(&L)")
+        self.locate_btn.SetHelpText("进入文件所在目录并选中该文件")
+        close_btn = wx.Button(panel, wx.ID_CANCEL, label="关闭")
+        button_sizer.Add(self.locate_btn, 0, wx.RIGHT, 5)
+        button_sizer.Add(close_btn, 0)
+        main_sizer.Add(button_sizer, 0, wx.ALL | wx.ALIGN_RIGHT, 10)
+
+        panel.SetSizer(main_sizer)
+
+        self.query_text.Bind(wx.EVT_TEXT_ENTER, self.on_search)
+        self.search_btn.Bind(wx.EVT_BUTTON, self.on_search)
+        self.locate_btn.Bind(wx.EVT_BUTTON, self.on_locate)
+        # 关闭按钮和Esc键都关闭（销毁）对话框
+        self.Bind(wx.EVT_BUTTON, lambda event: self.Close(), id=wx.ID_CANCEL)
+        self.result_list.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_locate)
+
+        self.query_text.SetFocus()
+
+    def focus_query(self):
+        """显示对话框并把焦点放到关键词输入框"""
+        self.Show()
+        self.Raise()
+        self.query_text.SetFocus()
+        self.query_text.SelectAll()
+
+    def on_search(self, event):
+        """开始搜索"""
+        keywords = self.query_text.GetValue().strip()
+        if not keywords:
+            self.status_text.SetLabel("请输入关键词")
+            return
+
+        parent = self.file_manager.current_path if self.current_folder_check.GetValue() else "/"
+        self.result_list.clear_results()
+        self.status_text.SetLabel(f"正在搜索“{keywords}”...")
+        self._search_id = self.service.search(keywords, parent)
+        self.logger.info(f"开始搜索: {keywords}, 范围: {parent}")
+
+    def _on_results(self, search_id, entries):
+        """UI线程：追加一批结果"""
+        if not self or search_id != self._search_id:
+            return
+        first_batch = not self.result_list.results
+        self.result_list.append_results(entries)
+        self.status_text.SetLabel(f"正在搜索，已找到 {len(self.result_list.results)} 个结果...")
+        if first_batch:
+            self.result_list.Select(0, True)
+            self.result_list.Focus(0)
+
+    def _on_finished(self, search_id, summary):
+        """UI线程：搜索结束"""
+        if not self or search_id != self._search_id:
+            return
+
+        if summary['error']:
+            message = f"搜索失败: {summary['error']}"
+        elif summary['count'] == 0:
+            message = "没有找到匹配的文件"
+        else:
+            source = "服务器索引" if summary['source'] == 'server' else "本地索引"
+            message = f"找到 {summary['count']} 个结果（{source}）"
+            if summary['truncated']:
+                message += "，结果过多，仅显示前面部分"
+        self.status_text.SetLabel(message)
+        self.logger.info(message)
+
+    def on_locate(self, event):
+        """定位到选中的结果"""
+        index = self.result_list.GetFirstSelected()
+        if not 0 <= index < len(self.result_list.results):
+            return
+        entry = self.result_list.results[index]
+        self.file_manager.locate_file(entry.path)
+        self.file_manager.Raise()
+
+    def on_close(self, event):
+        """关闭对话框时停止搜索并销毁窗口"""
+        self.service.close()
+        self.Destroy()
@@ -213,8 +213,12 @@ class ServerDialog(wx.Dialog):
         # 获取服务器数据
         server_data = self.get_server_data()
 
-        # 如果是编辑模式，保持原有ID
+        # 如果是编辑模式，保持原有ID，并保留对话框中没有的字段
+        # （未修改的密码，以及连接超时、连接池大小等手工配置的高级选项）
         if self.is_editing and self.server:
+            merged_data = dict(self.server)
+            merged_data.update(server_data)
+            server_data = merged_data
             server_data['id'] = self.server.get('id')
 
         # 保存服务器配置
@@ -248,7 +248,10 @@ class ServerSelectDialog(wx.Frame):
                     url,
                     server['username'],
                     server['password'],
-                    server.get('ignore_ssl_errors', False)
+                    server.get('ignore_ssl_errors', False),
+                    connect_timeout=server.get('connect_timeout'),
+                    read_timeout=server.get('read_timeout'),
+                    pool_maxsize=server.get('pool_maxsize')
                 )
             except Exception as e:
                 error_msg = f"创建客户端失败: {str(e)}"
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+播放列表增量解析测试
+数据按块输入时，跨块的换行、多字节字符和条目都应与整体输入的结果一致
+"""
+
+from src.media.playlist_parser import PlaylistParser
+
+
+def feed_chunks(parser, data, size):
+    """按固定大小分块输入，返回全部条目"""
+    entries = []
+    for start in range(0, len(data), size):
+        entries.extend(parser.feed(data[start:start + size]))
+    entries.extend(parser.close())
+    return entries
+
+
+def test_m3u_crlf_split_between_chunks():
+    data = b"#EXTM3U\r\n#EXTINF:120,First\r\na.mp3\r\n#EXTINF:60,Second\r\nb.mp3\r\n"
+    # 在 \r 和 \n 之间切开
+    split = data.index(b"\r\n", data.index(b"a.mp3")) + 1
+    parser = PlaylistParser('m3u')
+
+    entries = parser.feed(data[:split]) + parser.feed(data[split:]) + parser.close()
+
+    assert [(e.location, e.title, e.duration) for e in entries] == [
+        ('a.mp3', 'First', 120.0),
+        ('b.mp3', 'Second', 60.0),
+    ]
+
+
+def test_m3u_multibyte_character_split_between_chunks():
+    data = "#EXTINF:-1,周杰伦 - 晴天\n音乐/晴天.mp3\n".encode('utf-8')
+    # 逐字节输入，每个中文字符都会被切开
+    entries = feed_chunks(PlaylistParser('m3u'), data, 1)
+
+    assert len(entries) == 1
+    assert entries[0].location == "音乐/晴天.mp3"
+    assert entries[0].title == "周杰伦 - 晴天"
+    assert entries[0].duration is None
+
+
+def test_m3u_gbk_detected():
+    data = "#EXTINF:10,晴天\n晴天.mp3\n".encode('gbk')
+    entries = feed_chunks(PlaylistParser('m3u'), data, 7)
+
+    assert [(e.location, e.title) for e in entries] == [("晴天.mp3", "晴天")]
+
+
+def test_pls_entries_flushed_when_next_number_starts():
+    parser = PlaylistParser('pls')
+
+    first = parser.feed(b"[playlist]\nFile1=a.mp3\nTitle1=A\nLength1=30\n")
+    assert first == []
+
+    second = parser.feed(b"File2=b.mp3\n")
+    assert [(e.location, e.title, e.duration) for e in second] == [('a.mp3', 'A', 30.0)]
+
+    rest = parser.feed(b"Title2=B\nNumberOfEntries=2\nVersion=2\n") + parser.close()
+    assert [(e.location, e.title, e.duration) for e in rest] == [('b.mp3', 'B', None)]
+
+
+def test_pls_last_entry_flushed_on_close_without_trailing_newline():
+    entries = feed_chunks(PlaylistParser('pls'), b"[playlist]\r\nFile1=a.mp3\r\nFile2=b.mp3", 5)
+
+    assert [e.location for e in entries] == ['a.mp3', 'b.mp3']
+
+
+def test_xspf_with_namespace():
+    data = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<playlist version="1" xmlns="http://xspf.org/ns/0/">'
+        '<trackList>'
+        '<track><location>%E9%9F%B3%E4%B9%90/a.mp3</location><title>甲</title><duration>5000</duration></track>'
+        '<track><location>http://example.com/b.ogg</location></track>'
+        '</trackList></playlist>'
+    ).encode('utf-8')
+
+    entries = feed_chunks(PlaylistParser('xspf'), data, 16)
+
+    assert [(e.location, e.title, e.duration) for e in entries] == [
+        ('音乐/a.mp3', '甲', 5.0),
+        ('http://example.com/b.ogg', None, None),
+    ]
+
+
+def test_xspf_with_prefixed_namespace():
+    data = (
+        b'<x:playlist xmlns:x="http://xspf.org/ns/0/"><x:trackList>'
+        b'<x:track><x:location>c.flac</x:location><x:title>C</x:title></x:track>'
+        b'</x:trackList></x:playlist>'
+    )
+
+    entries = feed_chunks(PlaylistParser('xspf'), data, 3)
+
+    assert [(e.location, e.title) for e in entries] == [('c.flac', 'C')]